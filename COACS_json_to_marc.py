@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import argparse
+import gzip
 import os
+import sys
 # map from IANA 2-character language codes to ISO639-2 3-character language codes, as used in MARC
 
 lang_map = {
@@ -89,9 +91,10 @@ from datetime import timedelta
 start_time = time.time()
 
 # marc fields for each journal record
-def json_to_marc(infilename, outfilename):
+def json_to_marc(infilename, outfilename, data=None):
     print('Processing: ' + infilename)  #progress message
-    data = json.load(open(infilename, "r"))
+    if data is None:
+        data = json.load(open(infilename, "r"))
     record = Record(force_utf8=True)   #create MARC record, enforce Unicode 
     
     # add fields 006, 007 and 008 with minimal physical information to every marc file
@@ -311,12 +314,22 @@ def create_subordinate_records(parent_record, subordinate_data_list):
 if __name__ == "__main__":
 	parser = argparse.ArgumentParser(description='json to marc')
 	parser.add_argument('input_dir', type=str,
-						help='put path to input directory')
+						help='put path to input directory (or to a .jsonl/.jsonl.gz file)')
 	parser.add_argument('out_dir',
 						help='put path to output direct0ry')
 	
 	args = parser.parse_args()
 	
+	# a JSON Lines dump from walk_to_json.py --jsonl is read in one sequential pass
+	if args.input_dir.endswith(".jsonl") or args.input_dir.endswith(".jsonl.gz"):
+		opener = gzip.open if args.input_dir.endswith(".gz") else open
+		with opener(args.input_dir, "rb") as jsonl_file:
+			for line_number, line in enumerate(jsonl_file):
+				data = json.loads(line.decode("utf-8"))
+				outfilepath = os.path.join(args.out_dir, data["resource_key"] + ".marc")
+				json_to_marc("{0}:{1}".format(args.input_dir, line_number + 1), outfilepath, data)
+		sys.exit(0)
+	
 	for parent, dir_names, file_names in os.walk(args.input_dir):
 		for fn in file_names:
 			if fn.endswith(".json" ):
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script to combine the shard files of a sharded walk_to_json run into json
+resource files, as a single run would have made them.
+"""
+
+import _mypath
+import argparse
+from functools import wraps
+import logging
+import os
+import re
+import sys
+import traceback
+
+from isaw.awol import resource
+from isaw.awol.tools.shards import iter_shards
+from isaw.awol.tools.sinks import DirectorySink, JsonLinesSink
+from isaw.awol.tools.store import ResourceStore, log_index, store_resource
+
+DEFAULTLOGLEVEL = logging.WARNING
+
+def arglogger(func):
+    """
+    decorator to log argument calls to functions
+    """
+    @wraps(func)
+    def inner(*args, **kwargs):
+        logger = logging.getLogger(func.__name__)
+        logger.debug("called with arguments: %s, %s" % (args, kwargs))
+        return func(*args, **kwargs)
+    return inner
+
+
+@arglogger
+def main (args):
+    """
+    main functions
+    """
+    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    dest_dir = args.thence[0]
+    index = {}
+    if args.jsonl is not None:
+        sink = JsonLinesSink(args.jsonl)
+    else:
+        sink = DirectorySink(dest_dir)
+    store = ResourceStore(sink, args.max_resident)
+    post_count = 0
+    for record in iter_shards(args.shards):
+        post_count = post_count + 1
+        for d in record['resources']:
+            r = resource.Resource()
+            r.__dict__ = dict(d)
+            store_resource(r, record['url'], store, index)
+    store.flush()
+    logger.info('merged {0} posts from {1} shards'.format(post_count, len(args.shards)))
+    log_index(index)
+
+
+if __name__ == "__main__":
+    log_level = DEFAULTLOGLEVEL
+    log_level_name = logging.getLevelName(log_level)
+    logging.basicConfig(level=log_level)
+
+    try:
+        parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+        parser.add_argument ("-l", "--loglevel", type=str, help="desired logging level (case-insensitive string: DEBUG, INFO, WARNING, ERROR" )
+        parser.add_argument ("-v", "--verbose", action="store_true", default=False, help="verbose output (logging level == INFO")
+        parser.add_argument ("-vv", "--veryverbose", action="store_true", default=False, help="very verbose output (logging level == DEBUG")
+        parser.add_argument ("--max-resident", type=int, default=None, help="maximum number of resources to hold in memory for merging before writing the least recently used ones out early; unlimited if not given")
+        parser.add_argument ("--jsonl", type=str, default=None, help="write all resources as lines of this JSON Lines file (gzipped if the name ends in .gz), with an offset index alongside, instead of one file per resource in thence")
+        parser.add_argument('thence', type=str, nargs=1, help='path to directory where you want the json-serialized resources dumped')
+        parser.add_argument('shards', type=str, nargs='+', help='shard files written by walk_to_json.py --shard, one for each of shards 1..N')
+        args = parser.parse_args()
+        if args.jsonl is not None and args.max_resident is not None:
+            parser.error('--max-resident cannot be used with --jsonl, which writes each resource only once')
+        if args.loglevel is not None:
+            args_log_level = re.sub('\s+', '', args.loglevel.strip().upper())
+            try:
+                log_level = getattr(logging, args_log_level)
+            except AttributeError:
+                logging.error("command line option to set log_level failed because '%s' is not a valid level name; using %s" % (args_log_level, log_level_name))
+        if args.veryverbose:
+            log_level = logging.DEBUG
+        elif args.verbose:
+            log_level = logging.INFO
+        log_level_name = logging.getLevelName(log_level)
+        logging.getLogger().setLevel(log_level)
+        if log_level != DEFAULTLOGLEVEL:
+            logging.warning("logging level changed to %s via command line option" % log_level_name)
+        else:
+            logging.info("using default logging level: %s" % log_level_name)
+        logging.debug("command line: '%s'" % ' '.join(sys.argv))
+        main(args)
+        sys.exit(0)
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print("ERROR, UNEXPECTED EXCEPTION")
+        print(str(e))
+        traceback.print_exc()
+        os._exit(1)
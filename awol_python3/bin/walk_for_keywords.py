@@ -10,36 +10,22 @@ import errno
 import fileinput
 import hashlib
 from isaw.awol import awol_article
+from isaw.awol.tools import metrics
+from isaw.awol.tools.posts import iter_posts
+from isaw.awol.vocabulary import TITLE_SUBSTRING_TAGS
 import json
 import logging
 import os
-import pkg_resources
 import pprint
 import regex as re
 import sys
 import traceback
-import unicodecsv
 
 
 RX_URLFLAT = re.compile(r'[=+\?\{\}\{\}\(\)\\\-_&%#/,\.;:]+')
 RX_DEDUPEH = re.compile(r'[-]+')
 DEFAULTLOGLEVEL = logging.WARNING
 
-title_strings_csv = pkg_resources.resource_stream(
-    'isaw.awol', 'awol_title_strings.csv')
-dreader = unicodecsv.DictReader(
-    title_strings_csv,
-    fieldnames=[
-        'titles',
-        'tags'
-    ],
-    delimiter=',',
-    quotechar='"')
-TITLE_SUBSTRING_TAGS = dict()
-for row in dreader:
-    TITLE_SUBSTRING_TAGS.update({row['titles']: row['tags']})
-del dreader
-
 
 def main(args):
     """
@@ -49,34 +35,30 @@ def main(args):
     root_dir = args.whence[0]
     walk_count = 0
     newkeys = []
-    for dir_name, sub_dir_list, file_list in os.walk(root_dir):
-        for file_name in file_list:
-            if 'post-' in file_name and file_name[-4:] == '.xml':
-                walk_count = walk_count + 1
-                if walk_count % 50 == 1:
-                    if args.progress:
-                        print('\n*****************************\nPERCENT COMPLETE: {0:.0f}\n'.format(float(walk_count)/4261.0*100.0))
-                    newkeys = sorted(list(set(newkeys)))
-                logger.info('\n=========================================================================================\nARTICLE:\n')
-                target = os.path.join(dir_name, file_name)
+    progress = metrics.Progress()
+    for target in iter_posts(root_dir, args.glob, args.postfile):
+        walk_count = walk_count + 1
+        progress.step()
+        if walk_count % 50 == 1:
+            if args.progress:
+                print(progress.line())
+            newkeys = sorted(list(set(newkeys)))
+        logger.info('\n=========================================================================================\nARTICLE:\n')
+        try:
+            a = awol_article.AwolArticle(atom_file_name=target, header_only=True)
+        except (ValueError, RuntimeError) as e:
+            logger.warning(e)
+        else:
+            keywords = [c['term'] for c in a.categories if c['vocabulary'] == 'http://www.blogger.com/atom/ns#']
+            for kw in keywords:
+                k = kw.lower().strip()
                 try:
-                    a = awol_article.AwolArticle(atom_file_name=target)
-                except (ValueError, RuntimeError) as e:
-                    logger.warning(e)
-                else:
-                    keywords = [c['term'] for c in a.categories if c['vocabulary'] == 'http://www.blogger.com/atom/ns#']
-                    for kw in keywords:
-                        k = kw.lower().strip()
-                        try:
-                            nert = TITLE_SUBSTRING_TAGS[k]
-                        except KeyError:
-                            if k not in newkeys:
-                                print('"{}"" from "{}"; title = {}'.format(
-                                    k.encode('utf-8'), kw.encode('utf-8'), a.title.encode('utf-8')))
-                                newkeys.append(k)
-        for ignore_dir in ['.git', '.svn', '.hg']:
-            if ignore_dir in sub_dir_list:
-                sub_dir_list.remove(ignore_dir)
+                    nert = TITLE_SUBSTRING_TAGS[k]
+                except KeyError:
+                    if k not in newkeys:
+                        print('"{}"" from "{}"; title = {}'.format(
+                            k.encode('utf-8'), kw.encode('utf-8'), a.title.encode('utf-8')))
+                        newkeys.append(k)
 
 
 if __name__ == "__main__":
@@ -90,7 +72,8 @@ if __name__ == "__main__":
         parser.add_argument ("-v", "--verbose", action="store_true", default=False, help="verbose output (logging level == INFO")
         parser.add_argument ("-vv", "--veryverbose", action="store_true", default=False, help="very verbose output (logging level == DEBUG")
         parser.add_argument ("--progress", action="store_true", default=False, help="show progress")
-        #parser.add_argument('postfile', type=str, nargs='?', help='filename containing list of post files to process')
+        parser.add_argument ("-g", "--glob", type=str, action="append", default=None, help="only process post files whose path (relative to whence) or name matches this glob pattern; may be repeated")
+        parser.add_argument ("--postfile", type=str, default=None, help="filename containing list of post files to process, one per line, instead of walking whence ('-' reads stdin)")
         parser.add_argument('whence', type=str, nargs=1, help='path to directory to read and process')
         args = parser.parse_args()
         if args.loglevel is not None:
@@ -112,12 +95,12 @@ if __name__ == "__main__":
         logging.debug("command line: '%s'" % ' '.join(sys.argv))
         main(args)
         sys.exit(0)
-    except KeyboardInterrupt, e: # Ctrl-C
+    except KeyboardInterrupt as e: # Ctrl-C
         raise e
-    except SystemExit, e: # sys.exit()
+    except SystemExit as e: # sys.exit()
         raise e
-    except Exception, e:
-        print "ERROR, UNEXPECTED EXCEPTION"
-        print str(e)
+    except Exception as e:
+        print("ERROR, UNEXPECTED EXCEPTION")
+        print(str(e))
         traceback.print_exc()
         os._exit(1)
@@ -7,23 +7,42 @@ Script to walk AWOL backup and create json resource files.
 import _mypath
 import argparse
 import errno
-import fileinput
-from functools import wraps
-import hashlib
-import json
+from functools import partial, wraps
+import heapq
 import logging
+import multiprocessing
 import os
-import pprint
 import re
 import sys
+import threading
+import time
 import traceback
 
+from lxml import etree as exml
+
 from isaw.awol import awol_article, resource
+from isaw.awol.language import MARC_LANGUAGES, load_model
+from isaw.awol.parse import awol_parse
 from isaw.awol.parse.awol_parsers import AwolParsers
+from isaw.awol.tools import metrics
+from isaw.awol.tools.article_cache import ArticleCache
+from isaw.awol.tools.budget import BudgetPool
+from isaw.awol.tools.manifest import Manifest, digest_data, digest_file
+from isaw.awol.tools.parse_cache import ParseCache
+from isaw.awol.tools.posts import iter_export, iter_posts
+from isaw.awol.tools.quarantine import Quarantine
+from isaw.awol.tools.routes import RoutingIndex, parser_name
+from isaw.awol.tools.shards import ShardWriter, parse_shard, post_id, shard_of
+from isaw.awol.tools.sinks import DirectorySink, JsonLinesSink
+from isaw.awol.tools.store import ResourceStore, log_index, store_resource
 
-RX_URLFLAT = re.compile(r'[=+\?\{\}\{\}\(\)\\\-_&%#/,\.;:]+')
-RX_DEDUPEH = re.compile(r'[-]+')
 DEFAULTLOGLEVEL = logging.WARNING
+POOL_CHUNKSIZE = 8
+PROGRESS_EVERY = 50
+SLOWEST_COUNT = 10
+PARSERS = None
+ARTICLE_CACHE = None
+PARSE_CACHE = None
 
 def arglogger(func):
     """
@@ -37,6 +56,242 @@ def arglogger(func):
     return inner
 
 
+def _get_parsers():
+    """Return the AwolParsers bank for this process, loading it on first use."""
+    global PARSERS
+    if PARSERS is None:
+        PARSERS = AwolParsers()
+    return PARSERS
+
+
+def _use_languages(marc_languages):
+    """Restrict language identification to MARC_LANGUAGES, or not, for this process."""
+    if marc_languages:
+        awol_parse.LANGUAGE_DETECTOR.restrict(MARC_LANGUAGES)
+    else:
+        awol_parse.LANGUAGE_DETECTOR.restrict(None)
+
+
+def _use_caches(article_cache_dir, parse_cache_dir, marc_languages=False):
+    """Set the article and parse caches for this process (None for no cache)."""
+    global ARTICLE_CACHE, PARSE_CACHE
+    if article_cache_dir is None:
+        ARTICLE_CACHE = None
+    else:
+        ARTICLE_CACHE = ArticleCache(article_cache_dir)
+    if parse_cache_dir is None:
+        PARSE_CACHE = None
+    elif marc_languages:
+        PARSE_CACHE = ParseCache(parse_cache_dir, settings=u'languages=' + u','.join(MARC_LANGUAGES))
+    else:
+        PARSE_CACHE = ParseCache(parse_cache_dir)
+
+
+def _init_worker(article_cache_dir, parse_cache_dir, marc_languages=False):
+    """Pool initializer: set up the caches and language identification and load the parsers."""
+    _use_caches(article_cache_dir, parse_cache_dir, marc_languages)
+    _use_languages(marc_languages)
+    _get_parsers()
+
+
+def parse_post(target, known_sha1=None, data=None):
+    """Parse one post into a compact, picklable payload.
+
+    The post is read from the file target or, if data is given, from the
+    serialized Atom entry in data (target then just names it).
+
+    This is the unit of work handed to pool workers: only the article
+    metadata needed for logging and the plain-data dictionaries of the
+    resulting resources travel back to the parent (never soups or
+    article objects). If the content hash of the file matches known_sha1
+    (i.e., what the manifest says an earlier run saw), parsing is skipped
+    and the payload is flagged as unchanged. With an article cache, the
+    normalized article is loaded from the cache if an earlier run saved it
+    and saved there otherwise; likewise, with a parse cache, the resources
+    are taken from the cache if the same post was parsed before by the
+    same parser code with the same vocabularies. Posts left out by their title or categories
+    (see awol_article.omit_reason) are flagged as omitted, and their
+    content is never cleaned up or parsed. If loading or parsing the
+    article fails, the payload carries a 'failed' dictionary describing
+    the failure (stage, exception, message, traceback) instead of
+    resources, so that one bad post never ends the run.
+    """
+    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    payload = {
+        'target': target,
+        'sha1': _digest(target, data),
+        'title': None,
+        'url': None,
+        'resources': []
+    }
+    if known_sha1 is not None and payload['sha1'] == known_sha1:
+        payload['unchanged'] = True
+        return payload
+    logger.info('\n=========================================================================================\nARTICLE:\n')
+    a = None
+    if ARTICLE_CACHE is not None:
+        a = ARTICLE_CACHE.load(payload['sha1'], awol_article.AwolArticle)
+    if a is None:
+        try:
+            if data is None:
+                a = awol_article.AwolArticle(atom_file_name=target)
+            else:
+                a = awol_article.AwolArticle(entry=exml.fromstring(data))
+            if a.omitted is None:
+                a.html  # cleaned up lazily: do it now so failures count as article failures
+        except Exception as e:
+            logger.warning(e)
+            payload['failed'] = _failure('article', e)
+            return payload
+        if ARTICLE_CACHE is not None and a.omitted is None:
+            ARTICLE_CACHE.save(payload['sha1'], a)
+    if a.omitted is not None:
+        logger.info(u'omitted {0}: {1}'.format(a.url, a.omitted))
+        payload['title'] = a.title
+        payload['url'] = a.url
+        payload['omitted'] = a.omitted
+        return payload
+    logger.info(u'article title: {0}'.format(a.title))
+    logger.info(u'url: {0}'.format(a.url))
+    awol_id = '-'.join(('awol', a.id.split('.')[-1]))
+    logger.info('awol_id: {0}'.format(awol_id))
+    payload['title'] = a.title
+    payload['url'] = a.url
+    parsers = _get_parsers()
+    try:
+        try:
+            parser = parsers.select(a)
+        finally:
+            payload['domains'] = list(parsers.domains)
+        payload['parser'] = parser_name(parser)
+        key = None
+        if PARSE_CACHE is not None:
+            key = PARSE_CACHE.key(payload['sha1'], parser)
+            resource_dicts = PARSE_CACHE.load(key)
+            if resource_dicts is not None:
+                payload['resources'] = resource_dicts
+                return payload
+        resources = parsers.parse(a, parser)
+    except NotImplementedError as e:
+        # no parser for this kind of post: not a failure
+        logger.warning(e)
+    except Exception as e:
+        logger.warning(e)
+        payload['failed'] = _failure('parse', e)
+    else:
+        if resources is not None:
+            payload['resources'] = [r.__dict__ for r in resources]
+        if key is not None:
+            PARSE_CACHE.save(key, payload['resources'])
+    return payload
+
+
+def _digest(target, data):
+    if data is None:
+        return digest_file(target)
+    return digest_data(data)
+
+
+def _failure(stage, e):
+    """Describe an exception in plain (picklable) data."""
+    return {
+        'stage': stage,
+        'exception': type(e).__name__,
+        'message': str(e),
+        'traceback': traceback.format_exc()
+    }
+
+
+def _parse_job(job):
+    """Unpack a (target, known_sha1, data) job for Pool.imap.
+
+    The stage timings gathered while parsing ride back with the payload
+    so that the parent can total them, whichever process did the work.
+    """
+    start = time.perf_counter()
+    with metrics.timer('post'):
+        payload = parse_post(*job)
+    payload['seconds'] = time.perf_counter() - start
+    payload['metrics'] = metrics.take()
+    return payload
+
+
+def _stand_in_payload(job, seconds, failed):
+    """Stand in for the payload of a post whose worker could not deliver one."""
+    target, known_sha1, data = job
+    return {
+        'target': target,
+        'sha1': _digest(target, data),
+        'title': None,
+        'url': None,
+        'resources': [],
+        'seconds': seconds,
+        'failed': failed,
+        'metrics': {}
+    }
+
+
+def _timeout_payload(job, seconds):
+    """Stand in for the payload of a post whose worker was killed."""
+    payload = _stand_in_payload(job, seconds, {
+        'stage': 'budget',
+        'exception': 'TimeoutError',
+        'message': 'killed after {0:.1f}s'.format(seconds),
+        'traceback': None
+    })
+    payload['timed_out'] = True
+    return payload
+
+
+def _worker_failure_payload(job, message):
+    """Stand in for the payload of a post whose worker died or raised."""
+    lines = message.split(u'\n', 1)
+    payload = _stand_in_payload(job, 0.0, {
+        'stage': 'worker',
+        'exception': 'WorkerError',
+        'message': lines[0],
+        'traceback': lines[1] if len(lines) > 1 else None
+    })
+    payload['worker_failed'] = True
+    return payload
+
+
+def _count_posts(progress, root_dir, patterns, post_list, shard=None):
+    """Count the posts to process and give the total to progress."""
+    posts = ((target, None) for target in iter_posts(root_dir, patterns, post_list))
+    if shard is not None:
+        posts = _select_shard(posts, shard, {})
+    progress.total = sum(1 for post in posts)
+
+
+def _select_shard(posts, shard, ordinals):
+    """Yield the (target, data) posts in a shard, noting each one's place in the full walk."""
+    i, n = shard
+    for ordinal, (target, data) in enumerate(posts):
+        if data is None:
+            pid = post_id(target)
+        else:
+            pid = target.rsplit('#', 1)[-1]
+        if shard_of(pid, n) == i:
+            ordinals[target] = ordinal
+            yield (target, data)
+
+
+def _throttle(jobs, slots):
+    """Hold back jobs until a slot is free, so Pool.imap cannot read ahead unboundedly."""
+    for job in jobs:
+        slots.acquire()
+        yield job
+
+
+def retract_outputs(outputs, sink):
+    """Remove resources no post produces any more."""
+    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    for domain, resource_key in outputs:
+        if sink.remove(domain, resource_key):
+            logger.info(u'retracted {0}'.format(sink.location(domain, resource_key)))
+
+
 @arglogger
 def main (args):
     """
@@ -44,163 +299,236 @@ def main (args):
     """
     logger = logging.getLogger(sys._getframe().f_code.co_name)
     root_dir = args.whence[0]
+    export = None
+    if args.atom_export:
+        # post paths are relative to the directory holding the export
+        export = root_dir
+        root_dir = os.path.dirname(export) or os.curdir
     dest_dir = args.thence[0]
     walk_count = 0
-    resources = None
     index = {}
-    parsers = AwolParsers()
-    logger.info(list(os.walk(root_dir)))
-    for dir_name, sub_dir_list, file_list in os.walk(root_dir):  #ask Tom
-        logger.info("Blah3")
-        if resources is not None:
-            logger.info("Blah2")
-            del resources
-        
-        for file_name in file_list:
-            logger.info("Blah4")
-            if 'post-' in file_name and file_name[-4:] == '.xml':
-                walk_count = walk_count + 1
-                if args.progress and walk_count % 50 == 1:
-                    print('\n*****************************\nPERCENT COMPLETE: {0:.0f}\n'.format(float(walk_count)/4261.0*100.0))
-                logger.info('\n=========================================================================================\nARTICLE:\n')
-                target = os.path.join(dir_name, file_name)
-                try:
-                    a = awol_article.AwolArticle(atom_file_name=target)
-                except (ValueError, RuntimeError) as e:
-                    logger.warning(e)
-                else:
-                    logger.info(u'article title: {0}'.format(a.title))
-                    logger.info(u'url: {0}'.format(a.url))
-                    awol_id = '-'.join(('awol', a.id.split('.')[-1]))
-                    logger.info('awol_id: {0}'.format(awol_id))
-                    resources = None
-                    try:
-                        resources = parsers.parse(a)
-                    except NotImplementedError as e:
-                        logger.warning(e)
-                    else:
-                        try:
-                            length = len(resources)
-                        except TypeError:
-                            length = 0
-                        if length > 0:
-                            for i,r in enumerate(resources):
-                                logger.info(u'\n-----------------------------------------------------------------------------------------\nRESOURCE\n')
-                                logger.info(u'url: {0}'.format(r.url))
-                                logger.info(u'title: {0}'.format(r.title))
-                                domain = r.domain
-                                this_dir = os.path.join(dest_dir, domain)
-                                try:
-                                    os.makedirs(this_dir)
-                                except OSError as exc:
-                                    if exc.errno == errno.EEXIST and os.path.isdir(this_dir):
-                                        pass
-                                    else: raise
-                                try:
-                                    domain_index = index[domain]
-                                except KeyError:
-                                    domain_index = index[domain] = {}
-                                stub = r.url.split(domain)[-1][1:].encode('utf-8')
-                                if stub == '' or stub == '/':
-                                    stub = domain.encode('utf-8').replace('.', '-')
-                                if stub[-1] == '/':
-                                    stub = stub[:-1]
-                                if len(stub) > 80 or '?' in stub or '&' in stub or '%' in stub or ' ' in stub:
-                                    m = hashlib.sha1()
-                                    m.update(stub)
-                                    resource_key = m.hexdigest()
-                                else:
-                                    resource_key = RX_DEDUPEH.sub('-', RX_URLFLAT.sub('-', stub))
-                                filename = '.'.join((resource_key, 'json'))
-                                this_path = os.path.join(this_dir, filename)
-                                try:
-                                    domain_resources = domain_index[resource_key]
-                                except KeyError:
-                                    pass
-                                else:
-                                    # collision! load earlier version from disk and merge
-                                    logger.warning('collision in {0}: {1}/{2}'.format(a.url, r.domain, resource_key))
-                                    r_earlier = resource.Resource()
-                                    r_earlier.json_load(this_path)
-                                    try:
-                                        r_merged = resource.merge(r_earlier, r)
-                                    except ValueError(e):
-                                        logger.error(unicode(e) + u' while trying to merge; saving separately')
-                                        m = hashlib.sha1()
-                                        m.update(r.url)
-                                        resource_key = m.hexdigest()
-                                        filename = '.'.join((resource_key, 'json'))
-                                        this_path = os.path.join(this_dir, filename)
-                                    else:
-                                        r = r_merged
-                                    del r_earlier
-                                r.resource_key = resource_key
-                                r.json_dump(this_path, formatted=True)
-                                logger.info(u'filename: {0}'.format(this_path))
-                                try:
-                                    resource_title = r.extended_title
-                                except AttributeError:
-                                    resource_title = r.title
-                                resource_package = {
-                                    'title_full': resource_title,
-                                    'url': r.url,
-                                    'key': resource_key,
-                                }
-                                if resource_title != r.title:
-                                    resource_package['title'] = r.title
-                                try:
-                                    resource_list = domain_index[resource_key]
-                                except KeyError:
-                                    resource_list = domain_index[resource_key] = []
-                                resource_list.append(resource_package)
-            else:
-                logger.debug('skipping {0}'.format(file_name))
-        for ignore_dir in ['.git', '.svn', '.hg']:
-            if ignore_dir in sub_dir_list:
-                sub_dir_list.remove(ignore_dir)
-
-    logger.info('sorting domain list')
-    domain_list = sorted(index.keys())
-    domain_count = len(domain_list)
-    resource_count = 0
-    record_count = 0
-    max_collisions = 0
-    total_collisions = 0
-    redundant_resources = 0
-    logger.info("FULL INDEX OF RESOURCES")
-    logger.info("=======================")
-    for domain in domain_list:
-        logger.info(domain)
-        i = 0
-        dash = ''
-        while i < len(domain):
-            dash = dash+'-'
-            i = i+1
-        logger.info(dash)
-        logger.info(u'sorting resource list for domain {0}'.format(domain))
-        resource_list = sorted(index[domain].keys())
-        logger.info('{0} unique resources in this domain'.format(len(resource_list)))
-        resource_count = resource_count + len(resource_list)
-        for resource_key in resource_list:
-            resources = index[domain][resource_key]
-            logger.info(u'    {0}'.format(resources[0]['title_full']))
-            record_count = record_count + len(resources)
-            if len(resources) > 1:
-                logger.info ('        multiple records: {0}'.format(len(resources)))
-                total_collisions = total_collisions + len(resources)
-                redundant_resources = redundant_resources + 1
-                if len(resources) > max_collisions:
-                    max_collisions = len(resources)
-    logger.info("=======================")
-    logger.info("Total {0} domains".format(domain_count))
-    logger.info("Total {0} unique resources recorded".format(resource_count))
-    logger.info("Total number of records: {0}".format(record_count))
-    logger.info("Highest number of redundancies (collisions): {0}".format(max_collisions))
-    logger.info("Total number of redundant records: {0}".format(total_collisions))
+    manifest = None
+    if args.manifest is not None:
+        manifest = Manifest(args.manifest)
+    unchanged_count = 0
+    omitted_count = 0
+    quarantine = None
+    if args.quarantine is not None:
+        quarantine = Quarantine(args.quarantine)
+    failed = []
+    _use_caches(args.article_cache, args.parse_cache, args.marc_languages)
+    _use_languages(args.marc_languages)
+    routes = None
+    selected = None
+    if args.routes is not None:
+        routes = RoutingIndex(args.routes)
+        if args.domain is not None or args.parser is not None:
+            selected = set(routes.select(args.domain, args.parser))
+            logger.info('re-processing {0} posts routed to {1}'.format(
+                len(selected), u', '.join((args.domain or []) + (args.parser or []))))
+    # a retry, a selection by route or by name only processes some of the
+    # posts: merge into what earlier runs wrote instead of overwriting it
+    partial_run = args.retry_quarantine or selected is not None or args.glob is not None or args.postfile is not None
+    if args.jsonl is not None:
+        sink = JsonLinesSink(args.jsonl)
+    else:
+        sink = DirectorySink(dest_dir)
+    store = ResourceStore(sink, args.max_resident, seed=partial_run)
+    progress = metrics.Progress()
+    if args.progress and not args.retry_quarantine and selected is None:
+        if args.count_posts:
+            if export is None and args.postfile != '-':
+                # posts are discovered lazily, so count them alongside to get an ETA
+                counter = threading.Thread(target=_count_posts, args=(progress, root_dir, args.glob, args.postfile, args.shard))
+                counter.daemon = True
+                counter.start()
+        elif manifest is not None and args.glob is None and args.postfile is None:
+            # estimate the total from the posts the previous run saw, rather
+            # than walking the whole tree a second time
+            progress.total = len(manifest.entries)
+            if args.shard is not None:
+                progress.total = progress.total // args.shard[1]
+    if export is not None:
+        posts = iter_export(export)
+        if args.retry_quarantine:
+            progress.total = len(quarantine.posts)
+            logger.info('retrying {0} quarantined posts'.format(len(quarantine.posts)))
+            posts = ((target, data) for target, data in posts if os.path.relpath(target, root_dir) in quarantine.posts)
+        elif selected is not None:
+            progress.total = len(selected)
+            posts = ((target, data) for target, data in posts if os.path.relpath(target, root_dir) in selected)
+    elif selected is not None:
+        progress.total = len(selected)
+        posts = ((os.path.join(root_dir, post_path), None) for post_path in sorted(selected))
+    elif args.retry_quarantine:
+        targets = quarantine.targets()
+        progress.total = len(targets)
+        logger.info('retrying {0} quarantined posts'.format(len(targets)))
+        posts = ((target, None) for target in targets)
+    else:
+        posts = ((target, None) for target in iter_posts(root_dir, args.glob, args.postfile))
+    shard_writer = None
+    ordinals = {}
+    if args.shard is not None:
+        posts = _select_shard(posts, args.shard, ordinals)
+        shard_file = args.shard_file
+        if shard_file is None:
+            try:
+                os.makedirs(dest_dir)
+            except OSError as exc:
+                if exc.errno == errno.EEXIST and os.path.isdir(dest_dir):
+                    pass
+                else: raise
+            shard_file = os.path.join(dest_dir, 'shard-{0}-of-{1}.jsonl'.format(*args.shard))
+        shard_writer = ShardWriter(shard_file, *args.shard)
+    if manifest is None or selected is not None:
+        # (posts selected by route are re-parsed even if unchanged: it is
+        # their parser that changed)
+        jobs = ((target, None, data) for target, data in posts)
+    else:
+        jobs = ((target, manifest.digest(os.path.relpath(target, root_dir)), data) for target, data in posts)
+    slots = None
+    pool = None
+    budget_pool = None
+    if args.budget is not None or args.workers > 1:
+        # decode the langid model here, once: forked workers (including
+        # those started afresh after a post overran its budget) share it
+        load_model()
+    if args.budget is not None:
+        # one post per worker at a time, so an overrunning post (or one
+        # that kills its worker) costs nothing but itself
+        budget_pool = BudgetPool(max(args.workers, 1), _parse_job, args.budget, _timeout_payload, initializer=partial(_init_worker, args.article_cache, args.parse_cache, args.marc_languages), describe=lambda job: job[0], on_failure=_worker_failure_payload)
+        payloads = budget_pool.imap(jobs)
+    elif args.workers > 1:
+        # workers hand back payloads in submission order (imap), so the
+        # parent sees exactly the sequence a serial run would
+        pool = multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(args.article_cache, args.parse_cache, args.marc_languages))
+        if export is not None:
+            # don't let the pool slurp the whole export into its task queue
+            slots = threading.BoundedSemaphore(args.workers * POOL_CHUNKSIZE * 4)
+            jobs = _throttle(jobs, slots)
+        payloads = pool.imap(_parse_job, jobs, POOL_CHUNKSIZE)
+    else:
+        payloads = (_parse_job(job) for job in jobs)
+    timed_out = []
+    worker_failed = []
+    slowest = []
     try:
-        logger.info("Percentage of redundantly recorded resources:  {0:.2f}".format(round(float(redundant_resources)/float(resource_count)*100.0),2))
-    except ZeroDivisionError:
-        print("No records!")
+        for payload in payloads:
+            walk_count = walk_count + 1
+            if slots is not None:
+                slots.release()
+            metrics.add(payload['metrics'])
+            progress.step()
+            if args.progress and walk_count % PROGRESS_EVERY == 0:
+                print(progress.line())
+            post_path = os.path.relpath(payload['target'], root_dir)
+            ordinal = ordinals.pop(payload['target'], None)
+            if routes is not None:
+                if 'domains' in payload:
+                    routes.record(post_path, payload['domains'], payload.get('parser'))
+                elif 'omitted' in payload:
+                    routes.remove(post_path)
+            if payload.get('timed_out', False):
+                logger.error(u'{0} exceeded the time budget of {1}s; skipped'.format(post_path, args.budget))
+                timed_out.append(post_path)
+            if payload.get('worker_failed', False):
+                worker_failed.append(post_path)
+            if 'failed' in payload:
+                # not recorded in the manifest, so it is tried again next run
+                f = payload['failed']
+                if not payload.get('timed_out', False):
+                    logger.error(u'{0} failed at the {1} stage ({2}: {3}); skipped'.format(
+                        post_path, f['stage'], f['exception'], f['message']))
+                failed.append(post_path)
+                if quarantine is not None:
+                    quarantine.add(post_path, payload['target'], payload['sha1'],
+                        f['stage'], f['exception'], f['message'], f['traceback'])
+                continue
+            if quarantine is not None and quarantine.remove(post_path):
+                logger.info(u'{0} no longer fails; released from quarantine'.format(post_path))
+            if len(slowest) < SLOWEST_COUNT:
+                heapq.heappush(slowest, (payload['seconds'], post_path))
+            else:
+                heapq.heappushpop(slowest, (payload['seconds'], post_path))
+            if 'omitted' in payload:
+                omitted_count = omitted_count + 1
+            if payload.get('unchanged', False):
+                # replay what the earlier run parsed so that keys, collisions
+                # and the index come out exactly as in a full run
+                entry = manifest.lookup(post_path, payload['sha1'])
+                unchanged_count = unchanged_count + 1
+                url = entry['url']
+                resource_dicts = entry['resources']
+            else:
+                url = payload['url']
+                resource_dicts = payload['resources']
+            outputs = []
+            for d in resource_dicts:
+                r = resource.Resource()
+                r.__dict__ = dict(d)
+                with metrics.timer('store.resource'):
+                    outputs.append(store_resource(r, url, store, index))
+            if manifest is not None:
+                manifest.record(post_path, payload['sha1'], url, resource_dicts, outputs)
+            if shard_writer is not None:
+                shard_writer.write(ordinal, post_path, url, resource_dicts)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if budget_pool is not None:
+            budget_pool.close()
+        if shard_writer is not None:
+            shard_writer.close()
+    with metrics.timer('store.flush'):
+        store.flush()
+    if args.progress:
+        print(progress.line())
+    slowest = sorted(slowest, reverse=True)
+    for seconds, post_path in slowest:
+        logger.info(u'slow post: {0} ({1:.2f}s)'.format(post_path, seconds))
+    if len(timed_out) > 0:
+        logger.warning(u'{0} posts exceeded the time budget and were skipped:\n{1}'.format(
+            len(timed_out), u'\n'.join(timed_out)))
+    if len(worker_failed) > 0:
+        logger.warning(u'{0} posts lost their worker process and were skipped:\n{1}'.format(
+            len(worker_failed), u'\n'.join(worker_failed)))
+    if len(failed) > 0:
+        if quarantine is not None:
+            where = u'quarantined in {0}'.format(quarantine.dir_name)
+        else:
+            where = u'skipped'
+        logger.warning(u'{0} posts failed and were {1}'.format(len(failed), where))
+    if omitted_count > 0:
+        logger.info(u'{0} posts omitted by title or category'.format(omitted_count))
+    if manifest is not None:
+        if not partial_run:
+            retracted = manifest.retract_unseen()
+        else:
+            # posts outside a partial selection have not vanished
+            retracted = []
+        retract_outputs(manifest.stale_outputs(), store.sink)
+        manifest.save()
+        logger.info('{0} posts unchanged since last run, {1} re-parsed, {2} retracted'.format(
+            unchanged_count, walk_count - unchanged_count, len(retracted)))
+    if routes is not None:
+        routes.save()
+    if args.metrics is not None:
+        progress.dump(args.metrics,
+            workers=args.workers,
+            unchanged=unchanged_count,
+            omitted=omitted_count,
+            resources_written=store.write_count,
+            timed_out=timed_out,
+            worker_failed=worker_failed,
+            failed=failed,
+            slowest=[{'post': post_path, 'seconds': round(seconds, 3)} for seconds, post_path in slowest])
+        logger.info('wrote timing metrics to {0}'.format(args.metrics))
+
+    log_index(index)
+
+
 if __name__ == "__main__":
     log_level = DEFAULTLOGLEVEL
     log_level_name = logging.getLevelName(log_level)
@@ -212,10 +540,57 @@ if __name__ == "__main__":
         parser.add_argument ("-v", "--verbose", action="store_true", default=False, help="verbose output (logging level == INFO")
         parser.add_argument ("-vv", "--veryverbose", action="store_true", default=False, help="very verbose output (logging level == DEBUG")
         parser.add_argument ("--progress", action="store_true", default=False, help="show progress")
-        #parser.add_argument('postfile', type=str, nargs='?', help='filename containing list of post files to process')
-        parser.add_argument('whence', type=str, nargs=1, help='path to directory to read and process')
+        parser.add_argument ("--count-posts", action="store_true", default=False, help="with --progress, count the posts to process in a second walk of whence alongside the run, for an exact ETA; otherwise the ETA is estimated from the posts in the manifest (if any); not with --atom-export or --postfile -")
+        parser.add_argument ("-w", "--workers", type=int, default=1, help="number of worker processes to use for parsing posts")
+        parser.add_argument ("-b", "--budget", type=float, default=None, help="wall-clock budget in seconds for parsing a single post; posts are parsed in isolated worker processes, and a post that overruns (or kills its worker) is skipped and reported at the end")
+        parser.add_argument ("-m", "--manifest", type=str, default=None, help="manifest file recording post hashes and parsed resources; posts unchanged since the previous run are not re-parsed")
+        parser.add_argument ("--max-resident", type=int, default=None, help="maximum number of resources to hold in memory for merging before writing the least recently used ones out early; unlimited if not given")
+        parser.add_argument ("--jsonl", type=str, default=None, help="write all resources as lines of this JSON Lines file (gzipped if the name ends in .gz), with an offset index alongside, instead of one file per resource in thence")
+        parser.add_argument ("--metrics", type=str, default=None, help="write overall throughput and per-stage timings (as JSON) to this file")
+        parser.add_argument ("--article-cache", type=str, default=None, help="directory in which to cache normalized articles by post content hash, so that later runs skip HTML cleanup for posts they have seen before")
+        parser.add_argument ("--parse-cache", type=str, default=None, help="directory in which to cache the resources parsed from each post, keyed by post content hash, parser code and vocabularies, so that later runs only re-parse posts whose parser (or vocabularies) changed")
+        parser.add_argument ("--marc-languages", action="store_true", default=False, help="only identify the languages that COACS_json_to_marc.py can map to MARC language codes, which is faster and leaves fewer resources without a language")
+        parser.add_argument ("-q", "--quarantine", type=str, default=None, help="directory in which to record posts that fail to load or parse (stage, exception, traceback and content hash), one JSON file per post")
+        parser.add_argument ("--retry-quarantine", action="store_true", default=False, help="process only the posts recorded in the quarantine directory, releasing those that now succeed")
+        parser.add_argument ("--routes", type=str, default=None, help="routing index file recording, for every post parsed, the resource domains found in it and the parser it was routed to")
+        parser.add_argument ("--domain", type=str, action="append", default=None, help="only re-process the posts that the routing index (--routes) says hit this resource domain; may be repeated")
+        parser.add_argument ("--parser", type=str, action="append", default=None, help="only re-process the posts that the routing index (--routes) says were routed to this parser module (e.g., awol_parse_othes_univie or othes_univie); may be repeated")
+        parser.add_argument ("--shard", type=str, default=None, help="process only shard i of N (given as i/N), chosen by a stable hash of each post's id, and write a shard file for merge_shards.py")
+        parser.add_argument ("--shard-file", type=str, default=None, help="name of the shard file to write with --shard (gzipped if the name ends in .gz); shard-i-of-N.jsonl in thence if not given")
+        parser.add_argument ("--atom-export", action="store_true", default=False, help="whence is a single Blogger export or Atom feed file, whose post entries are read one at a time, instead of a directory of post files")
+        parser.add_argument ("-g", "--glob", type=str, action="append", default=None, help="only process post files whose path (relative to whence) or name matches this glob pattern; may be repeated")
+        parser.add_argument ("--postfile", type=str, default=None, help="filename containing list of post files to process, one per line, instead of walking whence ('-' reads stdin)")
+        parser.add_argument('whence', type=str, nargs=1, help='path to directory to read and process (or, with --atom-export, to the export file)')
         parser.add_argument('thence', type=str, nargs=1, help='path to directory where you want the json-serialized resources dumped')
         args = parser.parse_args()
+        if args.jsonl is not None and args.max_resident is not None:
+            parser.error('--max-resident cannot be used with --jsonl, which writes each resource only once')
+        if args.count_posts and not args.progress:
+            parser.error('--count-posts requires --progress')
+        if args.count_posts and (args.atom_export or args.postfile == '-'):
+            parser.error('--count-posts only counts post files under whence or listed in a --postfile file, so it cannot be combined with --atom-export or --postfile -')
+        if args.retry_quarantine and args.quarantine is None:
+            parser.error('--retry-quarantine requires --quarantine')
+        if args.jsonl is not None and (args.retry_quarantine or args.domain is not None or args.parser is not None or args.glob is not None or args.postfile is not None):
+            parser.error('--jsonl cannot be combined with --retry-quarantine, --domain, --parser, --glob or --postfile: the JSON Lines file would be rewritten with the resources of the posts processed alone')
+        if args.shard is not None:
+            try:
+                args.shard = parse_shard(args.shard)
+            except ValueError as e:
+                parser.error(str(e))
+            if args.retry_quarantine:
+                parser.error('--shard cannot be combined with --retry-quarantine')
+        elif args.shard_file is not None:
+            parser.error('--shard-file requires --shard')
+        if args.domain is not None or args.parser is not None:
+            if args.routes is None:
+                parser.error('--domain and --parser require --routes')
+            if args.retry_quarantine or args.glob is not None or args.postfile is not None:
+                parser.error('--domain and --parser cannot be combined with --retry-quarantine, --glob or --postfile')
+        if args.atom_export and (args.glob is not None or args.postfile is not None):
+            parser.error('--atom-export cannot be combined with --glob or --postfile')
+        if args.retry_quarantine and (args.glob is not None or args.postfile is not None):
+            parser.error('--retry-quarantine cannot be combined with --glob or --postfile')
         if args.loglevel is not None:
             args_log_level = re.sub('\s+', '', args.loglevel.strip().upper())
             try:
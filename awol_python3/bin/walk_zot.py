@@ -17,6 +17,7 @@ import traceback
 
 from pyzotero import zotero
 from isaw.awol import awol_article
+from isaw.awol.tools.posts import iter_posts
 
 DEFAULTLOGLEVEL = logging.WARNING
 
@@ -43,42 +44,31 @@ def main (args):
     zot = zotero.Zotero(creds['libraryID'], creds['libraryType'], creds['apiKey'])
     root_dir = args.whence[0]
     parse_count = 0
-    resources = None
-    for dir_name, sub_dir_list, file_list in os.walk(root_dir):
+    for target in iter_posts(root_dir, args.glob, args.postfile):
         logger.info('parse_count: {0}'.format(parse_count))
-        if resources is not None:
-            del resources
-        for file_name in file_list:
-            if 'post-' in file_name and file_name[-4:] == '.xml':
-                logger.info('parsing {0}'.format(file_name))
-                target = os.path.join(dir_name, file_name)
-                a = awol_article.AwolArticle(atom_file_name=target)
-                try:
-                    resources = a.parse_atom_resources()
-                except NotImplementedError, msg:
-                    pass
-                else:
-                    try:
-                        logger.info('found {0} resources'.format(len(resources)))
-                    except TypeError:
-                        logger.info('found 0 resources')
-                    else:
-                        print '*\n*\n*\n* BOOM \n*\n*\n*\n'
-                        parse_count = parse_count + len(resources)
-                        for r in resources:
-                            logger.debug(repr(r))
-                            try:
-                                r.zotero_add(zot, creds, extras={'awol':a.url, 'entry':a.id})
-                            except AttributeError:
-                                logger.error("identity test failed; skipping")
-                        print '    parse_count: {0}'.format(parse_count)
-                        #if parse_count > 50:
-                        #    raise Exception
+        logger.info('parsing {0}'.format(target))
+        a = awol_article.AwolArticle(atom_file_name=target)
+        try:
+            resources = a.parse_atom_resources()
+        except NotImplementedError as msg:
+            pass
+        else:
+            try:
+                logger.info('found {0} resources'.format(len(resources)))
+            except TypeError:
+                logger.info('found 0 resources')
             else:
-                logger.debug('skipping {0}'.format(file_name))
-        for ignore_dir in ['.git', '.svn', '.hg']:
-            if ignore_dir in sub_dir_list:
-                sub_dir_list.remove(ignore_dir)
+                print('*\n*\n*\n* BOOM \n*\n*\n*\n')
+                parse_count = parse_count + len(resources)
+                for r in resources:
+                    logger.debug(repr(r))
+                    try:
+                        r.zotero_add(zot, creds, extras={'awol':a.url, 'entry':a.id})
+                    except AttributeError:
+                        logger.error("identity test failed; skipping")
+                print('    parse_count: {0}'.format(parse_count))
+                #if parse_count > 50:
+                #    raise Exception
 
 if __name__ == "__main__":
     log_level = DEFAULTLOGLEVEL
@@ -91,7 +81,8 @@ if __name__ == "__main__":
         parser.add_argument ("-v", "--verbose", action="store_true", default=False, help="verbose output (logging level == INFO")
         parser.add_argument ("-vv", "--veryverbose", action="store_true", default=False, help="very verbose output (logging level == DEBUG")
         parser.add_argument('credfile', type=str, nargs=1, help='path to credential file')
-        #parser.add_argument('postfile', type=str, nargs='?', help='filename containing list of post files to process')
+        parser.add_argument ("-g", "--glob", type=str, action="append", default=None, help="only process post files whose path (relative to whence) or name matches this glob pattern; may be repeated")
+        parser.add_argument ("--postfile", type=str, default=None, help="filename containing list of post files to process, one per line, instead of walking whence ('-' reads stdin)")
         parser.add_argument('whence', type=str, nargs=1, help='path to directory to process')
         args = parser.parse_args()
         if args.loglevel is not None:
@@ -113,12 +104,12 @@ if __name__ == "__main__":
         logging.debug("command line: '%s'" % ' '.join(sys.argv))
         main(args)
         sys.exit(0)
-    except KeyboardInterrupt, e: # Ctrl-C
+    except KeyboardInterrupt as e: # Ctrl-C
         raise e
-    except SystemExit, e: # sys.exit()
+    except SystemExit as e: # sys.exit()
         raise e
-    except Exception, e:
-        print "ERROR, UNEXPECTED EXCEPTION"
-        print str(e)
+    except Exception as e:
+        print("ERROR, UNEXPECTED EXCEPTION")
+        print(str(e))
         traceback.print_exc()
         os._exit(1)
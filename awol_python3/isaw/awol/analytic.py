@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Read the volume, issue and year of a serial's issue from its title.
+
+This module defines the following classes:
+
+ * AnalyticTitleParser: match a title against a cascade of patterns,
+   compiled into a single regular expression, remembering titles and
+   counting which pattern each title matched.
+"""
+
+import time
+
+import regex as re
+
+from isaw.awol.tools import metrics
+
+# tried in this order; the first pattern to match the whole title wins
+ANALYTIC_TITLE_PATTERNS = [
+    # volume, issue, year (e.g. Bd. 52, Nr. 1 (2005))
+    {
+        'name': 'volume_issue_year',
+        'rx': r'Bd\.\s+(\d+),?\s+Nr\.\s+(\d+)\s+\(?(\d{4})\)?',
+        'volume': 1,
+        'issue': 2,
+        'year': 3
+    },
+    # year, blah blah blah, then volume (e.g. u'1888 Mitteilungen des Deutschen Arch\xe4ologischen Instituts / R\xf6mische Abteilung Band 3')
+    {
+        'name': 'year_band',
+        'rx': r'(\d{4})[^\d]+Band (\d+)',
+        'volume': 2,
+        'year': 1
+    },
+    # vol slash year (e.g. University Museums and Collections Journal 4/2011)
+    {
+        'name': 'volume_slash_year',
+        'rx': r'[^\d]*(\d+)\/(\d{4})[^\d]*',
+        'volume': 1,
+        'year': 2,
+    },
+    # year, then volume
+    {
+        'name': 'year_volume',
+        'rx': r'[^\d]*(\d{4})\W*([\d\-]+)[^\d]*',
+        'volume': 2,
+        'year': 1
+    },
+    # volume, then year (e.g. Vol 10 (1997))
+    {
+        'name': 'volume_year',
+        'rx': r'[^\d]*([\d\-]{1,4})\W*(\d{4})[^\d]*',
+        'volume': 1,
+        'year': 2
+    },
+    # year only
+    {
+        'name': 'year',
+        'rx': r'[^\d]*(\d{4})[^\d]*',
+        'year': 1,
+    },
+    # volume only
+    {
+        'name': 'volume',
+        'rx': r'[^\d]*([\d\-]+)[^\d]*',
+        'volume': 1,
+    },
+]
+# no pattern can match a title without any of these
+RX_CANDIDATE = re.compile(r'[\d\-]')
+
+class AnalyticTitleParser():
+    """Get (volume, issue, year) from the title of an issue of a serial.
+
+    The patterns (e.g., ANALYTIC_TITLE_PATTERNS) are joined into one
+    anchored alternation, one branch per pattern, in order. It matches
+    with the first pattern that would have matched on its own, so a
+    title is read in one go. Titles without digits or hyphens cannot
+    match any pattern and are turned away at once.
+
+    Each parse is recorded with the metrics module as a stage named
+    'title.analytic.<pattern name>' (or 'title.analytic.none'). The
+    stage counts therefore show which patterns carry the load (e.g., on
+    long listings of volumes), added up across worker processes like
+    any other stage. Results are remembered by title.
+    """
+
+    MEMO_SIZE = 10000
+
+    def __init__(self, patterns=ANALYTIC_TITLE_PATTERNS):
+        self.patterns = {}
+        branches = []
+        offset = 0
+        for pattern in patterns:
+            name = pattern['name']
+            branches.append(u'(?P<{0}>{1})'.format(name, pattern['rx']))
+            groups = re.compile(pattern['rx']).groups
+            # groups within the alternation: the branch group, then the pattern's own
+            self.patterns[name] = {
+                k: offset + 1 + pattern[k] for k in ('volume', 'issue', 'year') if k in pattern}
+            offset = offset + 1 + groups
+        self.rx = re.compile(u'^(?:' + u'|'.join(branches) + u')$', re.IGNORECASE)
+        self._memo = {}
+
+    def _parse(self, title):
+        if RX_CANDIDATE.search(title) is None:
+            return ('none', None)
+        m = self.rx.match(title)
+        if m is None:
+            return ('none', None)
+        name = m.lastgroup
+        groups = self.patterns[name]
+        return (name, tuple([m.group(groups[k]) if k in groups else None for k in ('volume', 'issue', 'year')]))
+
+    def parse(self, title):
+        """Return (volume, issue, year) for a title (None for parts not found), or None if no pattern matches."""
+
+        start = time.perf_counter()
+        try:
+            name, result = self._memo[title]
+        except KeyError:
+            name, result = self._parse(title)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[title] = (name, result)
+        metrics.record('title.analytic.' + name, time.perf_counter() - start)
+        return result
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Index the anchors of a blog post's content in a single pass.
+
+This module defines the following classes:
+
+ * AnchorIndex: every anchor of a content soup, in document order, with
+   its URL, domain, position and whether it is the first with its URL.
+
+and the following functions:
+
+ * domain_from_url: the domain part of a URL.
+"""
+
+def domain_from_url(url):
+    return url.replace('http://', '').replace('https://', '').split('/')[0]
+
+class AnchorIndex():
+    """All anchors of a content soup, read in one document-order pass.
+
+    Each anchor has an entry (in self.entries, in document order) like this:
+
+        {
+            'anchor': the bs4 element,
+            'position': its place among the anchors, counting from 0,
+            'url': its href (or None),
+            'domain': the domain of url (or None),
+            'first': True unless an earlier anchor has the same href
+        }
+
+    Filter status depends on the skip lists of the parser asking, so it is
+    worked out (once per set of skip lists) by considered().
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.entries = []
+        self.positions = {}
+        seen = set()
+        for position, a in enumerate(soup.find_all('a')):
+            url = a.get('href')
+            self.entries.append({
+                'anchor': a,
+                'position': position,
+                'url': url,
+                'domain': None if url is None else domain_from_url(url),
+                'first': url not in seen
+            })
+            self.positions[id(a)] = position
+            seen.add(url)
+        self._texts = {}
+        self._considered = {}
+
+    def entry(self, anchor):
+        """Return the entry of an anchor element of the soup."""
+
+        return self.entries[self.positions[id(anchor)]]
+
+    def text(self, entry):
+        """Return the text of an entry's anchor (computed once)."""
+
+        position = entry['position']
+        try:
+            return self._texts[position]
+        except KeyError:
+            text = self._texts[position] = entry['anchor'].get_text()
+            return text
+
+    def following(self, anchor):
+        """Return the anchor after the given one in document order, or None."""
+
+        position = self.positions[id(anchor)] + 1
+        if position < len(self.entries):
+            return self.entries[position]['anchor']
+        return None
+
+    def domains(self):
+        """Return the distinct domains linked, in order of first appearance."""
+
+        domains = []
+        seen = set()
+        for e in self.entries:
+            if e['first'] and e['domain'] is not None and e['domain'] not in seen:
+                seen.add(e['domain'])
+                domains.append(e['domain'])
+        return domains
+
+    def urls(self):
+        """Return the distinct URLs linked, in order of first appearance."""
+
+        return [e['url'] for e in self.entries if e['first'] and e['url'] is not None]
+
+    def considered(self, skip_domains, skip_urls, skip_text):
+        """Return the anchors worth considering as resources, in document order.
+
+        These are the first anchors with each URL that have some text and
+        whose domain, URL and text are not to be skipped.
+        """
+
+        key = (tuple(skip_domains), tuple(skip_urls), tuple(skip_text))
+        try:
+            return self._considered[key]
+        except KeyError:
+            pass
+        skip_domains = set(skip_domains)
+        skip_urls = set(skip_urls)
+        skip_text = set(skip_text)
+        anchors = []
+        for e in self.entries:
+            if not e['first'] or e['url'] is None:
+                continue
+            text = self.text(e)
+            if (len(text) > 0
+            and e['domain'] not in skip_domains
+            and e['url'] not in skip_urls
+            and text not in skip_text):
+                anchors.append(e['anchor'])
+        self._considered[key] = anchors
+        return anchors
@@ -8,6 +8,9 @@ This module defines the following classes:
  * Article: represents key information about the post.
 """
 
+import gzip
+import io
+import json
 import logging
 import os
 import sys
@@ -18,20 +21,27 @@ from lxml import etree as exml
 from lxml.etree import XMLSyntaxError as XMLSyntaxError
 
 from isaw.awol.normalize_space import normalize_space
-from isaw.awol.clean_string import purify_text, purify_html
-from isaw.awol.tools import urls
+from isaw.awol.clean_string import purify_text, purify_tree
+from isaw.awol.tools import metrics, urls
 
-XML_PARSER = exml.XMLParser(recover=False)
-XML_PARSER_LENIENT = exml.XMLParser(recover=True)
+HTML_PARSER = exml.HTMLParser()
 XSL_CLEANUP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cleanup.xsl')
 XSL_CLEANUP = exml.parse(XSL_CLEANUP_PATH)
+XSL_TRANSFORM = exml.XSLT(XSL_CLEANUP)  # compiled once per process
+ATOM_CONTENT = '{http://www.w3.org/2005/Atom}content'
+HEADER_FIELDS = ['id', 'title', 'url', 'categories', 'updated']
+JSON_FIELDS = HEADER_FIELDS + ['content', 'html']
 
 class Article():
     """Manipulate and extract data from a blog post."""
 
-    def __init__(self, atom_file_name=None, json_file_name=None):
+    def __init__(self, atom_file_name=None, json_file_name=None, entry=None, header_only=False):
         """Load post from Atom entry or JSON and extract basic info.
 
+        The Atom entry may be given either as the name of a file holding
+        just that entry or, e.g. when streaming a whole Blogger export, as
+        an lxml element (which should be the root of its own document).
+
         The method looks for the following components and saves their
         values as attributes of the object:
 
@@ -40,25 +50,66 @@ class Article():
             * url (unicode): url of the blog post
             * categories (list of unicode strings): categories assigned to
               the blog post
+            * updated (unicode): when the blog post was last updated
             * content (string): raw text content of the blog post
+            * html (unicode): content as cleaned up for parsing
             * soup: soupified content of the blog post.
+
+        The last three are worked out from the content of the entry only
+        when first asked for. With header_only, the other attributes are
+        read from an Atom file and its content is not kept (the file is
+        read again if content, html or soup is wanted after all), which
+        is all that tools looking only at titles and categories need. The
+        whole file is still parsed as XML: Blogger writes the alternate
+        link after the content, so the parse cannot stop short of it.
+
+        A JSON file is one written by json_dump (see _load_json).
         """
 
         logger = logging.getLogger(sys._getframe().f_code.co_name)
 
+        self._raw_content = None
+        self._source_name = None
+        self._content = None
+        self._html = None
+        self._soup = None
         if atom_file_name is not None:
             if json_file_name is not None:
                 logger.warning(
                     'Filenames for both Atom and JSON were specified'
                     + ' in Article constructor. JSON filename ignored.')
 
-            self._load_atom(atom_file_name)
+            if header_only:
+                self._load_header(atom_file_name)
+            else:
+                self._load_atom(atom_file_name)
+        elif entry is not None:
+            self._load_entry(entry, entry.findtext('{http://www.w3.org/2005/Atom}id'))
         elif json_file_name is not None:
-            # todo
-            self.__load_json(json_file_name)
+            self._load_json(json_file_name)
 
     def _load_atom(self, atom_file_name):
-        """Open atom file and parse for basic info.
+        """Open atom file and parse for basic info (see _load_entry)."""
+
+        with metrics.timer('article.read_file'):
+            with open(atom_file_name, 'r') as file_object:
+                doc = exml.parse(file_object)
+        self._load_entry(doc.getroot(), atom_file_name)
+
+    @metrics.timed('article.load_header')
+    def _load_header(self, atom_file_name):
+        """Parse an atom file for basic info, keeping nothing of its content."""
+
+        with open(atom_file_name, 'rb') as file_object:
+            root = exml.parse(file_object).getroot()
+        self._read_header(root)
+        self.doc = None
+        self.root = None
+        self._source_name = atom_file_name
+
+    @metrics.timed('article.load_atom')
+    def _load_entry(self, root, source_name):
+        """Parse an atom entry element for basic info.
 
         We attempt to set the following attributes on the class:
 
@@ -68,10 +119,15 @@ class Article():
          * categories (dictionary) with the following keys:
            * 'vocabulary' (string): captures "scheme" from the entry categories
            * 'term' (string): verbatim from the entry categories
+         * updated (unicode): the first "updated" timestamp in the entry
          * content (unicode): normalized unicode string containing everything
-           that was in the entry content (see normalization comments below)
+           that was in the entry content, as XML-serialized HTML
+         * html (unicode): content after cleanup.xsl, from which the soup
+           is built
          * soup (bs4 BeutifulSoup object): html-parsed version of content
 
+        (The last three are only worked out when first used; see _clean.)
+
         All strings are space normalized (i.e., all continguous spans of
         whitespace are collapsed to a single space and the result string is
         stripped of leading and trailing whitespace).
@@ -80,12 +136,15 @@ class Article():
         converted to Normalization Form "C" (canonical normalized).
         """
 
-        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        self.doc = root.getroottree()
+        self.root = root
+        self._read_header(root)
+        self._raw_content = root.findtext(ATOM_CONTENT, u'')
+        self._source_name = source_name
+
+    def _read_header(self, root):
+        """Set id, title, url, categories and updated from an atom entry element."""
 
-        with open(atom_file_name, 'r') as file_object:
-            self.doc = exml.parse(file_object)
-        self.root = self.doc.getroot()
-        root = self.root
         self.id = root.find('{http://www.w3.org/2005/Atom}id').text.strip()
         #logger.debug('article id: "{0}"'.format(self.id))
 
@@ -123,48 +182,106 @@ class Article():
         # capture categories as vocabulary terms
         self.categories = [{'vocabulary' : c.get('scheme'), 'term' : normalize_space(unicodedata.normalize('NFC', str(c.get('term'))))} for c in root.findall('{http://www.w3.org/2005/Atom}category')]
 
-        # extract content, normalize, and parse as HTML for later use
-        raw_content = root.find('{http://www.w3.org/2005/Atom}content').text
-        soup = BeautifulSoup(raw_content, 'lxml')   # mainly to convert character entities to unicode
-        soup_content = str(soup)
-        del soup
-        content = unicodedata.normalize('NFC', soup_content)
-        del soup_content
-        content = normalize_space(content)
-        content = purify_html(content)  # get rid of all manner of evil, stupid stuff
-        self.content = content
         try:
-            html = exml.fromstring(content, XML_PARSER)
-        except XMLSyntaxError:
-            msg = 'XMLSyntaxError while trying to parse content of {0}; trying html5lib parser with BeautifulSoup and then lxml parser with recover=True'.format(atom_file_name)
-            logger.warning(msg)
-            soup = BeautifulSoup(raw_content, 'html5lib')
-            soup_content = str(soup)
-            del soup
-            content = unicodedata.normalize('NFC', soup_content)
-            del soup_content
-            content = normalize_space(content)
-            content = purify_html(content)
-            self.content = content
-            try:
-                html = exml.fromstring(content, XML_PARSER_LENIENT)
-            except XMLSyntaxError:
-                msg = 'XMLSyntaxError while trying to re-parse content of {0} using html5lib parser with BeautifulSoup'.format(atom_file_name)
-                logger.error(msg)
-                logger.error(content)
-                sys.exit(-1000)
+            self.updated = root.xpath("//*[local-name()='updated']")[0].text.strip()
+        except (IndexError, AttributeError):
+            self.updated = None
+
+    @metrics.timed('article.clean')
+    def _clean(self):
+        """Parse the content as HTML, then purify and clean it up in one lxml tree.
+
+        Sets the values behind the content and html attributes; the raw
+        content is not needed any more afterwards.
+        """
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+
+        if self._raw_content is None:
+            # loaded header only: fetch the content after all
+            with metrics.timer('article.read_file'):
+                doc = exml.parse(self._source_name)
+            self._raw_content = doc.getroot().findtext(ATOM_CONTENT, u'')
+        raw_content = self._raw_content
+        if raw_content.strip() == u'':
+            raw_content = u'<html><body></body></html>'
+        try:
+            with metrics.timer('article.html_parse'):
+                html = exml.fromstring(raw_content, HTML_PARSER)  # also converts character entities to unicode
+        except (XMLSyntaxError, exml.ParserError) as e:
+            msg = 'could not parse content of {0} as HTML: {1}'.format(self._source_name, e)
+            logger.error(msg)
+            raise RuntimeError(msg)
+        with metrics.timer('article.purify'):
+            purify_tree(html)  # get rid of all manner of evil, stupid stuff
+        self._content = exml.tostring(html, encoding='unicode')
 
         #logger.debug('normalized html:\n\n' + exml.tostring(html, pretty_print=True))
-        transform = exml.XSLT(XSL_CLEANUP)
-        clean_html = transform(html)
+        with metrics.timer('article.xslt'):
+            clean_html = XSL_TRANSFORM(html)
         #logger.debug('cleaned html:\n\n' + exml.tostring(clean_html, pretty_print=True))
-        self.soup = BeautifulSoup(exml.tostring(clean_html), 'lxml')
+        self._html = exml.tostring(clean_html, encoding='unicode')
+        self._raw_content = u''
+
+    @property
+    def content(self):
+        """Purified content of the post, as XML-serialized HTML."""
+
+        if self._content is None:
+            self._clean()
+        return self._content
+
+    @property
+    def html(self):
+        """Content as cleaned up by cleanup.xsl."""
 
+        if self._html is None:
+            self._clean()
+        return self._html
 
+    @property
+    def soup(self):
+        """BeautifulSoup of the cleaned content, built on first use."""
+
+        if self._soup is None:
+            with metrics.timer('article.soup_build'):
+                self._soup = BeautifulSoup(self.html, 'lxml')
+        return self._soup
+
+    @metrics.timed('article.load_json')
     def _load_json(self, json_file_name):
-        """open atom file and parse for basic info"""
-        emsg = 'Article constructor does not yet support JSON.'
-        raise NotImplementedError(emsg)
+        """Load a normalized article written by json_dump.
+
+        Everything _load_entry derives from the Atom entry is read back as
+        it was saved, so neither the HTML parser, clean_string nor the XSLT
+        runs again; the soup is only built if something asks for it. The
+        file may be gzip-compressed (if its name ends in '.gz').
+        """
+
+        if json_file_name[-3:] == '.gz':
+            f = gzip.open(json_file_name, 'rt', encoding='utf8')
+        else:
+            f = io.open(json_file_name, 'r', encoding='utf8')
+        with f:
+            d = json.load(f)
+        self.doc = None
+        self.root = None
+        for k in HEADER_FIELDS:
+            setattr(self, k, d[k])
+        self._content = d['content']
+        self._html = d['html']
+
+    def json_dump(self, json_file_name):
+        """Save the normalized article for _load_json (gzipped if the name ends in '.gz')."""
+
+        d = dict([(k, getattr(self, k)) for k in JSON_FIELDS])
+        dump = json.dumps(d, sort_keys=True, ensure_ascii=False).encode('utf8')
+        if json_file_name[-3:] == '.gz':
+            with gzip.open(json_file_name, 'wb') as f:
+                f.write(dump)
+        else:
+            with open(json_file_name, 'wb') as f:
+                f.write(dump)
 
     def __str__(self):
         """Print all data about the article."""
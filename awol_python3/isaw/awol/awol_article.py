@@ -7,49 +7,35 @@ This module defines the following classes:
 
  * AwolArticle: represents key information about the entry.
 
+and the following functions:
+
+ * omit_reason: why a post should not be parsed at all, judging by its
+   title and categories alone.
+
 """
 
 from importlib import import_module
 import logging
 import os
-import pkg_resources
 import re
 import sys
 
 from bs4 import BeautifulSoup
 import langid
 import requests
-import unicodecsv
 
 from isaw.awol.article import Article
 from isaw.awol.normalize_space import normalize_space
 from isaw.awol.resource import Resource
+from isaw.awol.tools.posts import KIND_POST, KIND_SCHEME
+from isaw.awol.vocabulary import COLON_PREFIXES
 
 
 PATH_CURRENT = os.path.dirname(os.path.abspath(__file__))
-# Build a dictionary of format {<colon prefix>:<list of cols 2,3 and 4>}
-colon_prefix_csv = pkg_resources.resource_stream('isaw.awol', 'awol_colon_prefixes.csv')
-dreader = unicodecsv.DictReader(
-    colon_prefix_csv,
-    fieldnames = [
-        'col_pre',
-        'omit_post',
-        'strip_title',
-        'mul_res'
-    ],
-    delimiter = ',',
-    quotechar = '"')
-COLON_PREFIXES = dict()
-for row in dreader:
-    COLON_PREFIXES.update({
-        normalize_space(row['col_pre']).lower():
-            [
-                row['omit_post'],
-                row['strip_title'],
-                row['mul_res']
-            ]
-    })
-del dreader
+OMIT_TITLES = [
+    u'administrative',
+    u'administrative note'
+]
 DOMAINS_TO_IGNORE = [
     'draft.blogger.com'
 ]
@@ -91,22 +77,6 @@ RX_IDENTIFIERS = {
     }
 }
 
-title_strings_csv = pkg_resources.resource_stream('isaw.awol', 'awol_title_strings.csv')
-dreader = unicodecsv.DictReader(
-    title_strings_csv,
-    fieldnames = [
-        'titles',
-        'tags'
-    ],
-    delimiter = ',',
-    quotechar = '"')
-TITLE_SUBSTRING_TAGS = dict()
-for row in dreader:
-    TITLE_SUBSTRING_TAGS.update({row['titles']:row['tags']})
-del dreader
-TITLE_SUBSTRING_TERMS = {k:v for (k,v) in TITLE_SUBSTRING_TAGS.items() if ' ' not in k}
-TITLE_SUBSTRING_TERMS[u'boğazköy'] = u'Boğazköy'
-TITLE_SUBSTRING_PHRASES = {k:v for (k,v) in TITLE_SUBSTRING_TAGS.items() if k not in TITLE_SUBSTRING_TERMS.keys()}
 AGGREGATORS = [
     'www.jstor.org',
     'oi.uchicago.edu',
@@ -223,16 +193,36 @@ def clean_title(raw):
         cooked = cooked.strip()
     return cooked
 
+def omit_reason(title, categories=()):
+    """Return why a post is to be left out (or None if it is not).
+
+    Administrative notes, posts whose title prefix (before the first
+    colon) is marked "omit post" in awol_colon_prefixes.csv, and
+    Blogger entries of any kind other than a post are left out. Only the
+    title and the categories are looked at, so the content of the post
+    never needs to be decoded.
+    """
+
+    for c in categories:
+        if c['vocabulary'] == KIND_SCHEME and c['term'] != KIND_POST:
+            return u'not a post ({0})'.format(c['term'].split('#')[-1])
+    lt = title.lower()
+    if lt in OMIT_TITLES:
+        return u'administrative title'
+    if u':' in title:
+        colon_prefix = lt.split(u':')[0]
+        if colon_prefix in COLON_PREFIXES.keys() and COLON_PREFIXES[colon_prefix][0] == 'yes':
+            return u'omitted title prefix "{0}"'.format(colon_prefix)
+    return None
+
 class AwolArticle(Article):
     """Extracts, normalizes, and stores data from an AWOL blog post."""
 
-    def __init__(self, atom_file_name=None, json_file_name=None):
+    def __init__(self, atom_file_name=None, json_file_name=None, entry=None, header_only=False):
 
-        Article.__init__(self, atom_file_name, json_file_name)
-        lt = self.title.lower()
-        if lt in COLON_PREFIXES.keys():
-            if COLON_PREFIXES[lt][0] == 'yes':
-                return None
+        Article.__init__(self, atom_file_name, json_file_name, entry, header_only)
+        # checked on the header only, before the content is cleaned up
+        self.omitted = omit_reason(self.title, self.categories)
 
 
 
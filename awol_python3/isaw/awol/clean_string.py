@@ -7,6 +7,7 @@ Normalize space in a string.
 import logging
 import re
 import sys
+import unicodedata
 
 from isaw.awol.normalize_space import normalize_space
 
@@ -42,6 +43,7 @@ RX_EXPR = re.compile(r'expr:[^\s=]+=\"[^\"]*\"\s+')   # blogger expr 'namespace'
 RX_SCRIPT = re.compile(r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>')   # evil scripts
 #RX_EMPTY_TAGS = re.compile(ur'<[^\/>][^>]*><\/[^>]+>')
 RX_PUNCTSTRIP = re.compile(r'{P}+')
+RX_SPACE = re.compile(r'\s+')
 
 def clean_string(raw):
     prepped = normalize_space(raw)
@@ -141,7 +143,7 @@ def deduplicate_lines(raws):
         if canary != u'':
             prev_length = len(prev_line)
             if prev_line != u'' and prev_length < len(canary):
-                toucan = unicode(canary[:prev_length])
+                toucan = canary[:prev_length]
             else:
                 toucan = u''
             #logger.debug(u'toucan: {0}'.format(toucan))
@@ -200,22 +202,65 @@ def purify_html(raw):
         if u'expr:' in cooked:
             logger.error("THE EXPR IS STILL HERE!")
             logger.error(cooked)
-            exit(-100)
+            raise ValueError(u'purify_html could not remove "expr:" from content')
     if u'<script' in raw:
         cooked = RX_SCRIPT.sub(u'', cooked)
         if u'<script' in cooked:
             logger.error("THE SCRIPT IS STILL HERE!")
             logger.error(cooked)
-            exit(-100)
+            raise ValueError(u'purify_html could not remove "<script" from content')
     return cooked
 
+def _purify_node_text(raw):
+    return purify_text(RX_SPACE.sub(u' ', unicodedata.normalize('NFC', raw)))
+
+def purify_tree(root):
+    """Out vile jam, in place, from an already-parsed lxml HTML tree.
+
+    This applies to every text node and attribute value what purify_html
+    (after NFC and space normalization) does to serialized markup, without
+    serializing anything: o:p elements become p, blogger "expr:"
+    attributes and script elements (but not the text following them) are
+    dropped. Unlike the string version, it cannot turn curly quotes inside
+    attribute values into markup-breaking straight ones.
+    """
+
+    for node in list(root.iter()):
+        if node.tail:
+            node.tail = _purify_node_text(node.tail)
+        if not isinstance(node.tag, str):
+            # comment or processing instruction
+            continue
+        if node.tag == 'script':
+            if node.getparent() is not None:
+                _drop_keeping_tail(node)
+            continue
+        if node.tag == 'o:p':
+            node.tag = 'p'
+        for k in list(node.attrib.keys()):
+            if k.startswith('expr:'):
+                del node.attrib[k]
+            else:
+                node.attrib[k] = _purify_node_text(node.attrib[k])
+        if node.text:
+            node.text = _purify_node_text(node.text)
+    return root
+
+def _drop_keeping_tail(node):
+    parent = node.getparent()
+    previous = node.getprevious()
+    if node.tail:
+        if previous is not None:
+            previous.tail = (previous.tail or u'') + node.tail
+        else:
+            parent.text = (parent.text or u'') + node.tail
+    parent.remove(node)
+
 def ukey(raw):
     raw_type = type(raw)
     if raw_type == list:
-        uraw = u' '.join([unicode(chunk) for chunk in raw])
+        uraw = u' '.join([str(chunk) for chunk in raw])
     elif raw_type == str:
-        uraw = str(raw)
-    elif raw_type == unicode:
         uraw = raw
     else:
         raise TypeError(u'ukey does not support arguments of type {0}'.format(raw_type))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Gather the text describing a resource from the markup of a blog post.
+
+This module defines the following classes:
+
+ * DescriptionWalker: collect description lines from a start node
+   onwards, without recursion, remembering what it has collected.
+
+and the following functions:
+
+ * node_url: the href of a node, as compared when walking.
+"""
+
+from bs4.element import NavigableString
+
+from isaw.awol.normalize_space import normalize_space
+
+def node_url(node):
+    """Return the href of a node ('' if none), less any trailing index page or slash."""
+
+    try:
+        url = node.get('href')
+    except AttributeError:
+        url = ''
+    if url is None:
+        url = ''
+    if '/' in url:
+        chunks = url.split('/')
+        if chunks[-1] in ['index.html', 'index.php', '']:
+            url = '/'.join(chunks[:-1])
+    return url
+
+class DescriptionWalker():
+    """Collect the lines of text that follow a start node, up to a stop node.
+
+    From the start node, its subtree is walked in document order, then
+    each of its following siblings and their subtrees, until a node whose
+    name is one of the stop tags ends the walk. Anchors are special: the
+    first anchor (or, when skipping the first anchor, an anchor to another
+    URL than the previous one) is where the walk stops. Text nodes are
+    collected as they are, and a line break adds '. ' unless the text
+    before it already ends a sentence.
+
+    A walker serves one soup: walks are remembered by start node, stop
+    tags and whether the first anchor is skipped, and the text of each
+    node looked at is worked out only once.
+    """
+
+    def __init__(self):
+        self._walks = {}
+        self._last_chars = {}
+
+    def _previous_last(self, node):
+        """Return the last character of the (space-normalized) text before a node, or ''."""
+
+        previous = node.previous_sibling
+        key = id(previous)
+        try:
+            return self._last_chars[key]
+        except KeyError:
+            pass
+        try:
+            text = normalize_space(previous.get_text())
+        except AttributeError:
+            text = u''
+        last = self._last_chars[key] = text[-1:]
+        return last
+
+    def _dig(self, this_node, first_node, stop_tags, skip_first_anchor, previous_urls):
+        """Collect the text of a subtree; returns (stopped, lines)."""
+
+        results = []
+        stack = [this_node]
+        while len(stack) > 0:
+            node = stack.pop()
+            node_name = node.name
+            if node_name in stop_tags and node != first_node:
+                if node_name != 'a':
+                    return (True, results)
+                if skip_first_anchor:
+                    if len(previous_urls) == 0:
+                        return (True, results)
+                elif len(previous_urls) > 0 and node_url(node) != previous_urls[-1]:
+                    return (True, results)
+            if node_name == 'a':
+                previous_urls.append(node_url(node))
+            elif node_name == 'br' and self._previous_last(node) != u'.':
+                results.append(u'. ')
+            if type(node) == NavigableString:
+                results.append(str(node))
+            else:
+                try:
+                    descendants = node.descendants
+                except AttributeError:
+                    pass
+                else:
+                    if descendants is not None:
+                        stack.extend(reversed(node.contents))
+        return (False, results)
+
+    def walk(self, first_node, stop_tags, skip_first_anchor):
+        """Return the description lines found from first_node on."""
+
+        key = (id(first_node), tuple(stop_tags), skip_first_anchor)
+        try:
+            return list(self._walks[key])
+        except KeyError:
+            pass
+        stop_tags = frozenset(stop_tags)
+        previous_urls = []
+        stop, desc_lines = self._dig(first_node, first_node, stop_tags, skip_first_anchor, previous_urls)
+        node = first_node
+        while True:
+            node = node.next_sibling
+            if node is None:
+                break
+            node_name = node.name
+            if node_name in stop_tags:
+                if node_name != 'a':
+                    break
+                if not skip_first_anchor:
+                    if len(previous_urls) == 0:
+                        break
+                elif len(previous_urls) > 0 and node_url(node) != previous_urls[-1]:
+                    break
+            if node_name == 'a':
+                previous_urls.append(node_url(node))
+            stop, results = self._dig(node, first_node, stop_tags, skip_first_anchor, previous_urls)
+            desc_lines.extend(results)
+            if stop:
+                break
+        self._walks[key] = desc_lines
+        return list(desc_lines)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Find vocabulary keywords in titles in one pass over their text.
+
+This module defines the following classes:
+
+ * PhraseAutomaton: an Aho-Corasick automaton finding every occurrence of
+   a set of phrases in a string, overlapping or not.
+ * KeywordMiner: the tags that the terms and phrases of a vocabulary
+   (e.g., awol_title_strings.csv) give a string.
+"""
+
+from collections import deque
+
+class PhraseAutomaton():
+    """Aho-Corasick automaton over a list of phrases.
+
+    The phrases are compiled once into a trie whose states know where to
+    fall back to when the next character does not continue a phrase, and
+    which phrases end there. Searching a string is then a single pass
+    over its characters, however many phrases there are.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        goto = [{}]
+        outputs = [[]]
+        for i, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                try:
+                    state = goto[state][ch]
+                except KeyError:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                    state = goto[state][ch]
+            outputs[state].append(i)
+        # breadth-first, so that the fallback of a state is ready before its children's
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while len(queue) > 0:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(ch, 0)
+                outputs[child].extend(outputs[fail[child]])
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(o) for o in outputs]
+
+    def find(self, s):
+        """Return the indexes (in self.phrases) of the phrases occurring in s."""
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for ch in s:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+class KeywordMiner():
+    """Mine tags from strings with a vocabulary of terms and phrases.
+
+    Terms (single words) are looked up among the words of the lowercased
+    string; phrases are found anywhere in it by a PhraseAutomaton. Tags
+    come out in the order of the vocabulary (terms, then the access and
+    series tags, then phrases), exactly as a loop over the vocabulary
+    would give them. Results are remembered per string, since the same
+    post title is mined for every resource of the post.
+    """
+
+    MEMO_SIZE = 10000
+
+    def __init__(self, terms, phrases):
+        """terms and phrases are dictionaries of lowercase keys and the tags they give."""
+
+        self.terms = {k: (rank, tag) for rank, (k, tag) in enumerate(terms.items())}
+        self.phrase_tags = list(phrases.values())
+        self.automaton = PhraseAutomaton(phrases.keys())
+        self._memo = {}
+
+    def mine(self, s):
+        """Return the list of tags for a string."""
+
+        try:
+            return list(self._memo[s])
+        except KeyError:
+            pass
+        lower_s = s.lower()
+        words = set(lower_s.split())
+        hits = sorted([self.terms[w] for w in words if w in self.terms])
+        tags = [tag for rank, tag in hits]
+        if u'open' in words and u'access' in words:
+            if u'partial' in words:
+                if u'partial open access' in lower_s:
+                    tags.append(u'mixed access')
+            else:
+                if u'open access' in lower_s:
+                    tags.append(u'open access')
+        if 'series' in words and 'lecture' not in words:
+            tags.append(u'series')
+        tags.extend([self.phrase_tags[i] for i in sorted(self.automaton.find(lower_s))])
+        if len(self._memo) >= self.MEMO_SIZE:
+            self._memo.clear()
+        self._memo[s] = tuple(tags)
+        return tags
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Identify the language of resource titles and descriptions.
+
+The langid model is decoded only when a language is first needed, and
+then only once per process: every LanguageDetector builds its classifier
+on the same arrays. Decoding it in a parent process (with load_model)
+before starting worker processes lets forked workers share it.
+
+This module defines the following classes:
+
+ * LanguageDetector: langid classification with a confidence threshold,
+   remembered by text and optionally restricted to some languages.
+
+and the following functions:
+
+ * load_model: the decoded langid model, decoded on first call.
+"""
+
+import logging
+import sys
+
+from langid.langid import LanguageIdentifier, model
+import numpy as np
+
+from isaw.awol.normalize_space import normalize_space
+from isaw.awol.tools import metrics
+
+# the languages COACS_json_to_marc.py can map to MARC codes (the keys of its
+# lang_map, which test_language checks against)
+MARC_LANGUAGES = [
+    'af', 'an', 'ar', 'az', 'be', 'bg', 'br', 'bs', 'ca', 'cs', 'cy', 'da',
+    'de', 'el', 'en', 'eo', 'es', 'et', 'eu', 'fa', 'fi', 'fo', 'fr', 'gl',
+    'he', 'hr', 'hu', 'id', 'it', 'ja', 'jv', 'ka', 'ko', 'ku', 'ky', 'la',
+    'lb', 'lo', 'lt', 'lv', 'mg', 'mk', 'mr', 'mt', 'nl', 'no', 'oc', 'pl',
+    'pt', 'ro', 'ru', 'sk', 'sl', 'sr', 'sv', 'sw', 'tl', 'tr', 'uk', 'ur',
+    'vi', 'wa', 'zh']
+
+_MODEL = [None]
+
+@metrics.timed('language.load')
+def load_model():
+    """Return the langid model arrays, decoding the model on the first call.
+
+    These are the arguments of LanguageIdentifier (nb_ptc, nb_pc,
+    nb_numfeats, nb_classes, tk_nextmove, tk_output). Call this in a
+    parent process before forking workers so that they share the model
+    instead of each decoding it again.
+    """
+
+    if _MODEL[0] is None:
+        identifier = LanguageIdentifier.from_modelstring(model, norm_probs=True)
+        _MODEL[0] = (
+            identifier.nb_ptc,
+            identifier.nb_pc,
+            identifier.nb_numfeats,
+            identifier.nb_classes,
+            identifier.tk_nextmove,
+            identifier.tk_output)
+    return _MODEL[0]
+
+class LanguageDetector():
+    """Identify languages with langid, remembering the results by text.
+
+    Texts are compared once spaces are normalized. The journals of a
+    post, and their issues, often repeat the same title and description,
+    so each is classified only once.
+
+    Many texts (e.g., the titles of all the issues listed in a post) can
+    be classified together with detect_all: their features are stacked
+    into one matrix, and that matrix is scored against the model with a
+    single matrix product.
+
+    Candidates can be restricted to a set of languages (e.g.,
+    MARC_LANGUAGES). This trims the model, so classification is faster.
+    Probabilities are then spread over the remaining languages only, so
+    fewer texts fall below the threshold because languages that cannot
+    be catalogued anyway compete with them.
+    """
+
+    BATCH_SIZE = 256
+    MEMO_SIZE = 10000
+
+    def __init__(self, threshold, languages=None):
+        self.threshold = threshold
+        self.languages = None
+        self._identifier = None
+        self._memo = {}
+        self.hits = 0
+        self.misses = 0
+        if languages is not None:
+            self.restrict(languages)
+
+    @property
+    def all_languages(self):
+        """The codes of all the languages langid knows."""
+
+        return list(load_model()[3])
+
+    @property
+    def identifier(self):
+        """The langid classifier, built (on the shared model) on first use."""
+
+        if self._identifier is None:
+            self._identifier = LanguageIdentifier(*load_model(), norm_probs=True)
+            if self.languages is not None:
+                self._identifier.set_languages(self.languages)
+        return self._identifier
+
+    def restrict(self, languages=None):
+        """Limit candidates to some languages (langid codes), or to all of them if None."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        if languages is None and self._identifier is None:
+            # nothing to undo: don't load the model just for this
+            self.languages = None
+            self._memo = {}
+            return
+        if languages is not None:
+            unknown = sorted(set(languages).difference(self.all_languages))
+            if len(unknown) > 0:
+                logger.warning(u'langid cannot identify {0}'.format(u', '.join(unknown)))
+            languages = sorted(set(languages).intersection(self.all_languages))
+        if languages != self.languages:
+            self.identifier.set_languages(languages)
+            self.languages = languages
+            self._memo = {}
+
+    def _classify(self, strings):
+        """Return the language (or None) of each of a list of normalized strings."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        identifier = self.identifier
+        features = np.array([identifier.instance2fv(s) for s in strings])
+        # only the features present in the batch take part in the product
+        present = np.flatnonzero(features.any(axis=0))
+        pd = np.dot(features[:, present], identifier.nb_ptc[present]) + identifier.nb_pc
+        best = pd.argmax(axis=1)
+        # the normalized probability of the best class, computed as langid does
+        with np.errstate(over='ignore'):
+            confidences = 1 / np.exp(pd - pd[np.arange(len(strings)), best][:, None]).sum(axis=1)
+        languages = []
+        for cl, confidence in zip(best, confidences):
+            logger.debug(repr((identifier.nb_classes[cl], float(confidence))))
+            if confidence >= self.threshold:
+                languages.append(str(identifier.nb_classes[cl]))
+            else:
+                languages.append(None)
+        return languages
+
+    def detect_all(self, texts):
+        """Return the languages of a list of texts, as detect would, classifying them together."""
+
+        strings = [normalize_space(text) for text in texts]
+        found = {u'': None}
+        todo = []
+        for s in strings:
+            if s in found:
+                if s != u'':
+                    self.hits = self.hits + 1
+                continue
+            try:
+                found[s] = self._memo[s]
+            except KeyError:
+                self.misses = self.misses + 1
+                found[s] = None
+                todo.append(s)
+            else:
+                self.hits = self.hits + 1
+        for start in range(0, len(todo), self.BATCH_SIZE):
+            batch = todo[start:start + self.BATCH_SIZE]
+            for s, language in zip(batch, self._classify(batch)):
+                found[s] = language
+                if len(self._memo) >= self.MEMO_SIZE:
+                    self._memo.clear()
+                self._memo[s] = language
+        return [found[s] for s in strings]
+
+    def detect(self, text):
+        """Return the langid code of the language of a text, or None if not confident enough."""
+
+        return self.detect_all([text])[0]
@@ -10,7 +10,6 @@ This module defines the following classes:
 
 from copy import copy, deepcopy
 import logging
-import pkg_resources
 import pprint
 import regex as re
 import requests
@@ -18,17 +17,22 @@ import sys
 
 from bs4 import BeautifulSoup
 from bs4.element import NavigableString
-from langid.langid import LanguageIdentifier, model
 from lxml import etree
-import unicodecsv
 
+from isaw.awol.analytic import AnalyticTitleParser
+from isaw.awol.anchors import AnchorIndex, domain_from_url
+from isaw.awol.awol_article import omit_reason
 from isaw.awol.clean_string import *
+from isaw.awol.description import DescriptionWalker
+from isaw.awol.identifiers import IdentifierScanner
+from isaw.awol.language import LanguageDetector
 from isaw.awol.normalize_space import normalize_space
 from isaw.awol.resource import Resource
-from isaw.awol.tools import mods
+from isaw.awol.tools import metrics, mods
+from isaw.awol.vocabulary import COLON_PREFIXES, KEYWORD_MINER, TITLE_SUBSTRING_TAGS
 
-LANGUAGE_IDENTIFIER = LanguageIdentifier.from_modelstring(model, norm_probs=True)
 LANGID_THRESHOLD = 0.98
+LANGUAGE_DETECTOR = LanguageDetector(LANGID_THRESHOLD)
 
 DOMAINS_IGNORE = [
     'draft.blogger.com',
@@ -50,10 +54,10 @@ BIBLIO_SOURCES = {
         },
         'payload_xpath': '//rdf:Description[1]/mods:mods[1]',
         'payload_type': 'application/mods+xml',
-        'date_fixer': re.compile(ur'^(?P<year>\d{4})(?P<month>\d{2})(?P<day>\d{2})(?P<hour>\d{2})(?P<minute>\d{2})(?P<second>[\d\.]+)$')
+        'date_fixer': re.compile(r'^(?P<year>\d{4})(?P<month>\d{2})(?P<day>\d{2})(?P<hour>\d{2})(?P<minute>\d{2})(?P<second>[\d\.]+)$')
     }
 }
-DOMAINS_BIBLIOGRAPHIC = BIBLIO_SOURCES.keys()
+DOMAINS_BIBLIOGRAPHIC = list(BIBLIO_SOURCES.keys())
 MODS2RESOURCES = {
     'publisher':'publishers',
     'language':'languages',
@@ -68,28 +72,6 @@ ANCHOR_TEXT_IGNORE = [
 ]
 ANCHOR_URLS_IGNORE = [
 ]
-colon_prefix_csv = pkg_resources.resource_stream('isaw.awol', 'awol_colon_prefixes.csv')
-dreader = unicodecsv.DictReader(
-    colon_prefix_csv,
-    fieldnames = [
-        'col_pre',
-        'omit_post',
-        'strip_title',
-        'mul_res'
-    ],
-    delimiter = ',',
-    quotechar = '"')
-COLON_PREFIXES = dict()
-for row in dreader:
-    COLON_PREFIXES.update({
-        normalize_space(row['col_pre']).lower():
-            [
-                row['omit_post'],
-                row['strip_title'],
-                row['mul_res']
-            ]
-    })
-del dreader
 def check_colon(title):
     if u':' in title:
         colon_prefix = title.split(u':')[0].lower()
@@ -99,50 +81,8 @@ def check_colon(title):
             return title
     else:
         return title
-OMIT_TITLES = [
-    u'administrative',
-    u'administrative note'
-]
 def allow_by_title(title):
-    if title.lower() in OMIT_TITLES:
-        return False
-    elif u':' in title:
-        colon_prefix = title.split(u':')[0].lower()
-        if colon_prefix in COLON_PREFIXES.keys() and (COLON_PREFIXES[colon_prefix])[0] == 'yes':
-            return False
-    return True
-
-RX_IDENTIFIERS = {
-    'issn': {
-        'electronic': [
-            re.compile(r'(e-|e)(issn[\s:\-]*[\dX\-]{4}[\-\s]+[\dX]{4})', re.IGNORECASE),
-            re.compile(r'(electronic|online|on-line|digital|internet)([\s:]*issn[^\d]*[\dX]{4}[\-\s]+[\dX]{4})', re.IGNORECASE),
-            re.compile(r'(issn[\s\(\-]*)(electrónico|électronique|online|on-line|digital|internet)([^\d]*[\dX]{4}[\-\s]+[\dX]{4})', re.IGNORECASE),
-            re.compile(r'(issn[^\d]*[\dX]{4}[\-\s]+[\dX]{4}[\s\(]*)(electrónico|électronique|online|on-line|digital)', re.IGNORECASE),
-        ],
-        'generic': [
-            re.compile(r'(issn[^\d]*[\dX]{4}[\-\s]+[\dX]{4})', re.IGNORECASE),
-            re.compile(r'(issn[^\d]*[\dX\-\s]{8-11})', re.IGNORECASE)
-        ],
-        'extract': {
-            'precise': re.compile(r'^[^\d]*([\dX]{4}[\-\s]+[\dX]{4}).*$', re.IGNORECASE),
-            'fallback': re.compile(r'^[^\d]*([\dX\-\s]+).*$', re.IGNORECASE)
-        }
-    },
-    'isbn': {
-        'electronic': [
-            re.compile(r'(electronic|e-|online|on-line|digital)([\s:]*isbn[^\d]*[\dX\-]+)', re.IGNORECASE),
-            re.compile(r'(isbn[\s\(]*)(electrónico|électronique|online|on-line|digital)([^\d]*[\dX\-]+)', re.IGNORECASE),
-            re.compile(r'(isbn[^\d]*[\dX\-]+[\s\(]*)(electrónico|électronique|online|on-line|digital)', re.IGNORECASE),
-        ],
-        'generic': [
-            re.compile(r'isbn[^\d]*[\dX\-]+', re.IGNORECASE),
-        ],
-        'extract': {
-            'precise': re.compile(r'^[^\d]*([\dX\-]+).*$', re.IGNORECASE),
-        }
-    }
-}
+    return omit_reason(title) is None
 
 RX_AUTHORS = [
     re.compile(r'(compiled by |assembled by |created by |written by |authors?):?\s*([^\.]+)', re.IGNORECASE)
@@ -151,72 +91,11 @@ RX_EDITORS = [
     re.compile(r'(edited by |editors?):?\s*([^\.]+)', re.IGNORECASE)
 ]
 
-title_strings_csv = pkg_resources.resource_stream('isaw.awol', 'awol_title_strings.csv')
-dreader = unicodecsv.DictReader(
-    title_strings_csv,
-    fieldnames = [
-        'titles',
-        'tags'
-    ],
-    delimiter = ',',
-    quotechar = '"')
-TITLE_SUBSTRING_TAGS = dict()
-for row in dreader:
-    TITLE_SUBSTRING_TAGS.update({row['titles']:row['tags']})
-del dreader
-TITLE_SUBSTRING_TERMS = {k:v for (k,v) in TITLE_SUBSTRING_TAGS.iteritems() if ' ' not in k}
-TITLE_SUBSTRING_PHRASES = {k:v for (k,v) in TITLE_SUBSTRING_TAGS.iteritems() if k not in TITLE_SUBSTRING_TERMS.keys()}
-RX_ANALYTIC_TITLES = [
-    # volume, issue, year (e.g. Bd. 52, Nr. 1 (2005))
-    {
-        'rx': re.compile(r'^Bd\.\s+(\d+),?\s+Nr\.\s+(\d+)\s+\(?(\d{4})\)?$', re.IGNORECASE),
-        'volume': 1,
-        'issue': 2,
-        'year': 3
-    },
-    # year, blah blah blah, then volume (e.g. u'1888 Mitteilungen des Deutschen Arch\xe4ologischen Instituts / R\xf6mische Abteilung Band 3')
-    {
-        'rx': re.compile(r'^(\d{4})[^\d]+Band (\d+)$', re.IGNORECASE),
-        'volume': 2,
-        'year': 1
-    },
-    # vol slash year (e.g. University Museums and Collections Journal 4/2011)
-    {
-        'rx': re.compile(r'^[^\d]*(\d+)\/(\d{4})[^\d]*$', re.IGNORECASE),
-        'volume': 1,
-        'year': 2,
-    },
-    # year, then volume
-    {
-        'rx': re.compile(r'^[^\d]*(\d{4})\W*([\d\-]+)[^\d]*$', re.IGNORECASE),
-        'volume': 2,
-        'year': 1
-    },
-    # volume, then year
-    {
-        'rx': re.compile(r'^[^\d]*([\d\-]{1-4})\W*(\d{4})[^\d]*$', re.IGNORECASE),
-        'volume': 1,
-        'year': 2
-    },
-    # year only
-    {
-        'rx': re.compile(r'^[^\d]*(\d{4})[^\d]*$', re.IGNORECASE),
-        'year': 1,
-    },
-    # volume only
-    {
-        'rx': re.compile(r'^[^\d]*([\d\-]+)[^\d]*$', re.IGNORECASE),
-        'volume': 1,
-    },
-
-
-]
+IDENTIFIER_SCANNER = IdentifierScanner()
+ANALYTIC_TITLE_PARSER = AnalyticTitleParser()
 RX_PUNCT_FIX = re.compile(r'\s+([\.,:;]{1})')
 RX_PUNCT_DEDUPE = re.compile(r'([\.,:;]{1})([\.,:;]{1})')
 
-def domain_from_url(url):
-    return url.replace('http://', '').replace('https://', '').split('/')[0]
-
 class AwolBaseParser:
     """Superclass to extract resource data from an AwolArticle."""
 
@@ -235,12 +114,7 @@ class AwolBaseParser:
 
         c = self.content
         if c['domains'] is None:
-            soup = c['soup']
-            anchors = [a for a in soup.find_all('a')]
-            urls = [a.get('href') for a in anchors if a.get('href') is not None]
-            urls = list(set(urls))
-            domains = [domain_from_url(url) for url in urls]
-            domains = list(set(domains))
+            domains = self._get_anchor_index().domains()
             domains = [domain for domain in domains if domain not in self.skip_domains]
             if len(domains) > 1:
                 domains = [domain for domain in domains if domain not in self.bibliographic_domains]
@@ -258,35 +132,23 @@ class AwolBaseParser:
         c = self.content
         if content_soup is not None:
             c['soup'] = content_soup
+        c['anchor_index'] = None
         c['anchors'] = None
         c['domains'] = None
+        c['unique_urls'] = None
+        c['description_walker'] = None
         self.skip_domains = copy(DOMAINS_IGNORE) + copy(DOMAINS_SELF)
         self.bibliographic_domains = copy(DOMAINS_BIBLIOGRAPHIC)
         self.skip_text = copy(ANCHOR_TEXT_IGNORE)
         self.skip_urls = copy(ANCHOR_URLS_IGNORE)
 
     # private methods
-    def _consider_anchor(self, a):
-        url = a.get('href')
-        if url is not None:
-            text = a.get_text()
-            if len(text) > 0:
-                domain = domain_from_url(url)
-                if (domain in self.skip_domains
-                or url in self.skip_urls
-                or text in self.skip_text):
-                    pass
-                else:
-                    return True
-            else:
-                pass
-        else:
-            pass
-        return False
-
-    def _filter_anchors(self, anchors):
-        filtered = [a for a in anchors if self._consider_anchor(a)]
-        return filtered
+    def _get_anchor_index(self):
+        """Return the single-pass index of the anchors in the content (see isaw.awol.anchors)."""
+        c = self.content
+        if c['anchor_index'] is None:
+            c['anchor_index'] = AnchorIndex(c['soup'])
+        return c['anchor_index']
 
     def _get_anchor_ancestor_for_title(self, anchor):
 
@@ -311,152 +173,37 @@ class AwolBaseParser:
         c = self.content
         if c['anchors'] is not None:
             return c['anchors']
-        soup = c['soup']
-        raw_anchors = [a for a in soup.find_all('a') if a.find_previous('a', href=a.get('href')) is None]
-        anchors = self._filter_anchors(raw_anchors)
+        # first anchor with each url, filtered by the skip lists
+        anchors = self._get_anchor_index().considered(self.skip_domains, self.skip_urls, self.skip_text)
         c['anchors'] = anchors
         return anchors
 
+    @metrics.timed('parse.description')
     def _get_description(self, context=None, title=u''):
+        c = self.content
         if context is None:
-            c = self.content
             soup = c['soup']
             first_node = soup.body.contents[0]
             skip_first_anchor = True
         else:
             first_node = context
             skip_first_anchor = False
-
-        def digdigdig(this_node, first_node, stop_tags, skip_first_anchor, previous_urls):
-            node_type = type(this_node)
-            node_name = this_node.name
-            try:
-                node_url = this_node.get('href')
-            except AttributeError:
-                node_url = ''
-            if node_url is None:
-                node_url = ''
-            if '/' in node_url:
-                chunks = node_url.split('/')
-                if chunks[-1] in ['index.html', 'index.php', '', None]:
-                    node_url = '/'.join(chunks[:-1])
-            results = []
-            if (
-                this_node != first_node
-                and node_name in stop_tags
-                and (
-                    node_name != 'a'
-                    or (
-                        'a' in stop_tags
-                        and node_name == 'a'
-                        and (
-                                (
-                                skip_first_anchor
-                                and len(previous_urls) == 0
-                                )
-                            or (
-                                not(skip_first_anchor)
-                                and len(previous_urls) > 0
-                                and node_url != previous_urls[-1]
-                                )
-                            )
-                        )
-                    )
-                ):
-                return (True, results)
-            if node_name == 'a':
-                previous_urls.append(node_url)
-            try:
-                previous_text = normalize_space(this_node.previous_sibling.get_text())
-            except AttributeError:
-                previous_text = u''
-            try:
-                previous_last = previous_text[-1]
-            except IndexError:
-                previous_last = previous_text
-            if node_name == 'br' and previous_last != u'.':
-                results.append(u'. ')
-            if node_type == NavigableString:
-                results.append(unicode(this_node))
-            else:
-                try:
-                    descendants = this_node.descendants
-                except AttributeError:
-                    pass
-                else:
-                    if descendants is not None:
-                        for child in this_node.children:
-                            stop, child_results = digdigdig(child, first_node, stop_tags, skip_first_anchor, previous_urls)
-                            results.extend(child_results)
-                            if stop:
-                                return (stop, results)
-            return (False, results)
-
-        def skiptomalou(first_node, stop_tags, skip_first_anchor):
-            previous_urls = []
-            stop, desc_lines = digdigdig(first_node, first_node, stop_tags, skip_first_anchor, previous_urls)
-            node = first_node
-            while True:
-                previous_node = node
-                node = node.next_sibling
-                if node is None:
-                    break
-                try:
-                    node_name = node.name
-                except AttributeError:
-                    node_name = type(node)
-                try:
-                    node_url = node.get('href')
-                except AttributeError:
-                    node_url = ''
-                if node_url is None:
-                    node_url = ''
-                if '/' in node_url:
-                    chunks = node_url.split('/')
-                    if chunks[-1] in ['index.html', 'index.php', '', None]:
-                        node_url = '/'.join(chunks[:-1])
-                if (
-                    node_name in stop_tags
-                    and (
-                        node_name != 'a'
-                        or (
-                            'a' in stop_tags
-                            and node_name == 'a'
-                            and (
-                                    (
-                                    not(skip_first_anchor)
-                                    and len(previous_urls) == 0
-                                    )
-                                or (
-                                    skip_first_anchor
-                                    and len(previous_urls) > 0
-                                    and node_url != previous_urls[-1]
-                                    )
-                                )
-                            )
-                        )
-                    ):
-                    break
-                if node_name == 'a':
-                    previous_urls.append(node_url)
-                stop, results = digdigdig(node, first_node, stop_tags, skip_first_anchor, previous_urls)
-                desc_lines.extend(results)
-                if stop:
-                    break
-            return desc_lines
+        if c['description_walker'] is None:
+            # walks are remembered for the rest of this article
+            c['description_walker'] = DescriptionWalker()
+        walk = c['description_walker'].walk
 
         stop_tags = ['a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'ol', 'ul', 'dl', 'dt', 'li', 'table']
-        desc_lines = skiptomalou(first_node, stop_tags, skip_first_anchor)
+        desc_lines = walk(first_node, stop_tags, skip_first_anchor)
 
         stop_tags = ['a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
         if len(desc_lines) == 0:
-            desc_lines = skiptomalou(first_node, stop_tags, False)
+            desc_lines = walk(first_node, stop_tags, False)
         elif ukey(desc_lines) == ukey(title):
-            desc_lines = skiptomalou(first_node, stop_tags, skip_first_anchor)
+            desc_lines = walk(first_node, stop_tags, skip_first_anchor)
         if len(desc_lines) == 0:
             desc_text = None
         else:
-            desc_text = deduplicate_lines(u'\n'.join(desc_lines))
             desc_text = u''.join(desc_lines)
             if len(desc_text) == 0:
                 desc_text = None
@@ -474,17 +221,20 @@ class AwolBaseParser:
         return desc_text
 
     def _get_language(self, *args):
+        return self._get_languages([args])[0]
+
+    @metrics.timed('parse.language')
+    def _get_languages(self, args_list):
+        """Identify the language of many resources at once (one tuple of strings per resource)."""
+
         logger = logging.getLogger(sys._getframe().f_code.co_name)
-        chunks = [chunk for chunk in args if chunk is not None]
-        s = u' '.join((tuple(chunks)))
-        s = normalize_space(s)
-        logger.debug('s: \n"{}\n'.format(s.encode('utf-8')))
-        if s != u'':
-            language = LANGUAGE_IDENTIFIER.classify(s)
-            logger.debug(repr(language))
-            if language[1] >= LANGID_THRESHOLD:
-                return language[0]
-        return None
+        texts = []
+        for args in args_list:
+            chunks = [chunk for chunk in args if chunk is not None]
+            s = u' '.join((tuple(chunks)))
+            logger.debug('s: \n"{}\n'.format(s.encode('utf-8')))
+            texts.append(s)
+        return LANGUAGE_DETECTOR.detect_all(texts)
 
     def _get_next_valid_url(self, anchor):
         logger = logging.getLogger(sys._getframe().f_code.co_name)
@@ -500,7 +250,7 @@ class AwolBaseParser:
                     domain = domain_from_url(url)
                     if domain not in self.skip_domains:
                         break
-            a = a.find_next('a')
+            a = self._get_anchor_index().following(a)
         if a is None:
             raise ValueError(u'could not find valid self-or-subsequent resource anchor')
         return (anchor, a, url, domain)
@@ -508,7 +258,7 @@ class AwolBaseParser:
     def _get_primary_anchor(self):
         anchors = self._get_anchors()
         try:
-            a = self._get_anchors()[0]
+            a = anchors[0]
         except IndexError:
             msg = 'failed to parse primary anchor from {0}'.format(self.content['soup'])
             raise RuntimeError(msg)
@@ -573,8 +323,9 @@ class AwolBaseParser:
 
     def _get_related_resources(self):
         resources = []
+        index = self._get_anchor_index()
         anchors = self._get_anchors()[1:]
-        anchors = [a for a in anchors if domain_from_url(a.get('href')) in DOMAINS_SELF]
+        anchors = [a for a in anchors if index.entry(a)['domain'] in DOMAINS_SELF]
         for a in anchors:
             # title
             title_context = self._get_anchor_ancestor_for_title(a)
@@ -845,6 +596,7 @@ class AwolBaseParser:
         parent_domain = domain_from_url(parent_package['url'])
         anchors = [a for a in anchors if parent_domain in a.get('href')]
 
+        pending = []
         for a in anchors:
             # title
             title_context = self._get_anchor_ancestor_for_title(a)
@@ -882,9 +634,6 @@ class AwolBaseParser:
             # parse identifiers
             identifiers = self._parse_identifiers(desc_text)
 
-            # language
-            language = self._get_language(title, desc_text)
-
             # determine keywords
             keywords = self._parse_keywords(resource_title=title, resource_text=desc_text)
 
@@ -899,8 +648,6 @@ class AwolBaseParser:
                 params['description'] = desc_text
             if len(identifiers.keys()) > 0:
                 params['identifiers'] = identifiers
-            if language is not None:
-                params['languages'] = language
             if len(keywords) > 0:
                 params['keywords'] = keywords
             if volume is not None:
@@ -909,6 +656,13 @@ class AwolBaseParser:
                 params['year'] = year
             if issue is not None:
                 params['issue'] = issue
+            pending.append(params)
+
+        # language: identified for all the subordinate resources together
+        languages = self._get_languages([(params['title'], params.get('description')) for params in pending])
+        for params, language in zip(pending, languages):
+            if language is not None:
+                params['languages'] = language
             resource = self._make_resource(**params)
 
             self._set_provenance(resource, article)
@@ -918,64 +672,24 @@ class AwolBaseParser:
 
     def _get_unique_urls(self):
         c = self.content
-        if c['unique_urls'] is not None:
-            return c['unique_urls']
-        else:
-            anchors = self._get_anchors()
-        urls = [a.get('href') for a in anchors if a.get('href') is not None]
-        unique_urls = list(set(urls))
-        c['unique_urls'] = unique_urls
-        return unique_urls
+        if c['unique_urls'] is None:
+            # the considered anchors are already unique by url
+            c['unique_urls'] = [a.get('href') for a in self._get_anchors()]
+        return c['unique_urls']
 
     def _grok_analytic_title(self, title):
-        logger = logging.getLogger(sys._getframe().f_code.co_name)
-        for g in RX_ANALYTIC_TITLES:
-            m = g['rx'].match(title)
-            if m is not None:
-                break
-        if m is not None:
-            try:
-                volume = m.group(g['volume'])
-            except KeyError:
-                volume = None
-            try:
-                issue = m.group(g['issue'])
-            except KeyError:
-                issue = None
-            try:
-                year = m.group(g['year'])
-            except KeyError:
-                year = None
-            return (volume, issue, year)
+        """Return (volume, issue, year) read from the title of an issue, or None."""
+        return ANALYTIC_TITLE_PARSER.parse(title)
 
     # keyword methods
     def _mine_keywords(self, *args):
         tags = []
         for s in args:
             if s is not None:
-                lower_s = s.lower()
-                # mine for terms (i.e., single-word keys)
-                lower_list = list(set(lower_s.split()))
-                for k in TITLE_SUBSTRING_TERMS.keys():
-                    if k in lower_list:
-                        tag = TITLE_SUBSTRING_TERMS[k]
-                        tags.append(tag)
-                if u'open' in lower_list and u'access' in lower_list:
-                    if u'partial' in lower_list:
-                        if u'partial open access' in lower_s:
-                            tags.append(u'mixed access')
-                    else:
-                        if u'open access' in lower_s:
-                            tags.append(u'open access')
-                if 'series' in lower_list and 'lecture' not in lower_list:
-                    tags.append(u'series')
-                # mine for phrases
-                for k in TITLE_SUBSTRING_PHRASES.keys():
-                    if k in lower_s:
-                        tag = TITLE_SUBSTRING_PHRASES[k]
-                        tags.append(tag)
+                tags.extend(KEYWORD_MINER.mine(s))
         return tags
 
+    @metrics.timed('parse.keywords')
     def _parse_keywords(self, post_title=None, resource_title=None, post_categories=[], resource_text=None):
         """Infer and normalize resource tags."""
 
@@ -991,8 +705,9 @@ class AwolBaseParser:
                 if tag in TITLE_SUBSTRING_TAGS.keys():
                     tag = TITLE_SUBSTRING_TAGS[tag]
                 else:
-                    logger.error(u'unexpected category tag "{0}" in post with title "{1}"'.format(c['term'], post_title))
-                    raise Exception
+                    msg = u'unexpected category tag "{0}" in post with title "{1}"'.format(c['term'], post_title)
+                    logger.error(msg)
+                    raise ValueError(msg)
                 tags.append(tag)
         return self._clean_keywords(tags)
 
@@ -1014,7 +729,7 @@ class AwolBaseParser:
                 pass
             elif tag != tag.lower():
                 raise ValueError(u'keyword "{0}" lacks an appropriate entry in awol_title_strings.csv'.format(tag))
-        return list(set(keywords))
+        return keywords
 
     def _make_resource(self, **kwargs):
         r = Resource()
@@ -1023,7 +738,7 @@ class AwolBaseParser:
 
                 if type(v) == list:
                     value = v
-                elif type(v) in [unicode, str]:
+                elif type(v) == str:
                     if k == 'url':
                         value = v
                     else:
@@ -1039,7 +754,7 @@ class AwolBaseParser:
                 except AttributeError:
                     raise AttributeError(u'{k} is not a valid attribute for a resource'.format(k=k))
                 else:
-                    if curv == None and type(value) in [unicode, str, dict]:
+                    if curv == None and type(value) in [str, dict]:
                         setattr(r, k, value)
                     elif curv == None:
                         setattr(r, k, value[0])
@@ -1072,71 +787,7 @@ class AwolBaseParser:
     def _parse_identifiers(self, content_text):
         """Parse identifying strings of interest from an AWOL blog post."""
 
-        logger = logging.getLogger(sys._getframe().f_code.co_name)
-
-        identifiers = {}
-        if content_text == None:
-            return identifiers
-        text = content_text.lower()
-        words = list(set(text.split()))
-
-        def get_candidates(k, kk, text):
-            candidates = []
-            rexx = RX_IDENTIFIERS[k]
-            for rx in rexx[kk]:
-                candidates.extend([u''.join(groups) for groups in rx.findall(text)])
-            if len(candidates) > 1:
-                candidates = list(set(candidates))
-            return candidates
-
-        def extract(k, text):
-            m = RX_IDENTIFIERS[k]['extract']['precise'].match(text)
-            if m is not None:
-                if len(m.groups()) == 1:
-                    return m.groups()[0]
-            else:
-                try:
-                    m = RX_IDENTIFIERS[k]['extract']['fallback'].match(text)
-                except KeyError:
-                    pass
-                else:
-                    if m is not None:
-                        if len(m.groups()) == 1:
-                            return m.groups()[0]
-            raise Exception
-
-        for k in RX_IDENTIFIERS.keys():
-            if k in u' '.join(words):
-                if k not in identifiers.keys():
-                    identifiers[k] = {}
-                for kk in ['electronic', 'generic']:
-                    candidates = get_candidates(k, kk, text)
-                    if len(candidates) > 0:
-                        identifiers[k][kk] = []
-                        for candidate in candidates:
-                            extraction = extract(k, candidate)
-                            identifiers[k][kk].append(extraction)
-                        if len(identifiers[k][kk]) > 1:
-                            identifiers[k][kk] = list(set(identifiers[k][kk]))
-                if len(identifiers[k].keys()) == 0:
-                    logger.error(u'expected but failed to match valid issn in {0}'.format(text))
-                # regularize presentation form and deduplicate issns
-                if k == 'issn':
-                    try:
-                        identifiers[k]['electronic'] = [issn.replace(u' ', u'-').upper() for issn in identifiers[k]['electronic']]
-                    except KeyError:
-                        pass
-                    try:
-                        identifiers[k]['generic'] = [issn.replace(u' ', u'-').upper() for issn in identifiers[k]['generic']]
-                    except KeyError:
-                        pass
-                    if 'electronic' in identifiers[k].keys() and 'generic' in identifiers[k].keys():
-                        for ident in identifiers[k]['generic']:
-                            if ident in identifiers[k]['electronic']:
-                                identifiers[k]['generic'].remove(ident)
-                        if len(identifiers[k]['generic']) == 0:
-                            del identifiers[k]['generic']
-        return identifiers
+        return IDENTIFIER_SCANNER.scan(content_text)
 
     def _parse_peeps(self, rx_list, content_text):
 
@@ -1182,7 +833,7 @@ class AwolBaseParser:
             return (anchor_title,)
 
     def _set_provenance(self, resource, article, fields=None):
-        updated = article.root.xpath("//*[local-name()='updated']")[0].text.strip()
+        updated = article.updated
         if fields is None:
             resource_fields = sorted([k for k in resource.__dict__.keys() if '_' != k[0]])
         else:
@@ -28,10 +28,10 @@ class Parser(AwolBaseParser):
         resources = []
         relateds = []
         subordinates = []
-        soup = article.soup
+        anchors = self._get_anchor_index()
 
         # first get the top-level resource (skipping over any self links)        
-        a = soup.find_all('a')[0]
+        a = anchors.entries[0]['anchor']
         try:
             a_prev, a, url, domain = self._get_next_valid_url(a)
         except ValueError as e:
@@ -48,19 +48,19 @@ class Parser(AwolBaseParser):
         bib_resource = None
         try:
             bib_resource = self._get_resource_from_external_biblio(url)
-        except NotImplementedError, e:
-            logger.warning(unicode(e) + u' while handling {0} from {1}'.format(url, article.url))
-        except IOError, e:
-            logger.error(unicode(e) + u' while handling {0} from {1}'.format(url, article.url))
+        except NotImplementedError as e:
+            logger.warning(str(e) + u' while handling {0} from {1}'.format(url, article.url))
+        except IOError as e:
+            logger.error(str(e) + u' while handling {0} from {1}'.format(url, article.url))
         else:
             prev_url = url
-            a = a.find_next('a')
+            a = anchors.following(a)
             try:
                 a_prev, a, url, domain = self._get_next_valid_url(a)
             except ValueError as e:
                 msg = u'{e} after handling bibliographic url {biblurl} in {article} with {parser} parser'.format(
                     e=e,
-                    biblurl=biblio_url,
+                    biblurl=prev_url,
                     article=article.url,
                     parser=self.domain)
                 logger.warning(msg)
@@ -86,10 +86,10 @@ class Parser(AwolBaseParser):
             try:
                 #logger.debug(self._nodesplain(a, 'calling _get_resource_from_article'))
                 post_resource = self._get_resource_from_article(article, a)
-            except IndexError, e:
-                logger.error(unicode(e) + u' while handling {0} from {1}'.format(url, article.url))
+            except IndexError as e:
+                logger.error(str(e) + u' while handling {0} from {1}'.format(url, article.url))
             else:
-                a = a.find_next('a')
+                a = anchors.following(a)
                 try:
                     a_prev, a, url, domain = self._get_next_valid_url(a)
                 except ValueError as e:
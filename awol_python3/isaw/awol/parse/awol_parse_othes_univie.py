@@ -45,7 +45,7 @@ class Parser(AwolDomainParser):
                 description = u''
                 while foo is not None and foo != bar:
                     if type(foo) == NavigableString:
-                        description += u'{0} '.format(clean_string(unicode(foo)))
+                        description += u'{0} '.format(clean_string(str(foo)))
                     else:
                         description += u'{0} '.format(clean_string(foo.get_text()))
                     foo = foo.next_sibling
@@ -75,7 +75,7 @@ class Parser(AwolDomainParser):
                     'languages': self._get_language(clean_string(a.get_text())),
                     'title': clean_string(a.get_text()),
                     'url': a.get('href'),
-                    'year': clean_string(unicode(person.next_sibling)),
+                    'year': clean_string(str(person.next_sibling)),
                 }
                 resource = self._make_resource(**params)
 
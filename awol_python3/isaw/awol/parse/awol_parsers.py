@@ -13,6 +13,8 @@ from importlib import import_module
 import pkgutil
 import sys
 
+from isaw.awol.tools import metrics
+
 class AwolParsers():
     """Pluggable framework for parsing content from an AwolArticle."""
 
@@ -20,6 +22,7 @@ class AwolParsers():
         """Load available parsers."""
 
         self.parsers = {}
+        self.domains = []
 
         logger = logging.getLogger(sys._getframe().f_code.co_name)
 
@@ -40,12 +43,20 @@ class AwolParsers():
                 parser = mod.Parser()
                 self.parsers[parser.domain] = parser
 
-    def parse(self, article):
+    @metrics.timed('parsers.select')
+    def select(self, article):
+        """Return the parser to use for an article.
+
+        Raises NotImplementedError if the article has no resource domain
+        or more than one (and is not a journal). Either way, the resource
+        domains found in the article are left in self.domains.
+        """
+
         logger = logging.getLogger(sys._getframe().f_code.co_name)
 
         self.reset()
         self.content_soup = article.soup
-        domains = self.get_domains()
+        domains = self.domains = self.get_domains()
         length = len(domains)
         logger.debug(
             u'\n^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^\nparsing '
@@ -69,11 +80,20 @@ class AwolParsers():
             else:
                 raise NotImplementedError(u'awol_parsers does not know what to do with multiple domains in article: {0}\n    {1}'.format(article.id, u'\n    '.join(domains)))
             logger.info('using "{0}" parser'.format(parser.domain))
-            return parser.parse(article)
+            return parser
+
+    @metrics.timed('parsers.parse')
+    def parse(self, article, parser=None):
+        """Parse an article with the given parser (or the one select chooses)."""
+
+        if parser is None:
+            parser = self.select(article)
+        return parser.parse(article)
 
 
     def reset(self):
         self.content_soup = None
+        self.domains = []
 
         #for parser in self.parsers:
         #    parser.reset()
@@ -8,27 +8,20 @@ import httplib2
 from socket import error as socket_error
 from Article import Article
 import ucsv as csv
+from isaw.awol.vocabulary import COLON_PREFIX_ROWS, TITLE_SUBSTRING_TAGS
 
 #Class to extract data from the files
 #first method to extract form local file
 #seocnd method to extract form url
 class ParseXML:
     ##########################READ CSV###################
-    #Read CSV file containing the right tags to produce
-    dictReader = csv.DictReader(open('awol_title_strings.csv', 'rb'), 
-                        fieldnames = ['titles', 'tags'], delimiter = ',', quotechar = '"')
-    #Build a dictionary from the CSV file-> {<string>:<tags to produce>}
-    titleStringsDict = dict()
-    for row in dictReader:
-        titleStringsDict.update({row['titles']:row['tags']})
+    #Build a dictionary from the title strings vocabulary-> {<string>:<tags to produce>}
+    titleStringsDict = dict(TITLE_SUBSTRING_TAGS)
     
-    #Read awol_colon_prefixes.csv file and build a dictionary
-    dictReader2 = csv.DictReader(open('awol_colon_prefixes.csv', 'rb'), 
-                         fieldnames = ['col_pre', 'omit_post', 'strip_title', 'mul_res'], delimiter = ',', quotechar = '"')
+    #Build a dictionary of format {<column prefix>:<list of cols 2,3 and 4>} from the colon prefixes vocabulary
     colPrefDict = dict()
-    #Build a dictionary of format {<column prefix>:<list of cols 2,3 and 4>}
-    for row in dictReader2:
-        colPrefDict.update({row['col_pre']:[row['omit_post'], row['strip_title'], row['mul_res']]})
+    for row in COLON_PREFIX_ROWS:
+        colPrefDict.update({row[0]:list(row[1:])})
         
     #Read content-disposition.csv file and build a dictionary
     dictReader3 = csv.DictReader(open('content-disposition.csv', 'rb'), 
@@ -18,6 +18,8 @@ import sys
 
 from wikidata_suggest import suggest
 
+from isaw.awol.tools import metrics
+
 PROVENANCE_VERBS = {
     'citesAsMetadataDocument': 'http://purl.org/spar/cito/citesAsMetadataDocument',
     'citesAsDataSource': 'http://purl.org/spar/cito/citesAsDataSource',
@@ -70,24 +72,25 @@ class Resource:
 
         logger = logging.getLogger(sys._getframe().f_code.co_name)
         dump = self.__dict__.copy()
-        for k,v in dump.iteritems():
+        for k,v in dump.items():
             logger.debug("{0} ({1})".format(k, type(v)))
         if formatted:
             return json.dumps(dump, indent=4, sort_keys=True, ensure_ascii=False).encode('utf8')
         else:
             return json.dumps(dump, ensure_ascii=False).encode('utf8')
 
+    @metrics.timed('resource.json_dump')
     def json_dump(self, filename, formatted=False):
         """Dump resource as JSON to a UTF-8 encoded file."""
         dumps = self.json_dumps(formatted) # get utf8-encoded JSON dump
-        with open(filename, 'w') as f:
+        with open(filename, 'wb') as f:
             f.write(dumps)
         del dumps
 
 
     def json_loads(self, s):
         """Parse resource from a UTF-8 JSON string."""
-        self.__dict__ = json.loads(unicode(s))
+        self.__dict__ = json.loads(s)
 
     def json_load(self, filename):
         """Parse resource from a json file."""
@@ -184,7 +187,7 @@ def merge(r1, r2):
     modified_fields = []
     k1 = r1.__dict__.keys()
     k2 = r2.__dict__.keys()
-    all_keys = list(set(k1 + k2))
+    all_keys = list(set(list(k1) + list(k2)))
     domain = r1.domain
     for k in all_keys:
         modified = False
@@ -266,7 +269,7 @@ def merge(r1, r2):
                     v3 = copy.deepcopy(v1)
                 elif len(v1) > 0 and len(v2) > 0:
                     v3 = {}
-                    idfams = list(set(v1.keys() + v2.keys()))
+                    idfams = list(set(list(v1.keys()) + list(v2.keys())))
                     for idfam in idfams:
                         thisval1 = None
                         thisval2 = None
@@ -292,7 +295,7 @@ def merge(r1, r2):
                                 v3 = copy.deepcopy(v1)
                             else:
                                 v3[idfam] = {}
-                                idtypes = list(set(thisval1.keys() + thisval2.keys()))
+                                idtypes = list(set(list(thisval1.keys()) + list(thisval2.keys())))
                                 for idtype in idtypes:
                                     thissubval1 = None
                                     thissubval2 = None
@@ -337,7 +340,7 @@ def merge(r1, r2):
                     v3 = v1
                 else:
                     v3 = list(set(v1 + v2))
-            elif type(v1) in [unicode, str]:
+            elif type(v1) == str:
                 if len(v1) == 0 and len(v2) == 0:
                     modified = False
                     v3 = v1
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the analytic module."""
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.analytic import AnalyticTitleParser
+from isaw.awol.tools import metrics
+
+def setup_function():
+    """Test harness setup."""
+
+    metrics.take()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    metrics.take()
+
+def test_parse():
+    """Ensure volume, issue and year are read by the first matching pattern."""
+
+    parser = AnalyticTitleParser()
+    assert_equals(parser.parse(u'Bd. 52, Nr. 1 (2005)'), (u'52', u'1', u'2005'))
+    assert_equals(
+        parser.parse(u'1888 Mitteilungen des Deutschen Archäologischen Instituts / Römische Abteilung Band 3'),
+        (u'3', None, u'1888'))
+    assert_equals(parser.parse(u'University Museums and Collections Journal 4/2011'), (u'4', None, u'2011'))
+    assert_equals(parser.parse(u'2001: 12-13'), (u'12-13', None, u'2001'))
+    assert_equals(parser.parse(u'Vol 10 (1997)'), (u'10', None, u'1997'))
+    assert_equals(parser.parse(u'Dumbarton Oaks Papers 54 (2000)'), (u'54', None, u'2000'))
+    assert_equals(parser.parse(u'Annual Report 1999'), (None, None, u'1999'))
+    assert_equals(parser.parse(u'Volume 7'), (u'7', None, None))
+    assert_equals(parser.parse(u'Volume 7, part 2'), None)
+    assert_equals(parser.parse(u'Table of contents'), None)
+
+@with_setup(setup_function, teardown_function)
+def test_parse_statistics():
+    """Ensure each parse is counted under the pattern that matched it."""
+
+    parser = AnalyticTitleParser()
+    for title in (u'Vol 10 (1997)', u'Vol 11 (1998)', u'Vol 10 (1997)', u'Annual Report 1999', u'Index'):
+        parser.parse(title)
+    stages = metrics.take()
+    assert_equals(stages['title.analytic.volume_year'][0], 3)
+    assert_equals(stages['title.analytic.year'][0], 1)
+    assert_equals(stages['title.analytic.none'][0], 1)
+    assert_equals(len(parser._memo), 4)
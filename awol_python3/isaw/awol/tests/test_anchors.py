@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the anchors module."""
+
+from bs4 import BeautifulSoup
+from nose.tools import *
+
+from isaw.awol.anchors import AnchorIndex
+
+HTML = u"""<html><body>
+<p><a href="http://oi.uchicago.edu/a.pdf">Volume 1</a>
+<a name="top">no href</a>
+<a href="http://ancientworldonline.blogspot.com/">AWOL</a></p>
+<ul>
+<li><a href="http://oi.uchicago.edu/a.pdf">Volume 1 again</a></li>
+<li><a href="http://www.jstor.org/x"></a></li>
+<li><a href="http://oi.uchicago.edu/b.pdf">Volume 2</a></li>
+<li><a>no href either</a></li>
+</ul>
+</body></html>"""
+
+def test_anchor_index():
+    """Ensure anchors are indexed in document order with first occurrences marked."""
+
+    soup = BeautifulSoup(HTML, 'lxml')
+    index = AnchorIndex(soup)
+    assert_equals([e['position'] for e in index.entries], list(range(7)))
+    assert_equals([e['first'] for e in index.entries], [True, True, True, False, True, True, False])
+    assert_equals(index.domains(), ['oi.uchicago.edu', 'ancientworldonline.blogspot.com', 'www.jstor.org'])
+    anchors = index.considered(['ancientworldonline.blogspot.com'], [], [u'contact us'])
+    assert_equals([a.get_text() for a in anchors], [u'Volume 1', u'Volume 2'])
+    assert_is(index.considered(['ancientworldonline.blogspot.com'], [], [u'contact us']), anchors)
+    assert_equals(index.following(anchors[0]).get_text(), u'no href')
+    assert_is_none(index.following(index.entries[-1]['anchor']))
+    assert_equals(index.entry(anchors[1])['url'], 'http://oi.uchicago.edu/b.pdf')
@@ -54,3 +54,43 @@ def test_article_init():
     assert_is_not_none(a.content)  
     assert_is_not_none(a.soup)     
 
+
+@with_setup(setup_function, teardown_function)
+def test_article_cleanup():
+    """Ensure content is purified and cleaned up in a single lxml tree."""
+
+    file_name = os.path.join(PATH_TEST_DATA, 'post-doaks-online.xml')
+    a = article.Article(atom_file_name=file_name)
+    # curly quotes in attribute values used to break the markup
+    anchor = a.soup.find('a', title=lambda t: t is not None and t.startswith(u'Siegecraft'))
+    assert_equals(anchor['title'], u'Siegecraft - Two Tenth-Century Instructional Manuals by "Heron of Byzantium"')
+    assert_is_none(a.soup.find('script'))
+
+@with_setup(setup_function, teardown_function)
+def test_article_header_only():
+    """Ensure a header-only article has the same header and cleans up its content on demand."""
+
+    file_name = os.path.join(PATH_TEST_DATA, 'post-capitale-culturale.xml')
+    a = article.Article(atom_file_name=file_name, header_only=True)
+    b = article.Article(atom_file_name=file_name)
+    for k in article.HEADER_FIELDS:
+        assert_equals(getattr(a, k), getattr(b, k))
+    assert_is_none(a.root)
+    assert_is_none(a._raw_content)
+    assert_is_none(a._html)
+    assert_is_none(b._html)
+    assert_equals(a.html, b.html)
+    assert_equals(str(a.soup), str(b.soup))
+
+def test_purify_tree():
+    """Ensure scripts, expr attributes and o:p elements are purged in place."""
+
+    from lxml import etree as exml
+    from isaw.awol.clean_string import purify_tree
+    html = exml.fromstring(
+        u'<p>a  – b<script>evil()</script> c<o:p>d</o:p><span expr:class="x" title="“q”">e</span></p>',
+        article.HTML_PARSER)
+    purify_tree(html)
+    assert_equals(
+        exml.tostring(html, encoding='unicode'),
+        u'<html><body><p>a - b c<p>d</p><span title="&quot;q&quot;">e</span></p></body></html>')
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the article_cache module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol import article
+from isaw.awol.tools.article_cache import ArticleCache, version_stamp
+from isaw.awol.tools.manifest import digest_file
+
+PATH_TEST = os.path.dirname(os.path.abspath(__file__))
+PATH_TEST_DATA = os.path.join(PATH_TEST, 'data')
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+@with_setup(setup_function, teardown_function)
+def test_article_cache_round_trip():
+    """Ensure a cached article comes back exactly as it was normalized."""
+
+    file_name = os.path.join(PATH_TEST_DATA, 'post-doaks-online.xml')
+    sha1 = digest_file(file_name)
+    cache = ArticleCache(PATH_TEST_TEMP)
+    assert_is_none(cache.load(sha1, article.Article))
+    a = article.Article(atom_file_name=file_name)
+    cache.save(sha1, a)
+    assert_true(os.path.isfile(os.path.join(
+        PATH_TEST_TEMP, version_stamp(), sha1[:2], sha1 + '.json.gz')))
+    b = cache.load(sha1, article.Article)
+    assert_equals((cache.hits, cache.misses), (1, 1))
+    for k in article.JSON_FIELDS:
+        assert_equals(getattr(b, k), getattr(a, k))
+    assert_is_none(b.root)
+    assert_is_none(b._soup)
+    assert_equals(str(b.soup), str(a.soup))
+
+@with_setup(setup_function, teardown_function)
+def test_article_cache_unreadable():
+    """Ensure a damaged cache entry counts as a miss."""
+
+    file_name = os.path.join(PATH_TEST_DATA, 'post-capitale-culturale.xml')
+    sha1 = digest_file(file_name)
+    cache = ArticleCache(PATH_TEST_TEMP)
+    cache.save(sha1, article.Article(atom_file_name=file_name))
+    with open(cache._file_name(sha1), 'wb') as f:
+        f.write(b'\x1f\x8b truncated')
+    assert_is_none(cache.load(sha1, article.Article))
@@ -49,3 +49,22 @@ def test_xml():
     a = AwolArticle(atom_file_name=file_name)
     del a
 
+
+def test_omit_reason():
+    """Ensure omitted posts are recognized from title and categories alone."""
+
+    assert_is_none(omit_reason(u'Open Access Journal: Il capitale culturale'))
+    assert_equals(omit_reason(u'Administrative Note'), u'administrative title')
+    assert_equals(omit_reason(u'Admin: blog maintenance'), u'omitted title prefix "admin"')
+    # only a prefix before a colon counts, not a whole title
+    assert_is_none(omit_reason(u'Announcement'))
+    settings = [{'vocabulary': KIND_SCHEME, 'term': 'http://schemas.google.com/blogger/2008/kind#settings'}]
+    assert_equals(omit_reason(u'Anything', settings), u'not a post (settings)')
+
+def test_omitted_before_cleanup():
+    """Ensure an article is judged omitted without its content being cleaned up."""
+
+    file_name = os.path.join(PATH_TEST_DATA, 'post-capitale-culturale.xml')
+    a = AwolArticle(atom_file_name=file_name)
+    assert_is_none(a.omitted)
+    assert_is_none(a._html)
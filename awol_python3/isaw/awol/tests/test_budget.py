@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the budget module."""
+
+import os
+import time
+
+from nose.tools import *
+
+from isaw.awol.tools.budget import BudgetPool
+
+def _square(x):
+    if x < 0:
+        time.sleep(60)
+    return x * x
+
+def _fail(x):
+    raise ValueError('bad job {0}'.format(x))
+
+def _die(x):
+    if x < 0:
+        os._exit(1)
+    return x * x
+
+def _failed(job, message):
+    return ('failed', job)
+
+def _timed_out(job, seconds):
+    return ('timed out', job)
+
+def test_budget_pool_order_and_timeout():
+    """Ensure overrunning jobs are replaced and results stay in order."""
+
+    pool = BudgetPool(2, _square, 0.5, _timed_out)
+    start = time.time()
+    results = list(pool.imap([1, 2, -3, 4, 5, -6, 7]))
+    assert_less(time.time() - start, 30.0)
+    assert_equals(results, [1, 4, ('timed out', -3), 16, 25, ('timed out', -6), 49])
+    assert_equals(pool.timeout_count, 2)
+
+def test_budget_pool_error():
+    """Ensure an exception in a worker surfaces in the parent."""
+
+    pool = BudgetPool(1, _fail, 5.0, _timed_out)
+    assert_raises(RuntimeError, list, pool.imap([1]))
+
+def test_budget_pool_failure():
+    """Ensure jobs that kill their worker or raise are replaced and results stay in order."""
+
+    pool = BudgetPool(2, _die, 5.0, _timed_out, on_failure=_failed)
+    results = list(pool.imap([1, -2, 3, 4, -5, 6, 7]))
+    assert_equals(results, [1, ('failed', -2), 9, 16, ('failed', -5), 36, 49])
+    assert_equals((pool.failure_count, pool.timeout_count), (2, 0))
+    pool = BudgetPool(1, _fail, 5.0, _timed_out, on_failure=_failed)
+    assert_equals(list(pool.imap([1, 2])), [('failed', 1), ('failed', 2)])
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the description module."""
+
+from bs4 import BeautifulSoup
+from nose.tools import *
+
+from isaw.awol.description import DescriptionWalker, node_url
+
+WIDE = ['a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'ol', 'ul', 'dl', 'dt', 'li', 'table']
+NARROW = ['a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+def test_node_url():
+    """Ensure trailing index pages and slashes are ignored when comparing anchors."""
+
+    soup = BeautifulSoup(u'<a href="http://x.org/j/index.html">x</a><b>y</b>', 'lxml')
+    assert_equals(node_url(soup.a), 'http://x.org/j')
+    assert_equals(node_url(soup.b), '')
+    assert_equals(node_url(soup.b.string), '')
+
+def test_walk():
+    """Ensure text is collected from the start node to the next stop node."""
+
+    soup = BeautifulSoup(
+        u'<p><a href="http://x.org/">Journal</a> published by X<br/>since 1990'
+        u'<a href="http://x.org/">(again)</a> <a href="http://y.org/">Other</a> more</p>', 'lxml')
+    walker = DescriptionWalker()
+    first_node = soup.p.contents[0]
+    lines = walker.walk(first_node, WIDE, True)
+    assert_equals(u''.join(lines), u'Journal published by X. since 1990(again) ')
+    assert_equals(walker.walk(first_node, WIDE, True), lines)
+    # a heading ends the walk
+    soup = BeautifulSoup(u'<div><b>Journal</b> of X<h2>Next</h2> more</div>', 'lxml')
+    assert_equals(walker.walk(soup.b, NARROW, False), [u'Journal', u' of X'])
+
+def test_walk_deep():
+    """Ensure deeply nested markup does not exhaust the recursion limit."""
+
+    depth = 3000
+    soup = BeautifulSoup(u'<p>start</p>' + u'<span>' * depth + u'deep' + u'</span>' * depth, 'lxml')
+    lines = DescriptionWalker().walk(soup.p, WIDE, False)
+    assert_equals(lines, [u'start', u'deep'])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the identifiers module."""
+
+from nose.tools import *
+
+from isaw.awol.identifiers import IdentifierScanner, issn_check_digit, valid_isbn, valid_issn
+
+def test_check_digits():
+    """Ensure ISSN and ISBN check digits are verified."""
+
+    assert_equals(issn_check_digit(u'0317847'), u'1')
+    assert_equals(issn_check_digit(u'2434561'), u'X')
+    assert_true(valid_issn(u'03178471'))
+    assert_false(valid_issn(u'03178472'))
+    assert_true(valid_isbn(u'9783161484100'))
+    assert_false(valid_isbn(u'9783161484101'))
+    assert_true(valid_isbn(u'0306406152'))
+    assert_true(valid_isbn(u'080442957X'))
+    assert_false(valid_isbn(u'0306406153'))
+
+def test_scan_issn():
+    """Ensure print and electronic ISSNs are told apart and invalid ones dropped."""
+
+    scanner = IdentifierScanner()
+    assert_equals(
+        scanner.scan(u'Mainz ISSN-Print: 0076-2741 ISSN-Internet: 2198-9400'),
+        {'issn': {'generic': [u'0076-2741'], 'electronic': [u'2198-9400']}})
+    assert_equals(
+        scanner.scan(u'ISSN 0317 8471 (online); eISSN 2049–3630'),
+        {'issn': {'electronic': [u'0317-8471', u'2049-3630']}})
+    assert_equals(scanner.scan(u'ISSN 1234-5678, call 555-1234'), {})
+    assert_equals(scanner.scan(u'no identifiers here'), {})
+    assert_equals(scanner.scan(None), {})
+
+def test_scan_isbn():
+    """Ensure ISBNs are found past ISBN-10/13 labels and written compactly."""
+
+    scanner = IdentifierScanner()
+    assert_equals(
+        scanner.scan(u'ISBN-13: 978-3-16-148410-0 (2005). e-ISBN 0-306-40615-2'),
+        {'isbn': {'generic': [u'9783161484100'], 'electronic': [u'0306406152']}})
+
+def test_scan_memo():
+    """Ensure remembered results cannot be altered through the returned dictionaries."""
+
+    scanner = IdentifierScanner()
+    text = u'ISSN 0076-2741'
+    found = scanner.scan(text)
+    found['issn']['generic'].append(u'junk')
+    assert_equals(scanner.scan(text), {'issn': {'generic': [u'0076-2741']}})
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the keywords module."""
+
+from nose.tools import *
+
+from isaw.awol.keywords import KeywordMiner, PhraseAutomaton
+
+TERMS = {
+    u'egypt': u'Egypt',
+    u'papyri': u'papyrology',
+    u'journal': u'journal'
+}
+PHRASES = {
+    u'alter orient': u'Ancient Near East',
+    u'alter orient und altes testament': u'Ancient Near East,Old Testament',
+    u'orient und': u'Orient',
+    u'new testament': u'New Testament'
+}
+
+def test_phrase_automaton():
+    """Ensure overlapping and nested phrases are all found."""
+
+    automaton = PhraseAutomaton(PHRASES.keys())
+    found = automaton.find(u'der alter orient und altes testament')
+    assert_equals(sorted([automaton.phrases[i] for i in found]), [
+        u'alter orient',
+        u'alter orient und altes testament',
+        u'orient und'])
+    assert_equals(automaton.find(u'nothing to see'), set())
+    assert_equals(PhraseAutomaton([u'ab c', u'b c']).find(u'xab c'), set([0, 1]))
+
+def test_keyword_miner():
+    """Ensure terms, access, series and phrase tags come out in vocabulary order."""
+
+    miner = KeywordMiner(TERMS, PHRASES)
+    assert_equals(
+        miner.mine(u'Journal of Papyri from Egypt: Alter Orient (Open Access)'),
+        [u'papyrology', u'journal', u'Ancient Near East'])
+    assert_equals(
+        miner.mine(u'Journal of Papyri from Egypt: Alter Orient (Open Access)'),
+        [u'papyrology', u'journal', u'Ancient Near East'])
+    assert_equals(miner.mine(u'Egypt open access'), [u'Egypt', u'open access'])
+    assert_equals(miner.mine(u'Egyptology partial open access'), [u'mixed access'])
+    assert_equals(miner.mine(u'Monograph Series'), [u'series'])
+    assert_equals(miner.mine(u'Lecture Series'), [])
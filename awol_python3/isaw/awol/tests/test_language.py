@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the language module."""
+
+import ast
+import os
+
+from nose.tools import *
+
+from isaw.awol.language import LanguageDetector, MARC_LANGUAGES, load_model
+
+PATH_TEST = os.path.dirname(os.path.abspath(__file__))
+PATH_MARC_SCRIPT = os.path.join(PATH_TEST, '..', '..', '..', '..', 'COACS_json_to_marc.py')
+ENGLISH = u'The Journal of Egyptian Archaeology publishes the excavation reports of the society.'
+FRENCH = u'La revue publie des articles consacrés à l’histoire et à l’archéologie de l’Égypte ancienne.'
+
+def test_detect():
+    """Ensure languages are identified, and remembered by normalized text."""
+
+    detector = LanguageDetector(0.98)
+    assert_equals(detector.detect(ENGLISH), 'en')
+    assert_equals(detector.detect(FRENCH), 'fr')
+    assert_equals(detector.detect(u'  ' + ENGLISH.replace(u' ', u'\n ')), 'en')
+    assert_equals((detector.hits, detector.misses), (1, 2))
+    assert_is_none(detector.detect(u' \n'))
+    assert_is_none(LanguageDetector(1.01).detect(ENGLISH))
+
+def test_restrict():
+    """Ensure candidates can be restricted to some languages and released again."""
+
+    detector = LanguageDetector(0.98, MARC_LANGUAGES)
+    assert_equals(detector.languages, sorted(MARC_LANGUAGES))
+    assert_equals(detector.identifier.nb_classes, sorted(MARC_LANGUAGES))
+    assert_equals(detector.detect(FRENCH), 'fr')
+    detector.restrict(['de', 'it', 'xx'])
+    assert_equals(detector.languages, ['de', 'it'])
+    assert_not_equal(detector.detect(FRENCH), 'fr')
+    detector.restrict(None)
+    assert_equals(len(detector.identifier.nb_classes), len(detector.all_languages))
+    assert_equals(detector.detect(FRENCH), 'fr')
+
+def test_marc_languages():
+    """Ensure MARC_LANGUAGES are the languages that COACS_json_to_marc.py maps (the keys of its lang_map)."""
+
+    # read rather than imported: the script lives outside the package and needs pymarc
+    with open(PATH_MARC_SCRIPT, 'rb') as f:
+        tree = ast.parse(f.read(), PATH_MARC_SCRIPT)
+    lang_maps = [ast.literal_eval(node.value) for node in tree.body
+        if isinstance(node, ast.Assign) and [getattr(t, 'id', None) for t in node.targets] == ['lang_map']]
+    assert_equals(len(lang_maps), 1)
+    assert_equals(MARC_LANGUAGES, sorted(lang_maps[0].keys()))
+
+def test_detect_all():
+    """Ensure texts classified together get the same languages as one at a time."""
+
+    texts = [ENGLISH, FRENCH, u'', ENGLISH + u' ', u'Bd. 52', u' ']
+    detector = LanguageDetector(0.98)
+    detector.BATCH_SIZE = 2
+    languages = detector.detect_all(texts)
+    single = LanguageDetector(0.98)
+    assert_equals(languages, [single.detect(t) for t in texts])
+    assert_equals(languages[:4], ['en', 'fr', None, 'en'])
+    assert_equals((detector.hits, detector.misses), (1, 3))
+
+def test_shared_model():
+    """Ensure detectors build their classifiers lazily, on one shared model."""
+
+    detector = LanguageDetector(0.98)
+    detector.restrict(None)
+    assert_is_none(detector._identifier)
+    other = LanguageDetector(0.98)
+    assert_equals(detector.detect(ENGLISH), 'en')
+    assert_is(detector.identifier.nb_ptc, load_model()[0])
+    assert_is(other.identifier.nb_ptc, detector.identifier.nb_ptc)
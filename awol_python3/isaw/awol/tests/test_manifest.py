@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the manifest module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.tools.manifest import Manifest, digest_file
+
+PATH_TEST = os.path.dirname(os.path.abspath(__file__))
+PATH_TEST_DATA = os.path.join(PATH_TEST, 'data')
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+@with_setup(setup_function, teardown_function)
+def test_digest_file():
+    """Ensure content hashes are stable and content-sensitive."""
+
+    file_name = os.path.join(PATH_TEST_DATA, 'post-capitale-culturale.xml')
+    assert_equals(digest_file(file_name), digest_file(file_name))
+    assert_not_equal(
+        digest_file(file_name),
+        digest_file(os.path.join(PATH_TEST_DATA, 'post-akoue.xml')))
+
+@with_setup(setup_function, teardown_function)
+def test_manifest_round_trip():
+    """Ensure recorded entries survive a save and reload."""
+
+    file_name = os.path.join(PATH_TEST_TEMP, 'manifest.json')
+    m = Manifest(file_name)
+    assert_is_none(m.digest('a/post-1.xml'))
+    resources = [{'url': u'http://www.unimc.it/', 'title': u'Il capitale culturale'}]
+    m.record('a/post-1.xml', 'abc', u'http://ancientworldonline.blogspot.com/1.html', resources, [('www.unimc.it', 'www-unimc-it')])
+    m.save()
+    m = Manifest(file_name)
+    assert_equals(m.digest('a/post-1.xml'), 'abc')
+    assert_is_none(m.lookup('a/post-1.xml', 'def'))
+    entry = m.lookup('a/post-1.xml', 'abc')
+    assert_equals(entry['resources'], resources)
+    assert_equals(entry['outputs'], [['www.unimc.it', 'www-unimc-it']])
+
+@with_setup(setup_function, teardown_function)
+def test_manifest_retraction():
+    """Ensure vanished and changed posts yield their stale outputs."""
+
+    file_name = os.path.join(PATH_TEST_TEMP, 'manifest.json')
+    m = Manifest(file_name)
+    m.record('post-1.xml', 'a', None, [], [('d', 'one')])
+    m.record('post-2.xml', 'b', None, [], [('d', 'two')])
+    m.record('post-3.xml', 'c', None, [], [('d', 'three'), ('d', 'shared')])
+    m.record('post-4.xml', 'd', None, [], [('d', 'shared')])
+    m.save()
+    m = Manifest(file_name)
+    m.lookup('post-1.xml', 'a')
+    m.record('post-2.xml', 'bb', None, [], [('d', 'two-bis')])
+    m.lookup('post-4.xml', 'd')
+    assert_equals(m.retract_unseen(), ['post-3.xml'])
+    assert_equals(m.stale_outputs(), [('d', 'three'), ('d', 'two')])
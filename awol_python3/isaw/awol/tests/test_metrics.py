@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the metrics module."""
+
+import json
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.tools import metrics
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+    metrics.take()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+    metrics.take()
+
+@with_setup(setup_function, teardown_function)
+def test_metrics_take_and_add():
+    """Ensure worker figures can be handed back and totalled."""
+
+    @metrics.timed('double')
+    def double(x):
+        return 2 * x
+
+    assert_equals(double(2), 4)
+    with metrics.timer('block'):
+        double(3)
+    taken = metrics.take()
+    assert_equals(metrics.STAGES, {})
+    assert_equals(taken['double'][0], 2)
+    assert_equals(taken['block'][0], 1)
+    metrics.add(taken)
+    metrics.add(taken)
+    assert_equals(metrics.summary()['double']['count'], 4)
+
+@with_setup(setup_function, teardown_function)
+def test_progress_dump():
+    """Ensure progress lines and the metrics file are written."""
+
+    p = metrics.Progress()
+    p.step(3)
+    assert_true(p.line().startswith('3 posts'))
+    p.total = 6
+    assert_true(p.line().startswith('3/6 posts (50%)'))
+    metrics.record('post', 1.5)
+    file_name = os.path.join(PATH_TEST_TEMP, 'metrics.json')
+    p.dump(file_name, workers=2)
+    with open(file_name) as f:
+        d = json.load(f)
+    assert_equals(d['posts'], 3)
+    assert_equals(d['workers'], 2)
+    assert_equals(d['stages']['post'], {'count': 1, 'seconds': 1.5, 'mean': 1.5})
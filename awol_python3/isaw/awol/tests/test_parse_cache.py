@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the parse_cache module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.parse.awol_parse import AwolBaseParser
+from isaw.awol.tools.article_cache import PATH_AWOL
+from isaw.awol.tools.parse_cache import ParseCache, parser_modules
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+class Parser():
+    domain = 'example.org'
+
+class OtherParser():
+    domain = 'example.com'
+
+class ThirdParty(dict):
+    domain = 'example.net'
+
+@with_setup(setup_function, teardown_function)
+def test_parse_cache_round_trip():
+    """Ensure parsed resources are cached per post and parser."""
+
+    cache = ParseCache(PATH_TEST_TEMP)
+    sha1 = 'a' * 40
+    key = cache.key(sha1, Parser())
+    assert_equals(key, cache.key(sha1, Parser()))
+    assert_not_equal(key, cache.key('b' * 40, Parser()))
+    assert_is_none(cache.load(key))
+    resources = [{'domain': 'example.org', 'title': u'Ἀρχαιολογία', 'url': 'http://example.org/'}]
+    cache.save(key, resources)
+    assert_equals(cache.load(key), resources)
+    assert_equals((cache.hits, cache.misses), (1, 1))
+
+@with_setup(setup_function, teardown_function)
+def test_parser_stamp():
+    """Ensure parsers are stamped with the source of their isaw.awol modules only."""
+
+    cache = ParseCache(PATH_TEST_TEMP)
+    # both defined in this very module
+    assert_equals(cache.parser_stamp(Parser()), cache.parser_stamp(OtherParser()))
+    # dict (a builtin) does not count
+    assert_equals(cache.parser_stamp(Parser()), cache.parser_stamp(ThirdParty()))
+
+def test_parser_modules():
+    """Ensure parsers depend on the isaw.awol modules their modules import, however indirectly."""
+
+    file_names = [os.path.relpath(f, PATH_AWOL) for f in parser_modules(AwolBaseParser)]
+    for file_name in ['parse/awol_parse.py', 'resource.py', 'awol_article.py', 'article.py', 'tools/mods.py', 'vocabulary.py', 'keywords.py', 'analytic.py']:
+        assert_in(os.path.join(*file_name.split('/')), file_names)
+    # the bank of all parsers is not a dependency of any one of them
+    assert_not_in(os.path.join('parse', 'awol_parsers.py'), file_names)
+
+@with_setup(setup_function, teardown_function)
+def test_parse_cache_settings():
+    """Ensure run settings that change parse results change the keys."""
+
+    sha1 = 'a' * 40
+    cache = ParseCache(PATH_TEST_TEMP)
+    restricted = ParseCache(PATH_TEST_TEMP, settings=u'languages=de,en')
+    assert_not_equal(cache.key(sha1, Parser()), restricted.key(sha1, Parser()))
+    assert_equals(cache.key(sha1, Parser()), ParseCache(PATH_TEST_TEMP, settings=u'').key(sha1, Parser()))
@@ -2,20 +2,25 @@
 # -*- coding: utf-8 -*-
 """Test code in the article module."""
 
+import glob
+import json
 import logging
 import os
 import sys
 
 from nose import with_setup
+from nose.plugins.skip import SkipTest
 from nose.tools import *
+import requests
 
 try:
     from nose.tools import assert_multi_line_equal
 except ImportError:
     assert_multi_line_equal = assert_equal
 else:
-    assert_multi_line_equal.im_class.maxDiff = None
+    assert_multi_line_equal.__self__.maxDiff = None
     
+from isaw.awol.parse import awol_parse
 from isaw.awol.parse.awol_parsers import AwolParsers
 from isaw.awol.awol_article import AwolArticle
 
@@ -23,6 +28,8 @@ from isaw.awol.awol_article import AwolArticle
 PATH_TEST = os.path.dirname(os.path.abspath(__file__))
 PATH_TEST_DATA = os.path.join(PATH_TEST, 'data')
 PATH_TEST_TEMP = os.path.join(PATH_TEST, 'temp')
+PATH_PARSED_POSTS = os.path.join(PATH_TEST_DATA, 'parsed-posts.json')
+SUMMARY_FIELDS = ['url', 'domain', 'title', 'title_extended', 'description', 'languages', 'keywords', 'identifiers', 'volume', 'issue', 'year']
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -85,6 +92,10 @@ def test_parsers_generic():
 
 @with_setup(setup_function, teardown_function)
 def test_parsers_generic_external_biblio():
+    try:
+        requests.head('http://zenon.dainst.org/', timeout=10)
+    except requests.RequestException:
+        raise SkipTest('zenon.dainst.org cannot be reached')
     file_name = os.path.join(PATH_TEST_DATA, 'post-numismatico-dello-stato.xml')
     a = AwolArticle(atom_file_name=file_name)
     parsers = AwolParsers()
@@ -275,8 +286,8 @@ def test_parsers_when_rome_attacks():
     rtop = resources[0]
     assert_equals(rtop.url, 'http://www.digizeitschriften.de/dms/toc/?PPN=PPN783873484')
     assert_equals(len(rtop.subordinate_resources), 13)
-    assert_equals(sorted([r.year for r in resources[1:]]), [None, u'1888', u'1889', u'1890', u'1891', u'1892', u'1893', u'1895', u'1896', u'1897', u'1898', u'1899', u'1900'])
-    assert_equals(sorted(list(set([r.volume for r in resources[1:]]))), [None, u'10', u'11', u'12', u'13', u'14', u'15', u'3', u'4', u'5', u'6', u'7', u'8'])
+    assert_equals(sorted([r.year for r in resources[1:]], key=lambda year: year or u''), [None, u'1888', u'1889', u'1890', u'1891', u'1892', u'1893', u'1895', u'1896', u'1897', u'1898', u'1899', u'1900'])
+    assert_equals(sorted(list(set([r.volume for r in resources[1:]])), key=lambda volume: volume or u''), [None, u'10', u'11', u'12', u'13', u'14', u'15', u'3', u'4', u'5', u'6', u'7', u'8'])
 
 @with_setup(setup_function, teardown_function)
 def test_parsers_umcj():
@@ -290,7 +301,7 @@ def test_parsers_umcj():
     assert_equals(rtop.url, 'http://edoc.hu-berlin.de/browsing/umacj/index.php')
     assert_equals(len(rtop.subordinate_resources), 10)
     assert_equals(sorted(list(set([r.year for r in resources[1:]]))), [u'2001', u'2002', u'2003', u'2004', u'2005', u'2006', u'2008', u'2009', u'2010', u'2011'])
-    assert_equals(sorted(list(set([r.volume for r in resources[1:]]))), [None, u'1', u'2', u'3', u'4'])
+    assert_equals(sorted(list(set([r.volume for r in resources[1:]])), key=lambda volume: volume or u''), [None, u'1', u'2', u'3', u'4'])
 
 @with_setup(setup_function, teardown_function)
 def test_parsers_umcj():
@@ -318,4 +329,54 @@ def test_parsers_goofy_initial_links():
     r = resources[0]
     assert_equals(r.title, u'Filología Neotestamentaria')
 
+def summarize(resources):
+    """Return the parts of parsed resources that parsing decides, as plain data."""
+
+    summaries = []
+    for r in resources:
+        summary = {k: getattr(r, k) for k in SUMMARY_FIELDS}
+        for k in ['is_part_of', 'subordinate_resources', 'related_resources']:
+            packages = getattr(r, k)
+            if isinstance(packages, dict):
+                summary[k] = packages.get('url')
+            else:
+                summary[k] = [p.get('url') for p in packages or []]
+        summaries.append(summary)
+    return json.loads(json.dumps(summaries))
+
+def parse_posts():
+    """Parse every post in the test data offline, as walk_to_json would, and summarize the resources.
+
+    Posts left out by title or category are skipped, and posts no parser
+    takes on come out as None.
+    """
+
+    get = awol_parse.requests.get
+    def offline(*args, **kwargs):
+        raise requests.ConnectionError('offline')
+    awol_parse.requests.get = offline
+    try:
+        parsers = AwolParsers()
+        parsed = {}
+        for file_name in sorted(glob.glob(os.path.join(PATH_TEST_DATA, 'post-*.xml'))):
+            a = AwolArticle(atom_file_name=file_name)
+            if a.omitted is not None:
+                continue
+            try:
+                parsed[os.path.basename(file_name)] = summarize(parsers.parse(a))
+            except NotImplementedError:
+                parsed[os.path.basename(file_name)] = None
+    finally:
+        awol_parse.requests.get = get
+    return parsed
 
+@with_setup(setup_function, teardown_function)
+def test_parsers_all_posts():
+    """Ensure all posts in the test data parse as recorded in parsed-posts.json."""
+
+    with open(PATH_PARSED_POSTS, 'r', encoding='utf8') as f:
+        expected = json.load(f)
+    parsed = parse_posts()
+    assert_equals(sorted(parsed.keys()), sorted(expected.keys()))
+    for post in sorted(expected.keys()):
+        assert_equals(parsed[post], expected[post], post)
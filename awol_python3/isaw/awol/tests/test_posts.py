@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the posts module."""
+
+import io
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.tools.posts import *
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup: a small tree of post files."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+    for rel_path in [
+        '2011/02/post-b.xml',
+        '2011/02/post-a.xml',
+        '2011/03/post-c.xml',
+        '2012/post-d.xml',
+        '2012/notes.xml',
+        'post-e.xml',
+        '.git/post-f.xml',
+    ]:
+        path = os.path.join(PATH_TEST_TEMP, rel_path)
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError:
+            pass
+        open(path, 'w').close()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+def walked(root_dir):
+    """What the bin scripts used to do with os.walk."""
+
+    paths = []
+    for dir_name, sub_dir_list, file_list in os.walk(root_dir):
+        for ignore_dir in IGNORE_DIRS:
+            if ignore_dir in sub_dir_list:
+                sub_dir_list.remove(ignore_dir)
+        paths.extend([os.path.join(dir_name, f) for f in file_list if is_post_file(f)])
+    return paths
+
+@with_setup(setup_function, teardown_function)
+def test_walk_posts_order():
+    """Ensure lazy discovery yields the same posts in the same order as os.walk."""
+
+    paths = list(walk_posts(PATH_TEST_TEMP))
+    assert_equals(len(paths), 5)
+    assert_equals(paths, walked(PATH_TEST_TEMP))
+
+@with_setup(setup_function, teardown_function)
+def test_walk_posts_glob():
+    """Ensure glob patterns match relative paths and file names."""
+
+    paths = list(walk_posts(PATH_TEST_TEMP, ['2011/*']))
+    assert_equals(sorted([os.path.basename(p) for p in paths]), ['post-a.xml', 'post-b.xml', 'post-c.xml'])
+    paths = list(walk_posts(PATH_TEST_TEMP, ['post-d.xml', 'post-e*']))
+    assert_equals(sorted([os.path.basename(p) for p in paths]), ['post-d.xml', 'post-e.xml'])
+
+@with_setup(setup_function, teardown_function)
+def test_iter_posts_list():
+    """Ensure a list file is used verbatim instead of walking."""
+
+    list_name = os.path.join(PATH_TEST_TEMP, 'list.txt')
+    with io.open(list_name, 'w') as f:
+        f.write(u'# a comment\n/x/post-1.xml\n\n/y/post-2.xml\n')
+    assert_equals(list(iter_posts(PATH_TEST_TEMP, post_list=list_name)), ['/x/post-1.xml', '/y/post-2.xml'])
+    assert_equals(list(iter_posts(PATH_TEST_TEMP, ['*-2.xml'], list_name)), ['/y/post-2.xml'])
+
+@with_setup(setup_function, teardown_function)
+def test_iter_export():
+    """Ensure post entries are streamed out of an export and others skipped."""
+
+    file_name = os.path.join(PATH_TEST_TEMP, 'export.xml')
+    with io.open(file_name, 'w', encoding='utf8') as f:
+        f.write(u"""<?xml version='1.0' encoding='UTF-8'?>
+<feed xmlns='http://www.w3.org/2005/Atom'>
+  <id>tag:blogger.com,1999:blog-1</id>
+  <entry>
+    <id>tag:blogger.com,1999:blog-1.settings.BLOG_NAME</id>
+    <category scheme='http://schemas.google.com/g/2005#kind' term='http://schemas.google.com/blogger/2008/kind#settings'/>
+  </entry>
+  <entry>
+    <id>tag:blogger.com,1999:blog-1.post-2</id>
+    <category scheme='http://schemas.google.com/g/2005#kind' term='http://schemas.google.com/blogger/2008/kind#post'/>
+    <title>Ἀκοή</title>
+  </entry>
+  <entry>
+    <id>tag:blogger.com,1999:blog-1.post-3</id>
+  </entry>
+</feed>""")
+    entries = list(iter_export(file_name))
+    assert_equals(
+        [target for target, data in entries],
+        [file_name + '#tag:blogger.com,1999:blog-1.post-2', file_name + '#tag:blogger.com,1999:blog-1.post-3'])
+    assert_in(u'Ἀκοή'.encode('utf-8'), entries[0][1])
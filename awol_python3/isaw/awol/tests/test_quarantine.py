@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the quarantine module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.clean_string import purify_html
+from isaw.awol.tools.quarantine import Quarantine
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+@with_setup(setup_function, teardown_function)
+def test_quarantine_round_trip():
+    """Ensure failed posts are recorded, reloaded and released."""
+
+    dir_name = os.path.join(PATH_TEST_TEMP, 'quarantine')
+    q = Quarantine(dir_name)
+    q.add('b/post-2.xml', '/posts/b/post-2.xml', 'abc', 'parse', 'ValueError', u'unexpected category tag')
+    q.add('a/post-1.xml', '/posts/a/post-1.xml', 'def', 'article', 'RuntimeError', u'XMLSyntaxError')
+    q.add('a/post-1.xml', '/posts/a/post-1.xml', 'def', 'budget', 'TimeoutError', u'killed after 9.0s')
+    q = Quarantine(dir_name)
+    assert_equals(q.targets(), ['/posts/a/post-1.xml', '/posts/b/post-2.xml'])
+    assert_equals(q.records()[0]['stage'], 'budget')
+    assert_true(q.remove('a/post-1.xml'))
+    assert_false(q.remove('a/post-1.xml'))
+    assert_equals(len(os.listdir(dir_name)), 1)
+
+def test_purify_html_raises():
+    """Ensure unremovable scripts raise rather than exit."""
+
+    assert_raises(ValueError, purify_html, u'<p><script src="x.js"></p>')
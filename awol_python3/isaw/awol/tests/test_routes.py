@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the routes module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.tools.routes import RoutingIndex, parser_name
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+@with_setup(setup_function, teardown_function)
+def test_routing_index():
+    """Ensure posts are found again by resource domain and by parser."""
+
+    file_name = os.path.join(PATH_TEST_TEMP, 'routes.json')
+    routes = RoutingIndex(file_name)
+    routes.record('a/post-1.xml', ['othes.univie.ac.at'], 'awol_parse_othes_univie')
+    routes.record('a/post-2.xml', ['www.jstor.org', 'oi.uchicago.edu'], None)
+    routes.record('b/post-3.xml', ['oi.uchicago.edu'], 'awol_parse_oi')
+    routes.save()
+    routes = RoutingIndex(file_name)
+    assert_equals(routes.select(domains=['oi.uchicago.edu']), ['a/post-2.xml', 'b/post-3.xml'])
+    assert_equals(routes.select(parsers=['awol_parse_othes_univie.Parser']), ['a/post-1.xml'])
+    assert_equals(routes.select(domains=['www.jstor.org'], parsers=['oi']), ['a/post-2.xml', 'b/post-3.xml'])
+    routes.remove('b/post-3.xml')
+    assert_equals(routes.select(parsers=['oi']), [])
+
+def test_parser_name():
+    """Ensure parsers are named after their modules."""
+
+    assert_equals(parser_name(RoutingIndex('unused.json')), 'routes')
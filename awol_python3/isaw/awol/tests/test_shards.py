@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the shards module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.tools.shards import ShardWriter, iter_shards, parse_shard, post_id, shard_of
+
+PATH_TEST = os.path.dirname(os.path.abspath(__file__))
+PATH_TEST_DATA = os.path.join(PATH_TEST, 'data')
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+def test_parse_shard():
+    """Ensure shard specifications are checked."""
+
+    assert_equals(parse_shard('2/4'), (2, 4))
+    assert_raises(ValueError, parse_shard, '0/4')
+    assert_raises(ValueError, parse_shard, '5/4')
+    assert_raises(ValueError, parse_shard, 'two')
+
+def test_post_id():
+    """Ensure shards are chosen from the Atom id of a post."""
+
+    pid = post_id(os.path.join(PATH_TEST_DATA, 'post-akoue.xml'))
+    assert_true(pid.startswith('tag:blogger.com'))
+    assert_equals(shard_of(pid, 1), 1)
+    assert_equals(shard_of(pid, 7), shard_of(pid, 7))
+    assert_equals(len(set([shard_of(str(n), 4) for n in range(100)])), 4)
+
+@with_setup(setup_function, teardown_function)
+def test_iter_shards():
+    """Ensure shard files are combined in walk order, and only when complete."""
+
+    file_names = []
+    for i, ns in [(1, [0, 3, 4]), (2, [1, 2, 5])]:
+        file_name = os.path.join(PATH_TEST_TEMP, 'shard-{0}-of-2.jsonl.gz'.format(i))
+        w = ShardWriter(file_name, i, 2)
+        for n in ns:
+            w.write(n, 'post-{0}.xml'.format(n), None, [])
+        w.close()
+        file_names.append(file_name)
+    assert_equals([record['n'] for record in iter_shards(file_names)], [0, 1, 2, 3, 4, 5])
+    assert_raises(ValueError, list, iter_shards(file_names[:1]))
+    assert_raises(ValueError, list, iter_shards([file_names[0], file_names[0]]))
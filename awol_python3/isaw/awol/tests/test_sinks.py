@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the sinks module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.resource import Resource
+from isaw.awol.tools.sinks import *
+
+PATH_TEST = os.path.dirname(os.path.abspath(__file__))
+PATH_TEST_DATA = os.path.join(PATH_TEST, 'data')
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+def write_sample(file_name):
+    r = Resource()
+    r.json_load(os.path.join(PATH_TEST_DATA, 'il-capitale-culturale.json'))
+    sink = JsonLinesSink(file_name)
+    for n in range(3):
+        r.title = u'Il capitale culturale {0}'.format(n)
+        sink.write(u'www.unimc.it', u'cap-cult-{0}'.format(n), r)
+    sink.close()
+
+@with_setup(setup_function, teardown_function)
+def test_jsonl_round_trip():
+    """Ensure resources come back in order, plain and gzipped."""
+
+    for name in ['resources.jsonl', 'resources.jsonl.gz']:
+        file_name = os.path.join(PATH_TEST_TEMP, name)
+        write_sample(file_name)
+        titles = [r.title for r in iter_jsonl(file_name)]
+        assert_equals(titles, [u'Il capitale culturale {0}'.format(n) for n in range(3)])
+        assert_true(os.path.exists(index_file_name(file_name)))
+
+@with_setup(setup_function, teardown_function)
+def test_jsonl_fetch():
+    """Ensure single resources can be fetched through the offset index."""
+
+    for name in ['resources.jsonl', 'resources.jsonl.gz']:
+        file_name = os.path.join(PATH_TEST_TEMP, name)
+        write_sample(file_name)
+        r = fetch_jsonl(file_name, u'www.unimc.it', u'cap-cult-1')
+        assert_equals(r.title, u'Il capitale culturale 1')
+        assert_equals(r.domain, u'www.unimc.it')
+        assert_raises(KeyError, fetch_jsonl, file_name, u'www.unimc.it', u'nope')
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the store module."""
+
+import os
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.resource import Resource
+from isaw.awol.tools.sinks import DirectorySink
+from isaw.awol.tools.store import ResourceStore, store_resource
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+def make_resource(n):
+    r = Resource()
+    r.domain = u'www.persee.fr'
+    r.url = u'http://www.persee.fr/{0}'.format(n)
+    r.title = u'Resource {0}'.format(n)
+    return r
+
+@with_setup(setup_function, teardown_function)
+def test_store_writes_once_on_flush():
+    """Ensure nothing is written until the store is flushed."""
+
+    store = ResourceStore(DirectorySink(PATH_TEST_TEMP))
+    assert_is_none(store.get('www.persee.fr', 'one'))
+    store.put('www.persee.fr', 'one', make_resource(1))
+    store.put('www.persee.fr', 'one', make_resource(2))
+    assert_equals(store.get('www.persee.fr', 'one').title, u'Resource 2')
+    assert_false(os.path.exists(store.sink.location('www.persee.fr', 'one')))
+    store.flush()
+    assert_true(os.path.exists(store.sink.location('www.persee.fr', 'one')))
+    assert_equals(store.write_count, 1)
+
+@with_setup(setup_function, teardown_function)
+def test_store_eviction():
+    """Ensure evicted resources are written early and read back on demand."""
+
+    store = ResourceStore(DirectorySink(PATH_TEST_TEMP), max_resident=1)
+    store.put('www.persee.fr', 'one', make_resource(1))
+    store.put('www.persee.fr', 'two', make_resource(2))
+    assert_true(os.path.exists(store.sink.location('www.persee.fr', 'one')))
+    assert_false(os.path.exists(store.sink.location('www.persee.fr', 'two')))
+    r = store.get('www.persee.fr', 'one')
+    assert_equals(r.url, u'http://www.persee.fr/1')
+    store.flush()
+    assert_equals(store.write_count, 3)
+
+@with_setup(setup_function, teardown_function)
+def test_store_seeded_from_sink():
+    """Ensure a seeded store merges into earlier output, except a post's own earlier resource."""
+
+    store = ResourceStore(DirectorySink(PATH_TEST_TEMP))
+    for n, post in ((1, u'http://blog/a'), (2, u'http://blog/a'), (2, u'http://blog/b')):
+        r = make_resource(n)
+        r.set_provenance(post)
+        store_resource(r, post, store, {})
+    store.flush()
+    store = ResourceStore(DirectorySink(PATH_TEST_TEMP), seed=True)
+    for n, post in ((1, u'http://blog/a'), (2, u'http://blog/a')):
+        r = make_resource(n)
+        r.title = u'Resource {0}, again'.format(n)
+        r.set_provenance(post)
+        store_resource(r, post, store, {})
+    # only post a gave resource 1: replaced
+    r = store.get('www.persee.fr', '1')
+    assert_equals(r.title, u'Resource 1, again')
+    assert_equals(len(r.provenance), 1)
+    # posts a and b gave resource 2: merged into
+    r = store.get('www.persee.fr', '2')
+    assert_equals(r.title, u'Resource 2, again')
+    posts = set([p['resource'] for p in r.provenance if p['term'].endswith('citesAsMetadataDocument')])
+    assert_equals(posts, set([u'http://blog/a', u'http://blog/b']))
+    assert_is_none(store.get('www.persee.fr', '3'))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the vocabulary module."""
+
+import os
+import pickle
+import shutil
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.vocabulary import (
+    COLON_PREFIXES, COLON_PREFIX_ROWS, KEYWORD_MINER, TITLE_SUBSTRING_PHRASES,
+    TITLE_SUBSTRING_TAGS, TITLE_SUBSTRING_TERMS, load_vocabularies, vocabulary_stamp)
+
+PATH_TEST_TEMP = None
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+
+def test_vocabularies():
+    """Ensure the compiled vocabularies are complete and read-only."""
+
+    assert_equals(TITLE_SUBSTRING_TAGS[u'boğazköy'], u'Boğazköy')
+    assert_equals(len(TITLE_SUBSTRING_TERMS) + len(TITLE_SUBSTRING_PHRASES), len(TITLE_SUBSTRING_TAGS))
+    assert_true(all([u' ' in k for k in TITLE_SUBSTRING_PHRASES]))
+    assert_equals(COLON_PREFIXES[u'open access journal'], (u'', u'yes', u'no'))
+    assert_true((u'Open Access Journal', u'', u'yes', u'no') in COLON_PREFIX_ROWS)
+    assert_equals(KEYWORD_MINER.mine(u'Book of the Dead'), [u'book', u'Book of the Dead'])
+    def assign(mapping, key, value):
+        mapping[key] = value
+    assert_raises(TypeError, assign, TITLE_SUBSTRING_TAGS, u'x', u'y')
+    assert_raises(TypeError, assign, COLON_PREFIXES, u'x', (u'', u'', u''))
+
+@with_setup(setup_function, teardown_function)
+def test_bundle():
+    """Ensure the bundle file is written once and rebuilt only when stale."""
+
+    bundle_file = os.path.join(PATH_TEST_TEMP, 'vocabulary.pickle')
+    vocabularies = load_vocabularies(bundle_file)
+    assert_true(os.path.isfile(bundle_file))
+    with open(bundle_file, 'rb') as f:
+        bundle = pickle.load(f)
+    assert_equals(bundle['stamp'], vocabulary_stamp())
+    assert_equals(load_vocabularies(bundle_file)['title_substring_tags'], vocabularies['title_substring_tags'])
+    # a bundle with another stamp (e.g., an edited CSV file) is replaced
+    bundle['stamp'] = 'stale'
+    bundle['vocabularies']['title_substring_tags'] = {}
+    with open(bundle_file, 'wb') as f:
+        pickle.dump(bundle, f)
+    assert_equals(load_vocabularies(bundle_file)['title_substring_tags'], vocabularies['title_substring_tags'])
+    with open(bundle_file, 'rb') as f:
+        assert_equals(pickle.load(f)['stamp'], vocabulary_stamp())
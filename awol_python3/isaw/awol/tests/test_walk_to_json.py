@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Test code in the walk_to_json script."""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from nose import with_setup
+from nose.tools import *
+
+from isaw.awol.resource import Resource
+
+PATH_TEST = os.path.dirname(os.path.abspath(__file__))
+PATH_TEST_DATA = os.path.join(PATH_TEST, 'data')
+PATH_BIN = os.path.join(PATH_TEST, '..', '..', '..', 'bin')
+PATH_TEST_TEMP = None
+ARCHAEONAUTICA = u'http://ancientworldonline.blogspot.com/2011/02/open-access-journal-archaeonautica.html'
+
+if PATH_BIN not in sys.path:
+    sys.path.insert(0, PATH_BIN)
+import walk_to_json
+
+class FakeParsers():
+    """Stand in for AwolParsers: every post gives a resource of its own and a shared one.
+
+    Posts whose url is in failing raise an exception instead, and those
+    whose url is in dying end the process parsing them. Each post is
+    routed as if it linked to a domain named after its own url.
+    """
+
+    domains = []
+
+    def __init__(self):
+        self.failing = set()
+        self.dying = set()
+
+    def select(self, article):
+        self.domains = [article.url.split('/')[-1]]
+        return self
+
+    def parse(self, article, parser=None):
+        if article.url in self.dying:
+            os._exit(1)
+        if article.url in self.failing:
+            raise ValueError(u'cannot parse {0}'.format(article.url))
+        resources = []
+        for url in (article.url, u'http://www.example.org/shared'):
+            r = Resource()
+            r.domain = u'www.example.org'
+            r.url = url.replace(u'http://ancientworldonline.blogspot.com', u'http://www.example.org')
+            r.title = article.title
+            r.keywords = [article.title.split()[0]]
+            r.set_provenance(article.url)
+            resources.append(r)
+        return resources
+
+def setup_function():
+    """Test harness setup."""
+
+    global PATH_TEST_TEMP
+    PATH_TEST_TEMP = tempfile.mkdtemp()
+    posts_dir = os.path.join(PATH_TEST_TEMP, 'posts')
+    os.makedirs(posts_dir)
+    for file_name in glob.glob(os.path.join(PATH_TEST_DATA, 'post-*.xml')):
+        shutil.copy(file_name, posts_dir)
+    walk_to_json.PARSERS = FakeParsers()
+
+def teardown_function():
+    """Test harness teardown."""
+
+    shutil.rmtree(PATH_TEST_TEMP)
+    walk_to_json.PARSERS = None
+
+def walk(dest_dir, **kwargs):
+    """Run walk_to_json over the test posts with default options, except as given."""
+
+    options = {
+        'whence': [os.path.join(PATH_TEST_TEMP, 'posts')],
+        'thence': [dest_dir],
+        'workers': 1,
+        'budget': None,
+        'progress': False,
+        'count_posts': False,
+        'manifest': None,
+        'max_resident': None,
+        'jsonl': None,
+        'metrics': None,
+        'article_cache': None,
+        'parse_cache': None,
+        'marc_languages': False,
+        'quarantine': None,
+        'retry_quarantine': False,
+        'routes': None,
+        'domain': None,
+        'parser': None,
+        'shard': None,
+        'shard_file': None,
+        'atom_export': False,
+        'glob': None,
+        'postfile': None
+    }
+    options.update(kwargs)
+    walk_to_json.main(argparse.Namespace(**options))
+
+def read_output(dest_dir):
+    """Return the resources written to dest_dir by relative path, minus provenance times."""
+
+    output = {}
+    for dir_path, dir_names, file_names in os.walk(dest_dir):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            with open(path, 'r', encoding='utf8') as f:
+                d = json.load(f)
+            for p in d.get('provenance', []):
+                del p['when']
+            output[os.path.relpath(path, dest_dir)] = d
+    return output
+
+@with_setup(setup_function, teardown_function)
+def test_workers_match_serial_run():
+    """Ensure a run with worker processes writes what a serial run writes, collisions included."""
+
+    serial_dir = os.path.join(PATH_TEST_TEMP, 'serial')
+    parallel_dir = os.path.join(PATH_TEST_TEMP, 'parallel')
+    walk(serial_dir)
+    walk(parallel_dir, workers=2)
+    serial = read_output(serial_dir)
+    assert_true(os.path.join('www.example.org', 'shared.json') in serial)
+    assert_true(len(serial) > 10)
+    assert_equals(read_output(parallel_dir), serial)
+
+def shared_contributors(output):
+    """Return the post urls that the shared resource in some output cites."""
+
+    d = output[os.path.join('www.example.org', 'shared.json')]
+    return set([p['resource'] for p in d['provenance'] if p['term'].endswith('citesAsMetadataDocument')])
+
+@with_setup(setup_function, teardown_function)
+def test_retry_quarantine_keeps_other_output():
+    """Ensure retrying a quarantined post merges into the output of the other posts."""
+
+    full_dir = os.path.join(PATH_TEST_TEMP, 'full')
+    dest_dir = os.path.join(PATH_TEST_TEMP, 'dest')
+    quarantine_dir = os.path.join(PATH_TEST_TEMP, 'quarantine')
+    walk(full_dir)
+    full = read_output(full_dir)
+    failing = ARCHAEONAUTICA
+    assert_true(failing in shared_contributors(full))
+    walk_to_json.PARSERS.failing.add(failing)
+    walk(dest_dir, quarantine=quarantine_dir)
+    before = read_output(dest_dir)
+    assert_false(failing in shared_contributors(before))
+    walk_to_json.PARSERS.failing.clear()
+    walk(dest_dir, quarantine=quarantine_dir, retry_quarantine=True)
+    after = read_output(dest_dir)
+    assert_equals(set(after.keys()), set(full.keys()))
+    assert_equals(shared_contributors(after), shared_contributors(full))
+    for path, d in before.items():
+        if path != os.path.join('www.example.org', 'shared.json'):
+            assert_equals(after[path], d)
+    assert_equals(os.listdir(quarantine_dir), [])
+
+@with_setup(setup_function, teardown_function)
+def test_route_selection_keeps_other_output():
+    """Ensure re-processing the posts of one domain merges into the output of the other posts."""
+
+    dest_dir = os.path.join(PATH_TEST_TEMP, 'dest')
+    routes_file = os.path.join(PATH_TEST_TEMP, 'routes.json')
+    walk(dest_dir, routes=routes_file)
+    before = read_output(dest_dir)
+    walk(dest_dir, routes=routes_file, domain=[ARCHAEONAUTICA.split('/')[-1]])
+    after = read_output(dest_dir)
+    assert_equals(set(after.keys()), set(before.keys()))
+    assert_equals(shared_contributors(after), shared_contributors(before))
+
+@with_setup(setup_function, teardown_function)
+def test_retry_quarantine_with_budget():
+    """Ensure a retry run can parse its posts in budgeted worker processes."""
+
+    dest_dir = os.path.join(PATH_TEST_TEMP, 'dest')
+    quarantine_dir = os.path.join(PATH_TEST_TEMP, 'quarantine')
+    walk_to_json.PARSERS.failing.add(ARCHAEONAUTICA)
+    walk(dest_dir, quarantine=quarantine_dir)
+    walk_to_json.PARSERS.failing.clear()
+    walk(dest_dir, quarantine=quarantine_dir, retry_quarantine=True, budget=60.0)
+    assert_true(ARCHAEONAUTICA in shared_contributors(read_output(dest_dir)))
+    assert_equals(os.listdir(quarantine_dir), [])
+
+@with_setup(setup_function, teardown_function)
+def test_glob_keeps_other_output():
+    """Ensure processing only the posts matching a glob merges into the output of the other posts."""
+
+    dest_dir = os.path.join(PATH_TEST_TEMP, 'dest')
+    walk(dest_dir)
+    before = read_output(dest_dir)
+    walk(dest_dir, glob=['post-archeonautica.xml'])
+    after = read_output(dest_dir)
+    assert_equals(set(after.keys()), set(before.keys()))
+    assert_equals(shared_contributors(after), shared_contributors(before))
+
+@with_setup(setup_function, teardown_function)
+def test_budget_worker_death():
+    """Ensure a post that kills its worker is quarantined and the run carries on."""
+
+    full_dir = os.path.join(PATH_TEST_TEMP, 'full')
+    dest_dir = os.path.join(PATH_TEST_TEMP, 'dest')
+    quarantine_dir = os.path.join(PATH_TEST_TEMP, 'quarantine')
+    walk(full_dir)
+    walk_to_json.PARSERS.dying.add(ARCHAEONAUTICA)
+    walk(dest_dir, quarantine=quarantine_dir, budget=60.0, workers=2)
+    output = read_output(dest_dir)
+    assert_equals(len(output), len(read_output(full_dir)) - 1)
+    assert_false(ARCHAEONAUTICA in shared_contributors(output))
+    quarantined = os.listdir(quarantine_dir)
+    assert_equals(len(quarantined), 1)
+    with open(os.path.join(quarantine_dir, quarantined[0]), 'r', encoding='utf8') as f:
+        assert_equals(json.load(f)['stage'], 'worker')
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keep normalized articles on disk so that unchanged posts skip cleanup.
+
+An article is cached under the sha1 of its post content, in a directory
+named after a version stamp: a hash of everything that decides what
+Article makes of a post (article.py, clean_string.py, normalize_space.py,
+cleanup.xsl and the lxml/libxml2/libxslt versions). Editing any of these
+therefore starts a fresh cache rather than serving stale articles; old
+stamp directories can simply be deleted. Entries are gzipped JSON, as
+written by Article.json_dump and read back by Article._load_json:
+
+    <cache dir>/<stamp>/<first 2 hex digits of sha1>/<sha1>.json.gz
+
+This module defines the following classes:
+
+ * ArticleCache: read and write cached articles.
+
+and the following functions:
+
+ * version_stamp: hash of the code and stylesheet that normalize articles.
+ * save_atomically: write a cache entry so that it appears all at once.
+"""
+
+import errno
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+
+from lxml import etree as exml
+
+PATH_AWOL = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAMP_FILES = ['article.py', 'clean_string.py', 'normalize_space.py', 'cleanup.xsl']
+
+def version_stamp():
+    """Return a short hex digest of the code and stylesheet that normalize articles."""
+
+    m = hashlib.sha1()
+    for file_name in STAMP_FILES:
+        with open(os.path.join(PATH_AWOL, file_name), 'rb') as f:
+            m.update(f.read())
+    for version in (exml.LXML_VERSION, exml.LIBXML_VERSION, exml.LIBXSLT_VERSION):
+        m.update(repr(version).encode('ascii'))
+    return m.hexdigest()[:16]
+
+def save_atomically(file_name, dump):
+    """Write a cache entry with dump(temporary file name), then rename it into place.
+
+    Concurrent workers therefore never see (or leave behind) a partial
+    entry. Missing directories are created.
+    """
+
+    dir_name = os.path.dirname(file_name)
+    try:
+        os.makedirs(dir_name)
+    except OSError as exc:
+        if exc.errno == errno.EEXIST and os.path.isdir(dir_name):
+            pass
+        else: raise
+    # keep the extension: it may say how to write the entry (e.g., '.gz')
+    fd, temp_name = tempfile.mkstemp(suffix='.tmp' + os.path.splitext(file_name)[1], dir=dir_name)
+    os.close(fd)
+    try:
+        dump(temp_name)
+        os.rename(temp_name, file_name)
+    except:
+        os.remove(temp_name)
+        raise
+
+class ArticleCache():
+    """Normalized articles on disk, keyed by post content hash."""
+
+    def __init__(self, dir_name):
+        self.dir_name = os.path.join(dir_name, version_stamp())
+        self.hits = 0
+        self.misses = 0
+
+    def _file_name(self, sha1):
+        return os.path.join(self.dir_name, sha1[:2], '.'.join((sha1, 'json', 'gz')))
+
+    def load(self, sha1, cls):
+        """Return a cls (an Article class) loaded from the cache, or None if it is not there."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        file_name = self._file_name(sha1)
+        if not os.path.isfile(file_name):
+            self.misses = self.misses + 1
+            return None
+        try:
+            a = cls(json_file_name=file_name)
+        except (IOError, OSError, EOFError, ValueError, KeyError) as e:
+            # e.g., left half-written by a killed process: just redo it
+            logger.warning(u'ignoring unreadable cached article {0}: {1}'.format(file_name, e))
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        return a
+
+    def save(self, sha1, article):
+        """Cache a normalized article."""
+
+        save_atomically(self._file_name(sha1), article.json_dump)
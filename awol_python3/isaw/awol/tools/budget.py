@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Run jobs in worker processes under a per-job wall-clock budget.
+
+This module defines the following classes:
+
+ * BudgetPool: a process pool that kills and replaces any worker whose
+   current job overruns its budget, and replaces any worker that dies.
+"""
+
+import logging
+import multiprocessing
+from multiprocessing.connection import wait
+import sys
+import time
+import traceback
+
+def _work(conn, func, initializer):
+    """Worker loop: run func on each job received until told to stop."""
+
+    if initializer is not None:
+        initializer()
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            result = (True, func(job))
+        except Exception as e:
+            result = (False, u'{0}: {1}\n{2}'.format(type(e).__name__, e, traceback.format_exc()))
+        conn.send(result)
+    conn.close()
+
+class _Worker():
+    """One worker process, the pipe to it, and the job it is running."""
+
+    def __init__(self, func, initializer):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_work, args=(child_conn, func, initializer))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+        self.seq = None
+        self.job = None
+        self.started = None
+
+    def start(self, seq, job):
+        self.seq = seq
+        self.job = job
+        self.started = time.time()
+        self.conn.send(job)
+
+    def done(self):
+        self.seq = None
+        self.job = None
+        self.started = None
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+class BudgetPool():
+    """Map a function over jobs in worker processes, each job under a budget.
+
+    Unlike multiprocessing.Pool, every worker runs exactly one job at a
+    time over its own pipe, so a job that overruns its budget can be dealt
+    with by killing just that worker (and starting a fresh one) without
+    disturbing the others. In place of the result of a killed job,
+    on_timeout(job, seconds) is yielded. Results come back in submission
+    order, like Pool.imap. If func raises an exception in a worker, or
+    the worker dies while running a job, on_failure(job, message) is
+    yielded in place of the result (and a dead worker is replaced); with
+    no on_failure, a RuntimeError is raised in the parent instead. Jobs
+    are named in log and error messages by describe(job).
+    """
+
+    def __init__(self, processes, func, budget, on_timeout, initializer=None, describe=repr, on_failure=None):
+        self.processes = processes
+        self.describe = describe
+        self.func = func
+        self.budget = budget
+        self.on_timeout = on_timeout
+        self.on_failure = on_failure
+        self.initializer = initializer
+        self.workers = []
+        self.timeout_count = 0
+        self.failure_count = 0
+
+    def _spawn(self):
+        return _Worker(self.func, self.initializer)
+
+    def imap(self, jobs):
+        """Yield func(job) (or on_timeout(job, seconds), or on_failure(job, message)) for each job, in order."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        jobs = iter(jobs)
+        self.workers = [self._spawn() for i in range(self.processes)]
+        results = {}
+        next_seq = 0
+        next_yield = 0
+        exhausted = False
+        try:
+            while True:
+                for worker in self.workers:
+                    if worker.seq is None and not exhausted:
+                        try:
+                            job = next(jobs)
+                        except StopIteration:
+                            exhausted = True
+                        else:
+                            worker.start(next_seq, job)
+                            next_seq = next_seq + 1
+                while next_yield in results:
+                    yield results.pop(next_yield)
+                    next_yield = next_yield + 1
+                busy = [worker for worker in self.workers if worker.seq is not None]
+                if len(busy) == 0:
+                    break
+                now = time.time()
+                timeout = max(min([worker.started + self.budget for worker in busy]) - now, 0.0)
+                ready = wait([worker.conn for worker in busy], timeout)
+                for worker in busy:
+                    if worker.conn in ready:
+                        try:
+                            ok, result = worker.conn.recv()
+                        except EOFError:
+                            # the worker died (e.g., a crash in a C extension,
+                            # or killed for running out of memory): like an
+                            # overrun, replace it and carry on
+                            worker.kill()
+                            message = u'worker died (exit code {0})'.format(worker.process.exitcode)
+                            if self.on_failure is None:
+                                raise RuntimeError(u'{0} while processing {1}'.format(message, self.describe(worker.job)))
+                            logger.warning(u'{0} while processing {1}'.format(message, self.describe(worker.job)))
+                            results[worker.seq] = self.on_failure(worker.job, message)
+                            self.failure_count = self.failure_count + 1
+                            self.workers[self.workers.index(worker)] = self._spawn()
+                            continue
+                        if not ok:
+                            if self.on_failure is None:
+                                raise RuntimeError(u'worker failed while processing {0}: {1}'.format(self.describe(worker.job), result))
+                            results[worker.seq] = self.on_failure(worker.job, result)
+                            self.failure_count = self.failure_count + 1
+                        else:
+                            results[worker.seq] = result
+                        worker.done()
+                now = time.time()
+                for i, worker in enumerate(self.workers):
+                    if worker.seq is not None and now - worker.started >= self.budget:
+                        seconds = now - worker.started
+                        logger.warning(u'killing worker after {0:.1f}s on {1}'.format(seconds, self.describe(worker.job)))
+                        worker.kill()
+                        results[worker.seq] = self.on_timeout(worker.job, seconds)
+                        self.timeout_count = self.timeout_count + 1
+                        self.workers[i] = self._spawn()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop idle workers and kill busy ones."""
+
+        for worker in self.workers:
+            if worker.seq is None:
+                worker.stop()
+            else:
+                worker.kill()
+        self.workers = []
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keep track of what earlier runs made of each post.
+
+This module defines the following classes:
+
+ * Manifest: persistent record of post content hashes and the resources
+   parsed from them.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+
+def digest_file(file_name):
+    """Return the sha1 hex digest of a file's content."""
+
+    m = hashlib.sha1()
+    with open(file_name, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            m.update(chunk)
+    return m.hexdigest()
+
+def digest_data(data):
+    """Return the sha1 hex digest of a byte string (e.g., an exported entry)."""
+
+    m = hashlib.sha1()
+    m.update(data)
+    return m.hexdigest()
+
+class Manifest():
+    """Record, per post, its content hash and the resources it produced.
+
+    Entries are keyed by the path of the post relative to the root of the
+    walk and look like this:
+
+        {
+            'sha1': content hash of the post file,
+            'url': url of the blog post,
+            'resources': [plain attribute dictionaries of parsed resources],
+            'outputs': [[domain, resource key], ...]
+        }
+    """
+
+    def __init__(self, file_name):
+        """Load an existing manifest file, if there is one."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        self.file_name = file_name
+        self.entries = {}
+        self.seen = set()
+        if os.path.isfile(file_name):
+            with io.open(file_name, 'r', encoding='utf8') as f:
+                self.entries = json.load(f)
+            logger.info('loaded {0} manifest entries from {1}'.format(len(self.entries), file_name))
+        self.previous_outputs = self._outputs()
+
+    def _outputs(self):
+        return set([tuple(o) for entry in self.entries.values() for o in entry['outputs']])
+
+    def digest(self, post_path):
+        """Return the recorded hash for a post, or None if it is unknown."""
+
+        try:
+            return self.entries[post_path]['sha1']
+        except KeyError:
+            return None
+
+    def lookup(self, post_path, sha1):
+        """Return the entry for a post if its content is unchanged, else None."""
+
+        self.seen.add(post_path)
+        try:
+            entry = self.entries[post_path]
+        except KeyError:
+            return None
+        if entry['sha1'] != sha1:
+            return None
+        return entry
+
+    def record(self, post_path, sha1, url, resources, outputs):
+        """Store (or replace) what was parsed from a post."""
+
+        self.seen.add(post_path)
+        self.entries[post_path] = {
+            'sha1': sha1,
+            'url': url,
+            'resources': resources,
+            'outputs': [list(o) for o in outputs]
+        }
+
+    def retract_unseen(self):
+        """Drop entries for posts not looked up or recorded during this run.
+
+        Returns the sorted list of the post paths that were dropped.
+        """
+
+        gone = sorted(set(self.entries.keys()) - self.seen)
+        for post_path in gone:
+            del self.entries[post_path]
+        return gone
+
+    def stale_outputs(self):
+        """Return (domain, resource key) pairs no post produces any more.
+
+        These are outputs recorded when the manifest was loaded that are not
+        claimed by any current entry, i.e., they came from posts that have
+        since disappeared or been changed to yield different resources.
+        """
+
+        return sorted(self.previous_outputs - self._outputs())
+
+    def save(self):
+        """Write the manifest to disk, replacing any earlier version atomically."""
+
+        tmp_name = self.file_name + '.tmp'
+        with open(tmp_name, 'wb') as f:
+            f.write(json.dumps(self.entries, ensure_ascii=False, sort_keys=True).encode('utf8'))
+        os.replace(tmp_name, self.file_name)
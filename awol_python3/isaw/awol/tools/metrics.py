@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+count and time the stages of the parse pipeline
+
+Timings are accumulated per process in STAGES, as {stage name: [count,
+seconds]}. Pool workers hand their accumulated figures back to the parent
+with take(), which the parent folds into its own with add().
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import io
+import json
+import time
+
+STAGES = {}
+
+def record(stage, seconds):
+    """Add one timed call of a stage."""
+
+    try:
+        totals = STAGES[stage]
+    except KeyError:
+        totals = STAGES[stage] = [0, 0.0]
+    totals[0] += 1
+    totals[1] += seconds
+
+@contextmanager
+def timer(stage):
+    """Time the enclosed block as one call of a stage."""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+def timed(stage):
+    """Decorator: time every call of a function as a stage."""
+
+    def decorator(func):
+        @wraps(func)
+        def inner(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return inner
+    return decorator
+
+def take():
+    """Return the figures accumulated so far and start afresh."""
+
+    global STAGES
+    taken = STAGES
+    STAGES = {}
+    return taken
+
+def add(figures):
+    """Fold figures returned by take() (e.g., in a worker) into STAGES."""
+
+    for stage, (count, seconds) in figures.items():
+        try:
+            totals = STAGES[stage]
+        except KeyError:
+            totals = STAGES[stage] = [0, 0.0]
+        totals[0] += count
+        totals[1] += seconds
+
+def summary():
+    """Return the accumulated figures as a dictionary ready for JSON."""
+
+    stages = {}
+    for stage, (count, seconds) in STAGES.items():
+        stages[stage] = {
+            'count': count,
+            'seconds': round(seconds, 6),
+            'mean': round(seconds / count, 6) if count > 0 else None
+        }
+    return stages
+
+def format_seconds(seconds):
+    seconds = int(round(seconds))
+    return '{0}:{1:02d}:{2:02d}'.format(seconds // 3600, (seconds % 3600) // 60, seconds % 60)
+
+class Progress():
+    """Track posts done against a total that may only become known later."""
+
+    def __init__(self, total=None):
+        self.total = total
+        self.done = 0
+        self.start = time.time()
+
+    def step(self, n=1):
+        self.done += n
+
+    def elapsed(self):
+        return time.time() - self.start
+
+    def rate(self):
+        elapsed = self.elapsed()
+        if elapsed <= 0.0:
+            return 0.0
+        return self.done / elapsed
+
+    def line(self):
+        """Return a one-line progress report with rate and ETA."""
+
+        rate = self.rate()
+        if self.total is None:
+            return '{0} posts, {1:.1f} posts/s, elapsed {2}'.format(
+                self.done, rate, format_seconds(self.elapsed()))
+        if rate > 0.0:
+            eta = format_seconds(max(self.total - self.done, 0) / rate)
+        else:
+            eta = '?'
+        return '{0}/{1} posts ({2:.0f}%), {3:.1f} posts/s, ETA {4}'.format(
+            self.done, self.total, 100.0 * self.done / max(self.total, 1), rate, eta)
+
+    def dump(self, file_name, **extra):
+        """Write overall throughput and per-stage figures to a JSON file."""
+
+        d = {
+            'posts': self.done,
+            'seconds': round(self.elapsed(), 3),
+            'posts_per_second': round(self.rate(), 3),
+            'stages': summary()
+        }
+        d.update(extra)
+        with io.open(file_name, 'w', encoding='utf8') as f:
+            f.write(json.dumps(d, indent=4, sort_keys=True))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keep the resources parsed from each post on disk for later runs.
+
+The resources parsed from a post are cached under a key combining:
+
+ * the sha1 of the post content;
+ * the version stamp of article normalization (see article_cache), since
+   the parsers work on the cleaned-up content;
+ * a hash of the source of the parser chosen for the post: the modules
+   of its class and of all the classes it inherits from in isaw.awol
+   (e.g., awol_parse_oi.py, awol_parse_domain.py and awol_parse.py),
+   and every isaw.awol module these import, directly or not (e.g.,
+   resource.py, awol_article.py, identifiers.py or tools/mods.py);
+ * hashes of the vocabularies awol_title_strings.csv and
+   awol_colon_prefixes.csv;
+ * any run settings that change what the parsers produce (e.g., the
+   languages that language identification is restricted to).
+
+Editing one domain parser therefore invalidates only the entries of the
+posts routed to it. Entries are gzipped JSON lists of the plain attribute
+dictionaries of the resources:
+
+    <cache dir>/<first 2 hex digits of key>/<key>.json.gz
+
+This module defines the following classes:
+
+ * ParseCache: read and write cached parse results.
+"""
+
+import ast
+import gzip
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+
+from isaw.awol.tools.article_cache import PATH_AWOL, save_atomically, version_stamp
+
+VOCABULARY_FILES = ['awol_title_strings.csv', 'awol_colon_prefixes.csv']
+
+def parser_modules(cls):
+    """Return the sorted source files of the isaw.awol modules a parser class depends on.
+
+    These are the modules of the class and of the classes it inherits
+    from, and every isaw.awol module that these import, directly or
+    through other isaw.awol modules (as read from their import
+    statements).
+    """
+
+    names = [c.__module__ for c in cls.__mro__ if _in_package(c.__module__)]
+    seen = set()
+    while len(names) > 0:
+        name = names.pop()
+        if name in seen or name not in sys.modules:
+            continue
+        seen.add(name)
+        names.extend(_imported_modules(sys.modules[name]))
+    file_names = set()
+    for name in seen:
+        file_name = getattr(sys.modules[name], '__file__', None)
+        if file_name is not None:
+            file_names.add(os.path.abspath(file_name))
+    return sorted(file_names)
+
+def _imported_modules(module):
+    """Return the names of the isaw.awol modules imported by the source of a module."""
+
+    file_name = getattr(module, '__file__', None)
+    if file_name is None:
+        return []
+    with open(file_name, 'rb') as f:
+        tree = ast.parse(f.read(), file_name)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend([alias.name for alias in node.names])
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), module.__package__)
+            names.append(base)
+            # "from package import module" imports a module too
+            names.extend([base + '.' + alias.name for alias in node.names])
+    return [name for name in names if _in_package(name)]
+
+def _in_package(name):
+    return isinstance(name, str) and (name == 'isaw.awol' or name.startswith('isaw.awol.'))
+
+def _digest_file(file_name):
+    m = hashlib.sha1()
+    with open(file_name, 'rb') as f:
+        m.update(f.read())
+    return m.hexdigest()
+
+class ParseCache():
+    """Parsed resources on disk, keyed by post, parser code and vocabularies."""
+
+    def __init__(self, dir_name, settings=u''):
+        self.dir_name = dir_name
+        m = hashlib.sha1()
+        m.update(version_stamp().encode('ascii'))
+        for file_name in VOCABULARY_FILES:
+            m.update(_digest_file(os.path.join(PATH_AWOL, file_name)).encode('ascii'))
+        if settings != u'':
+            m.update(settings.encode('utf8'))
+        self.base_stamp = m.hexdigest()
+        self.parser_stamps = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parser_stamp(self, parser):
+        """Return a hash of the source of a parser and of the isaw.awol modules it depends on (see parser_modules)."""
+
+        cls = type(parser)
+        try:
+            return self.parser_stamps[cls]
+        except KeyError:
+            pass
+        m = hashlib.sha1()
+        for file_name in parser_modules(cls):
+            m.update(_digest_file(file_name).encode('ascii'))
+        self.parser_stamps[cls] = m.hexdigest()
+        return self.parser_stamps[cls]
+
+    def key(self, sha1, parser):
+        """Return the cache key for a post (by content hash) parsed by parser."""
+
+        m = hashlib.sha1()
+        for part in (sha1, self.parser_stamp(parser), self.base_stamp):
+            m.update(part.encode('ascii'))
+        return m.hexdigest()
+
+    def _file_name(self, key):
+        return os.path.join(self.dir_name, key[:2], '.'.join((key, 'json', 'gz')))
+
+    def load(self, key):
+        """Return the cached resource dictionaries for a key, or None if there are none."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        file_name = self._file_name(key)
+        if not os.path.isfile(file_name):
+            self.misses = self.misses + 1
+            return None
+        try:
+            with gzip.open(file_name, 'rt', encoding='utf8') as f:
+                resource_dicts = json.load(f)
+        except (IOError, OSError, EOFError, ValueError) as e:
+            logger.warning(u'ignoring unreadable cached parse {0}: {1}'.format(file_name, e))
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        return resource_dicts
+
+    def save(self, key, resource_dicts):
+        """Cache the resource dictionaries parsed for a key."""
+
+        def dump(file_name):
+            with gzip.open(file_name, 'wt', encoding='utf8') as f:
+                json.dump(resource_dicts, f, sort_keys=True, ensure_ascii=False)
+        save_atomically(self._file_name(key), dump)
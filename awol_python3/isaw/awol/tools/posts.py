@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+find AWOL post files (or entries of a Blogger export) to process
+"""
+
+from fnmatch import fnmatch
+import os
+import sys
+
+from lxml import etree as exml
+
+IGNORE_DIRS = ['.git', '.svn', '.hg']
+ATOM = '{http://www.w3.org/2005/Atom}'
+KIND_SCHEME = 'http://schemas.google.com/g/2005#kind'
+KIND_POST = 'http://schemas.google.com/blogger/2008/kind#post'
+
+def is_post_file(file_name):
+    """Is this the name of a split-out AWOL post file?"""
+
+    return 'post-' in file_name and file_name[-4:] == '.xml'
+
+def matches(path, patterns, root_dir=None):
+    """Does a path (or its basename) match any of the glob patterns?
+
+    If no patterns are given, everything matches. When root_dir is given,
+    patterns are matched against the path relative to it.
+    """
+
+    if not patterns:
+        return True
+    if root_dir is not None:
+        rel_path = os.path.relpath(path, root_dir)
+    else:
+        rel_path = path
+    base_name = os.path.basename(path)
+    for pattern in patterns:
+        if fnmatch(rel_path, pattern) or fnmatch(base_name, pattern):
+            return True
+    return False
+
+def walk_posts(root_dir, patterns=None):
+    """Lazily yield post file paths under root_dir.
+
+    Directories are read one at a time with os.scandir, in the same order
+    os.walk would visit them (a directory's files, then its subdirectories
+    depth first), so nothing beyond the current directory listing is ever
+    held in memory.
+    """
+
+    stack = [root_dir]
+    while len(stack) > 0:
+        dir_name = stack.pop()
+        sub_dirs = []
+        try:
+            entries = os.scandir(dir_name)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # like os.walk, don't descend into symlinked directories
+                    if entry.name not in IGNORE_DIRS and not entry.is_symlink():
+                        sub_dirs.append(entry.path)
+                elif is_post_file(entry.name) and matches(entry.path, patterns, root_dir):
+                    yield entry.path
+        stack.extend(reversed(sub_dirs))
+
+def read_post_list(file_name):
+    """Lazily yield post file paths listed one per line in a file.
+
+    A file name of '-' reads the list from stdin. Blank lines and lines
+    starting with '#' are ignored.
+    """
+
+    if file_name == '-':
+        f = sys.stdin
+    else:
+        f = open(file_name, 'r')
+    try:
+        for line in f:
+            path = line.strip()
+            if path != '' and path[0] != '#':
+                yield path
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def iter_posts(root_dir=None, patterns=None, post_list=None):
+    """Yield the post files to process, from a list file or a directory walk."""
+
+    if post_list is not None:
+        for path in read_post_list(post_list):
+            if matches(path, patterns):
+                yield path
+    else:
+        for path in walk_posts(root_dir, patterns):
+            yield path
+
+def export_target(file_name, entry_id):
+    """Return the name under which an entry of an export is processed."""
+
+    return u'{0}#{1}'.format(file_name, entry_id)
+
+def iter_export(file_name):
+    """Lazily yield (target, serialized entry) for each post in an Atom export.
+
+    The export (a complete Blogger backup or any Atom feed) is read with
+    iterparse, and each entry is serialized and then freed, together with
+    everything before it, as soon as it has been read, so memory use does
+    not grow with the size of the export. Entries of a Blogger backup that
+    are not posts (settings, template, comments) are skipped. The target
+    is the export file name and the entry's Atom id, joined by '#'.
+    """
+
+    for event, entry in exml.iterparse(file_name, events=('end',), tag=ATOM + 'entry', huge_tree=True):
+        kind = None
+        for category in entry.iterfind(ATOM + 'category'):
+            if category.get('scheme') == KIND_SCHEME:
+                kind = category.get('term')
+        entry_id = entry.findtext(ATOM + 'id')
+        if entry_id is not None and kind in (None, KIND_POST):
+            data = exml.tostring(entry, encoding='UTF-8', with_tail=False)
+        else:
+            data = None
+        entry.clear()
+        while entry.getprevious() is not None:
+            del entry.getparent()[0]
+        if data is not None:
+            yield (export_target(file_name, entry_id.strip()), data)
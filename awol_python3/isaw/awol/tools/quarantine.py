@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Set aside posts that could not be processed.
+
+This module defines the following classes:
+
+ * Quarantine: a directory of dead-letter records, one per failed post.
+"""
+
+import datetime
+import errno
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+
+class Quarantine():
+    """Keep one JSON record per failed post in a directory.
+
+    Records are named after the sha1 of the post path (relative to the root
+    of the walk) and look like this:
+
+        {
+            'post': relative path of the post file,
+            'target': path of the post file as it was processed,
+            'sha1': content hash of the post file,
+            'stage': where it failed ('article', 'parse', 'budget' or 'worker'),
+            'exception': name of the exception class,
+            'message': the exception message,
+            'traceback': the formatted traceback, if there is one,
+            'when': UTC timestamp of the failure
+        }
+    """
+
+    def __init__(self, dir_name):
+        self.dir_name = dir_name
+        try:
+            os.makedirs(dir_name)
+        except OSError as exc:
+            if exc.errno == errno.EEXIST and os.path.isdir(dir_name):
+                pass
+            else: raise
+        self.posts = set([record['post'] for record in self.records()])
+
+    def _file_name(self, post_path):
+        m = hashlib.sha1()
+        m.update(post_path.encode('utf-8'))
+        return os.path.join(self.dir_name, '.'.join((m.hexdigest(), 'json')))
+
+    def add(self, post_path, target, sha1, stage, exception, message, traceback=None):
+        """Record (or update the record of) a failed post."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        record = {
+            'post': post_path,
+            'target': target,
+            'sha1': sha1,
+            'stage': stage,
+            'exception': exception,
+            'message': message,
+            'traceback': traceback,
+            'when': datetime.datetime.utcnow().isoformat()
+        }
+        file_name = self._file_name(post_path)
+        with io.open(file_name, 'w', encoding='utf8') as f:
+            f.write(json.dumps(record, indent=4, sort_keys=True, ensure_ascii=False))
+        self.posts.add(post_path)
+        logger.info(u'quarantined {0} as {1}'.format(post_path, file_name))
+
+    def remove(self, post_path):
+        """Drop the record of a post; returns False if there was none."""
+
+        if post_path not in self.posts:
+            return False
+        os.remove(self._file_name(post_path))
+        self.posts.remove(post_path)
+        return True
+
+    def records(self):
+        """Return all records, sorted by post path."""
+
+        records = []
+        for file_name in os.listdir(self.dir_name):
+            if file_name[-5:] == '.json':
+                with io.open(os.path.join(self.dir_name, file_name), 'r', encoding='utf8') as f:
+                    records.append(json.load(f))
+        return sorted(records, key=lambda record: record['post'])
+
+    def targets(self):
+        """Return the paths of all quarantined posts, sorted."""
+
+        return [record['target'] for record in self.records()]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Remember which posts lead to which resource domains and parsers.
+
+This module defines the following classes:
+
+ * RoutingIndex: persistent map from resource domains and parsers to the
+   posts routed to them.
+
+and the following functions:
+
+ * parser_name: the name under which a parser is indexed.
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+
+def parser_name(parser):
+    """Return the name of a parser's module (e.g., 'awol_parse_othes_univie')."""
+
+    return type(parser).__module__.split('.')[-1]
+
+class RoutingIndex():
+    """Record, per post, the resource domains found in it and the parser chosen.
+
+    Entries are keyed by the path of the post relative to the root of the
+    walk and look like this:
+
+        {
+            'domains': [resource domains found by AwolParsers.get_domains],
+            'parser': name of the parser module the post was routed to (or
+                None if no parser would take it)
+        }
+    """
+
+    def __init__(self, file_name):
+        """Load an existing index file, if there is one."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        self.file_name = file_name
+        self.entries = {}
+        if os.path.isfile(file_name):
+            with io.open(file_name, 'r', encoding='utf8') as f:
+                self.entries = json.load(f)
+            logger.info('loaded {0} routing entries from {1}'.format(len(self.entries), file_name))
+
+    def record(self, post_path, domains, parser):
+        """Store (or replace) the routing of a post."""
+
+        self.entries[post_path] = {
+            'domains': sorted(domains),
+            'parser': parser
+        }
+
+    def remove(self, post_path):
+        """Forget a post (e.g., because it is omitted now)."""
+
+        self.entries.pop(post_path, None)
+
+    def select(self, domains=None, parsers=None):
+        """Return the sorted paths of the posts that hit any of the domains or parsers.
+
+        Parsers may be given by module name, with or without the
+        'awol_parse_' prefix or a '.Parser' suffix.
+        """
+
+        domains = set(domains or [])
+        names = set()
+        for name in parsers or []:
+            if name[-7:] == '.Parser':
+                name = name[:-7]
+            names.add(name)
+            names.add('awol_parse_' + name)
+        return sorted([
+            post_path for post_path, entry in self.entries.items()
+            if entry['parser'] in names or len(domains.intersection(entry['domains'])) > 0])
+
+    def save(self):
+        """Write the index to disk, replacing any earlier version atomically."""
+
+        tmp_name = self.file_name + '.tmp'
+        with open(tmp_name, 'wb') as f:
+            f.write(json.dumps(self.entries, ensure_ascii=False, sort_keys=True, indent=1).encode('utf8'))
+        os.replace(tmp_name, self.file_name)
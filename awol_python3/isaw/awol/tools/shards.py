@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Split a walk across several machines and put the pieces back together.
+
+A post belongs to shard i of N (1 <= i <= N) if the sha1 of its Atom id,
+taken as an integer, is i - 1 modulo N; every machine walking the same
+posts therefore agrees on the split. Alongside its own output, each shard
+writes a shard file: JSON Lines, starting with a header line
+
+    {'shard': i, 'shards': N}
+
+followed by one line per post, in walk order:
+
+    {'n': position of the post in the full walk, 'post': relative path,
+     'url': url of the blog post, 'resources': [plain attribute
+     dictionaries of the parsed resources]}
+
+Because resource.merge is order-sensitive, combining shards replays these
+per-post results in the order of the full walk, so that keys, collisions
+and merges come out as in a single run.
+
+This module defines the following classes:
+
+ * ShardWriter: write a shard file.
+
+and the following functions:
+
+ * parse_shard: parse an "i/N" shard specification.
+ * post_id: read the Atom id of a post file.
+ * shard_of: the shard (1..N) to which a post id belongs.
+ * iter_shards: yield the post records of a complete set of shard files,
+   in walk order.
+"""
+
+import gzip
+import hashlib
+import heapq
+import io
+import json
+import logging
+import os
+import sys
+
+from lxml import etree as exml
+
+ATOM_ID = '{http://www.w3.org/2005/Atom}id'
+
+def parse_shard(spec):
+    """Parse "i/N" into (i, N); raises ValueError if it is malformed."""
+
+    try:
+        i, n = [int(part) for part in spec.split('/')]
+    except ValueError:
+        raise ValueError(u'shard must be given as i/N (e.g., 2/4), not "{0}"'.format(spec))
+    if n < 1 or i < 1 or i > n:
+        raise ValueError(u'shard {0} is out of range: need 1 <= i <= N'.format(spec))
+    return (i, n)
+
+def post_id(file_name):
+    """Return the Atom id of a post, reading no further than it.
+
+    Falls back to the file name if the post has no id (or is not even
+    well-formed XML, in which case it will fail later, in whichever shard).
+    """
+
+    try:
+        for event, element in exml.iterparse(file_name, events=('end',), tag=ATOM_ID):
+            if element.text is not None:
+                return element.text.strip()
+            break
+    except exml.XMLSyntaxError:
+        pass
+    return os.path.basename(file_name)
+
+def shard_of(pid, n):
+    """Return the shard (1..n) to which a post id belongs."""
+
+    m = hashlib.sha1()
+    m.update(pid.encode('utf-8'))
+    return int(m.hexdigest(), 16) % n + 1
+
+def _open_shard(file_name, mode):
+    if file_name[-3:] == '.gz':
+        return gzip.open(file_name, mode + 't', encoding='utf8')
+    return io.open(file_name, mode, encoding='utf8')
+
+class ShardWriter():
+    """Write the per-post results of one shard to a shard file."""
+
+    def __init__(self, file_name, shard, shards):
+        self.file_name = file_name
+        self.f = _open_shard(file_name, 'w')
+        self._write_line({'shard': shard, 'shards': shards})
+        self.count = 0
+
+    def _write_line(self, d):
+        self.f.write(json.dumps(d, sort_keys=True, ensure_ascii=False))
+        self.f.write(u'\n')
+
+    def write(self, n, post_path, url, resources):
+        self._write_line({'n': n, 'post': post_path, 'url': url, 'resources': resources})
+        self.count = self.count + 1
+
+    def close(self):
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        self.f.close()
+        logger.info('wrote {0} posts to shard file {1}'.format(self.count, self.file_name))
+
+def _read_shard(file_name):
+    with _open_shard(file_name, 'r') as f:
+        for line in f:
+            yield json.loads(line)
+
+def iter_shards(file_names):
+    """Yield the post records of all shards, in the order of the full walk.
+
+    Raises ValueError unless the files are exactly shards 1..N of one
+    split.
+    """
+
+    readers = []
+    headers = {}
+    for file_name in file_names:
+        reader = _read_shard(file_name)
+        header = next(reader)
+        if header['shard'] in headers:
+            raise ValueError(u'{0} and {1} are both shard {2}'.format(
+                headers[header['shard']][0], file_name, header['shard']))
+        headers[header['shard']] = (file_name, header['shards'])
+        readers.append(reader)
+    counts = set([shards for file_name, shards in headers.values()])
+    if len(counts) != 1:
+        raise ValueError(u'shard files come from different splits: {0}'.format(sorted(counts)))
+    n = counts.pop()
+    missing = sorted(set(range(1, n + 1)) - set(headers.keys()))
+    if len(missing) > 0:
+        raise ValueError(u'missing shard(s) {0} of {1}'.format(u', '.join([str(i) for i in missing]), n))
+    # each shard is in walk order already
+    for record in heapq.merge(*readers, key=lambda record: record['n']):
+        yield record
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Write resources out at the end of a walk.
+
+This module defines the following classes:
+
+ * DirectorySink: one formatted JSON file per resource, in a directory per
+   domain.
+ * JsonLinesSink: every resource as one line of a (optionally gzipped)
+   JSON Lines file, plus an offset index.
+
+and the following functions for reading JSON Lines output:
+
+ * iter_jsonl: yield all resources in file order.
+ * fetch_jsonl: fetch a single resource by domain and resource key.
+"""
+
+import errno
+import gzip
+import io
+import logging
+import os
+import sys
+
+from isaw.awol.resource import Resource
+
+def _open_jsonl(file_name, mode):
+    if file_name[-3:] == '.gz':
+        return gzip.open(file_name, mode)
+    return open(file_name, mode)
+
+def index_file_name(file_name):
+    """Return the name of the offset index for a JSON Lines file."""
+
+    return file_name + '.idx'
+
+class DirectorySink():
+    """Write each resource to <dest_dir>/<domain>/<resource key>.json."""
+
+    def __init__(self, dest_dir):
+        self.dest_dir = dest_dir
+
+    def location(self, domain, resource_key):
+        """Return the file path of a resource."""
+
+        return os.path.join(self.dest_dir, domain, '.'.join((resource_key, 'json')))
+
+    def write(self, domain, resource_key, r):
+        this_dir = os.path.join(self.dest_dir, domain)
+        try:
+            os.makedirs(this_dir)
+        except OSError as exc:
+            if exc.errno == errno.EEXIST and os.path.isdir(this_dir):
+                pass
+            else: raise
+        r.json_dump(self.location(domain, resource_key), formatted=True)
+
+    def read(self, domain, resource_key):
+        r = Resource()
+        r.json_load(self.location(domain, resource_key))
+        return r
+
+    def exists(self, domain, resource_key):
+        """Return True if a resource file has already been written."""
+
+        return os.path.isfile(self.location(domain, resource_key))
+
+    def remove(self, domain, resource_key):
+        """Delete a resource file; returns False if there was none."""
+
+        try:
+            os.remove(self.location(domain, resource_key))
+        except OSError as exc:
+            if exc.errno != errno.ENOENT:
+                raise
+            return False
+        return True
+
+    def close(self):
+        pass
+
+class JsonLinesSink():
+    """Stream resources as lines of one JSON Lines file.
+
+    If the file name ends in '.gz' the output is gzip-compressed. When the
+    sink is closed, an index is written next to it (see index_file_name)
+    with one tab-separated line per resource: domain, resource key, and
+    the offset and length of its line in the uncompressed stream.
+
+    The file is rewritten from scratch on every run, so there is nothing
+    to read back or remove; for the same reason, it only suits runs over
+    all the posts.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.f = _open_jsonl(file_name, 'wb')
+        self.offset = 0
+        self.index = []
+
+    def location(self, domain, resource_key):
+        return u'{0}#{1}/{2}'.format(self.file_name, domain, resource_key)
+
+    def write(self, domain, resource_key, r):
+        line = r.json_dumps() + b'\n'
+        self.f.write(line)
+        self.index.append((domain, resource_key, self.offset, len(line)))
+        self.offset = self.offset + len(line)
+
+    def read(self, domain, resource_key):
+        raise NotImplementedError('resources cannot be read back from a JSON Lines file while it is being written')
+
+    def exists(self, domain, resource_key):
+        return False
+
+    def remove(self, domain, resource_key):
+        return False
+
+    def close(self):
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        self.f.close()
+        with io.open(index_file_name(self.file_name), 'w', encoding='utf8') as f:
+            for domain, resource_key, offset, length in self.index:
+                f.write(u'{0}\t{1}\t{2}\t{3}\n'.format(domain, resource_key, offset, length))
+        logger.info('wrote {0} resources to {1}'.format(len(self.index), self.file_name))
+
+def iter_jsonl(file_name):
+    """Yield every resource in a JSON Lines file, in file order."""
+
+    with _open_jsonl(file_name, 'rb') as f:
+        for line in f:
+            r = Resource()
+            r.json_loads(line.decode('utf8'))
+            yield r
+
+def fetch_jsonl(file_name, domain, resource_key):
+    """Fetch one resource from a JSON Lines file using its offset index.
+
+    Raises KeyError if the index has no such resource.
+    """
+
+    with io.open(index_file_name(file_name), 'r', encoding='utf8') as f:
+        for line in f:
+            idx_domain, idx_key, offset, length = line.rstrip(u'\n').split(u'\t')
+            if idx_domain == domain and idx_key == resource_key:
+                break
+        else:
+            raise KeyError(u'{0}/{1} is not in {2}'.format(domain, resource_key, file_name))
+    with _open_jsonl(file_name, 'rb') as f:
+        f.seek(int(offset))
+        line = f.read(int(length))
+    r = Resource()
+    r.json_loads(line.decode('utf8'))
+    return r
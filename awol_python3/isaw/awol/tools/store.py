@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Hold resources in memory while a walk is in progress.
+
+This module defines the following classes:
+
+ * ResourceStore: resources keyed by (domain, resource key), written out
+   once each.
+
+and the following functions:
+
+ * resource_key_for: derive the per-domain key of a resource from its url.
+ * store_resource: file a resource in a store, merging on collision, and
+   record it in a domain index.
+ * log_index: log a domain index and its collision statistics.
+"""
+
+from collections import OrderedDict
+import hashlib
+import logging
+import re
+import sys
+
+from isaw.awol import resource
+
+RX_URLFLAT = re.compile(r'[=+\?\{\}\{\}\(\)\\\-_&%#/,\.;:]+')
+RX_DEDUPEH = re.compile(r'[-]+')
+
+class ResourceStore():
+    """Keep resources in memory by (domain, resource key) until flushed.
+
+    Collisions are merged in memory by the caller (see get and put), so a
+    resource that many posts contribute to is written to disk exactly once,
+    when the store is flushed at the end of the run. Writing is delegated
+    to a sink (see isaw.awol.tools.sinks). If max_resident is given, the
+    least recently used resources are written out early to bound memory;
+    should a later collision hit one of those, it is read back from the
+    sink (and written again on flush).
+
+    If seed is True (for runs that process only some of the posts), a
+    resource not yet filed in the store is read from the sink when the
+    sink already holds it, so that resources merged from several posts by
+    an earlier run are merged into rather than overwritten.
+    """
+
+    def __init__(self, sink, max_resident=None, seed=False):
+        self.sink = sink
+        self.max_resident = max_resident
+        self.seed = seed
+        self.resident = OrderedDict()
+        self.evicted = set()
+        self.seeded = set()
+        self.write_count = 0
+
+    def get(self, domain, resource_key):
+        """Return the resource filed under this key so far, or None."""
+
+        k = (domain, resource_key)
+        try:
+            r = self.resident[k]
+        except KeyError:
+            if k in self.evicted:
+                r = self.sink.read(domain, resource_key)
+                self.evicted.remove(k)
+            elif self.seed and self.sink.exists(domain, resource_key):
+                r = self.sink.read(domain, resource_key)
+                self.seeded.add(k)
+            else:
+                return None
+            self.resident[k] = r
+        else:
+            self.resident.move_to_end(k)
+        return r
+
+    def put(self, domain, resource_key, r):
+        """File a resource under this key, replacing anything already there."""
+
+        k = (domain, resource_key)
+        self.evicted.discard(k)
+        self.seeded.discard(k)
+        self.resident[k] = r
+        self.resident.move_to_end(k)
+        if self.max_resident is not None:
+            while len(self.resident) > self.max_resident:
+                (old_domain, old_key), old_r = self.resident.popitem(last=False)
+                self._write(old_domain, old_key, old_r)
+                self.evicted.add((old_domain, old_key))
+
+    def is_seeded(self, domain, resource_key):
+        """Return True if the resource under this key is, as yet, just what the sink held before this run."""
+
+        return (domain, resource_key) in self.seeded
+
+    def flush(self):
+        """Write all resident resources to the sink and close it."""
+
+        logger = logging.getLogger(sys._getframe().f_code.co_name)
+        # sorted, so that streamed output comes out in a stable order
+        for domain, resource_key in sorted(self.resident.keys()):
+            self._write(domain, resource_key, self.resident[(domain, resource_key)])
+        self.resident.clear()
+        self.sink.close()
+        logger.info('{0} resources written'.format(self.write_count))
+
+    def _write(self, domain, resource_key, r):
+        self.sink.write(domain, resource_key, r)
+        self.write_count = self.write_count + 1
+
+def resource_key_for(r):
+    """Derive the per-domain file key for a resource from its url."""
+
+    domain = r.domain
+    stub = r.url.split(domain)[-1][1:]
+    if stub == '' or stub == '/':
+        stub = domain.replace('.', '-')
+    if stub[-1] == '/':
+        stub = stub[:-1]
+    if len(stub.encode('utf-8')) > 80 or '?' in stub or '&' in stub or '%' in stub or ' ' in stub:
+        m = hashlib.sha1()
+        m.update(stub.encode('utf-8'))
+        return m.hexdigest()
+    return RX_DEDUPEH.sub('-', RX_URLFLAT.sub('-', stub))
+
+def _contributors(r):
+    """Return the urls of the posts a resource was parsed from, according to its provenance."""
+
+    return set([p['resource'] for p in r.provenance if p['term'] == resource.PROVENANCE_VERBS['citesAsMetadataDocument']])
+
+def store_resource(r, article_url, store, index):
+    """File a resource in the store and record it in the domain index.
+
+    Must only ever be called from the parent process, in post order, so
+    that collision handling (and therefore the output) is the same
+    however the posts were parsed. In a store seeded from earlier output
+    (see ResourceStore), a resource that only this post (article_url)
+    contributed to is replaced rather than merged with its earlier self.
+    Returns the (domain, resource key) under which the resource was filed.
+    """
+
+    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger.info(u'\n-----------------------------------------------------------------------------------------\nRESOURCE\n')
+    logger.info(u'url: {0}'.format(r.url))
+    logger.info(u'title: {0}'.format(r.title))
+    domain = r.domain
+    try:
+        domain_index = index[domain]
+    except KeyError:
+        domain_index = index[domain] = {}
+    resource_key = resource_key_for(r)
+    r_earlier = store.get(domain, resource_key)
+    if r_earlier is not None and store.is_seeded(domain, resource_key) and _contributors(r_earlier) <= set([article_url]):
+        # written by an earlier run from this post alone: replace it
+        r_earlier = None
+    if r_earlier is not None:
+        # collision! merge with the earlier version held in the store
+        logger.warning('collision in {0}: {1}/{2}'.format(article_url, r.domain, resource_key))
+        try:
+            r_merged = resource.merge(r_earlier, r)
+        except ValueError as e:
+            logger.error(str(e) + u' while trying to merge; saving separately')
+            m = hashlib.sha1()
+            m.update(r.url.encode('utf-8'))
+            resource_key = m.hexdigest()
+        else:
+            r = r_merged
+        del r_earlier
+    r.resource_key = resource_key
+    store.put(domain, resource_key, r)
+    logger.info(u'filename: {0}'.format(store.sink.location(domain, resource_key)))
+    try:
+        resource_title = r.extended_title
+    except AttributeError:
+        resource_title = r.title
+    resource_package = {
+        'title_full': resource_title,
+        'url': r.url,
+        'key': resource_key,
+    }
+    if resource_title != r.title:
+        resource_package['title'] = r.title
+    try:
+        resource_list = domain_index[resource_key]
+    except KeyError:
+        resource_list = domain_index[resource_key] = []
+    resource_list.append(resource_package)
+    return (domain, resource_key)
+
+def log_index(index):
+    """Log the domain index built by store_resource, with collision statistics."""
+
+    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger.info('sorting domain list')
+    domain_list = sorted(index.keys())
+    domain_count = len(domain_list)
+    resource_count = 0
+    record_count = 0
+    max_collisions = 0
+    total_collisions = 0
+    redundant_resources = 0
+    logger.info("FULL INDEX OF RESOURCES")
+    logger.info("=======================")
+    for domain in domain_list:
+        logger.info(domain)
+        i = 0
+        dash = ''
+        while i < len(domain):
+            dash = dash+'-'
+            i = i+1
+        logger.info(dash)
+        logger.info(u'sorting resource list for domain {0}'.format(domain))
+        resource_list = sorted(index[domain].keys())
+        logger.info('{0} unique resources in this domain'.format(len(resource_list)))
+        resource_count = resource_count + len(resource_list)
+        for resource_key in resource_list:
+            resources = index[domain][resource_key]
+            logger.info(u'    {0}'.format(resources[0]['title_full']))
+            record_count = record_count + len(resources)
+            if len(resources) > 1:
+                logger.info ('        multiple records: {0}'.format(len(resources)))
+                total_collisions = total_collisions + len(resources)
+                redundant_resources = redundant_resources + 1
+                if len(resources) > max_collisions:
+                    max_collisions = len(resources)
+    logger.info("=======================")
+    logger.info("Total {0} domains".format(domain_count))
+    logger.info("Total {0} unique resources recorded".format(resource_count))
+    logger.info("Total number of records: {0}".format(record_count))
+    logger.info("Highest number of redundancies (collisions): {0}".format(max_collisions))
+    logger.info("Total number of redundant records: {0}".format(total_collisions))
+    try:
+        logger.info("Percentage of redundantly recorded resources:  {0:.2f}".format(round(float(redundant_resources)/float(resource_count)*100.0),2))
+    except ZeroDivisionError:
+        print("No records!")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Load the vocabularies that tag and sort AWOL posts, compiled once.
+
+The two vocabularies are read from the CSV files in this package:
+
+ * awol_title_strings.csv: lowercase strings found in titles (or used
+   as blog categories) and the tags they give;
+ * awol_colon_prefixes.csv: the prefixes of post titles (the text before
+   the first colon), and whether a post with one is omitted, whether the
+   prefix is stripped from the resource title and whether the post lists
+   several resources.
+
+They are compiled into read-only lookup tables and a KeywordMiner (term
+dictionary and phrase automaton). The result is kept in a bundle file
+(awol_vocabulary.pickle, next to the CSV files) stamped with a hash of
+the CSV files and of the code that compiles them. The bundle is only
+rebuilt when one of these changes; if it cannot be written (e.g., in a
+read-only installation), the vocabularies are simply compiled on every
+import.
+
+This module defines the following functions:
+
+ * vocabulary_stamp: hash of the CSV files and of the compiling code.
+ * compile_vocabularies: read and compile the CSV files.
+ * load_vocabularies: the compiled vocabularies, from the bundle file if
+   it is current.
+
+and makes the compiled vocabularies available as TITLE_SUBSTRING_TAGS,
+TITLE_SUBSTRING_TERMS, TITLE_SUBSTRING_PHRASES, KEYWORD_MINER,
+COLON_PREFIXES and COLON_PREFIX_ROWS.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+from types import MappingProxyType
+
+import unicodecsv
+
+from isaw.awol.keywords import KeywordMiner
+from isaw.awol.normalize_space import normalize_space
+from isaw.awol.tools.article_cache import save_atomically
+
+PATH_AWOL = os.path.dirname(os.path.abspath(__file__))
+TITLE_STRINGS_FILE = 'awol_title_strings.csv'
+COLON_PREFIXES_FILE = 'awol_colon_prefixes.csv'
+BUNDLE_FILE = os.path.join(PATH_AWOL, 'awol_vocabulary.pickle')
+STAMP_FILES = [
+    os.path.join(PATH_AWOL, TITLE_STRINGS_FILE),
+    os.path.join(PATH_AWOL, COLON_PREFIXES_FILE),
+    os.path.join(PATH_AWOL, 'vocabulary.py'),
+    os.path.join(PATH_AWOL, 'keywords.py')
+]
+
+def vocabulary_stamp():
+    """Return a hex digest of the CSV files and of the code that compiles them."""
+
+    m = hashlib.sha1()
+    for file_name in STAMP_FILES:
+        with open(file_name, 'rb') as f:
+            m.update(f.read())
+    m.update(repr(sys.version_info[:2]).encode('ascii'))
+    return m.hexdigest()
+
+def _read_rows(file_name, fieldnames):
+    with open(os.path.join(PATH_AWOL, file_name), 'rb') as f:
+        return [row for row in unicodecsv.DictReader(
+            f,
+            fieldnames = fieldnames,
+            delimiter = ',',
+            quotechar = '"')]
+
+def compile_vocabularies():
+    """Read the CSV files and return the compiled vocabularies (a dictionary of plain objects)."""
+
+    title_substring_tags = dict()
+    for row in _read_rows(TITLE_STRINGS_FILE, ['titles', 'tags']):
+        title_substring_tags.update({row['titles']:row['tags']})
+    title_substring_terms = {k:v for (k,v) in title_substring_tags.items() if ' ' not in k}
+    title_substring_phrases = {k:v for (k,v) in title_substring_tags.items() if k not in title_substring_terms}
+    colon_prefix_rows = []
+    colon_prefixes = dict()
+    for row in _read_rows(COLON_PREFIXES_FILE, ['col_pre', 'omit_post', 'strip_title', 'mul_res']):
+        values = (row['omit_post'], row['strip_title'], row['mul_res'])
+        colon_prefix_rows.append((row['col_pre'],) + values)
+        colon_prefixes.update({normalize_space(row['col_pre']).lower(): values})
+    return {
+        'title_substring_tags': title_substring_tags,
+        'title_substring_terms': title_substring_terms,
+        'title_substring_phrases': title_substring_phrases,
+        'keyword_miner': KeywordMiner(title_substring_terms, title_substring_phrases),
+        'colon_prefixes': colon_prefixes,
+        'colon_prefix_rows': tuple(colon_prefix_rows)
+    }
+
+def load_vocabularies(bundle_file=BUNDLE_FILE):
+    """Return the compiled vocabularies, from bundle_file if it is current, else compiling (and saving) them."""
+
+    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    stamp = vocabulary_stamp()
+    try:
+        with open(bundle_file, 'rb') as f:
+            bundle = pickle.load(f)
+    except (IOError, OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        logger.debug(u'no usable vocabulary bundle in {0}: {1}'.format(bundle_file, e))
+    else:
+        if bundle.get('stamp') == stamp:
+            return bundle['vocabularies']
+    vocabularies = compile_vocabularies()
+
+    def dump(file_name):
+        with io.open(file_name, 'wb') as f:
+            pickle.dump({'stamp': stamp, 'vocabularies': vocabularies}, f, pickle.HIGHEST_PROTOCOL)
+    try:
+        save_atomically(bundle_file, dump)
+    except (IOError, OSError) as e:
+        logger.debug(u'cannot save vocabulary bundle {0}: {1}'.format(bundle_file, e))
+    return vocabularies
+
+_VOCABULARIES = load_vocabularies()
+TITLE_SUBSTRING_TAGS = MappingProxyType(_VOCABULARIES['title_substring_tags'])
+TITLE_SUBSTRING_TERMS = MappingProxyType(_VOCABULARIES['title_substring_terms'])
+TITLE_SUBSTRING_PHRASES = MappingProxyType(_VOCABULARIES['title_substring_phrases'])
+KEYWORD_MINER = _VOCABULARIES['keyword_miner']
+COLON_PREFIXES = MappingProxyType(_VOCABULARIES['colon_prefixes'])
+COLON_PREFIX_ROWS = _VOCABULARIES['colon_prefix_rows']